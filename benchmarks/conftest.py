@@ -0,0 +1,2 @@
+# Benchmarks need the same running Invenio (database, taxonomies) as the tests
+from tests.conftest import *  # noqa: F401,F403
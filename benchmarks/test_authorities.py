@@ -0,0 +1,39 @@
+import pytest
+from marshmallow import Schema, fields, ValidationError
+
+from nr_datasets_metadata.marshmallow.subschemas.authority import AuthoritySchema, PersonSchema
+from nr_datasets_metadata.marshmallow.subschemas.person import CreatorSchema
+
+from benchmarks.utils import DATASET_RECORD, records_per_second
+
+AUTHORS = 500
+
+
+class NaiveCreatorSchema(AuthoritySchema):
+    # original affiliation check followed by a person schema created for each author
+    def load(self, data, *, many=None, partial=None, unknown=None, **kwargs):
+        for d in [data]:
+            if not d.get('affiliation') and d.get('nameType') != 'Organizational':
+                raise ValidationError(message='Required affiliation field not found')
+            elif not isinstance(d['affiliation'], (list, tuple)):
+                raise ValidationError(message='affiliation must be a taxonomy')
+        if len({d['nameType'] for d in [data]}) > 1:
+            raise ValidationError(message='Can not mix personal and organizational authorities')
+        schema = type(PersonSchema.__name__, (PersonSchema,), dict(type(self)._declared_fields))()
+        return schema.load(data, partial=partial, unknown=unknown)
+
+
+def creators_schema(creator_schema):
+    return type('Schema', (Schema,), dict(
+        creators=fields.List(fields.Nested(creator_schema()))
+    ))()
+
+
+@pytest.mark.parametrize('creator_schema', [NaiveCreatorSchema, CreatorSchema], ids=['naive', 'single-pass'])
+def test_500_authors(creator_schema, benchmark, app, db, taxonomy_tree):
+    benchmark.group = 'authorities'
+    creators = [dict(DATASET_RECORD['creators'][0], fullName=f'Author {i}') for i in range(AUTHORS)]
+    schema = creators_schema(creator_schema)
+    ret = benchmark(schema.load, {'creators': creators})
+    assert len(ret['creators']) == AUTHORS
+    records_per_second(benchmark, AUTHORS)
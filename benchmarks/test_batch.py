@@ -0,0 +1,32 @@
+from nr_datasets_metadata.marshmallow import BatchValidator, DataSetMetadataSchemaV3
+
+from benchmarks.utils import dataset_records, records_per_second
+
+RECORD_COUNT = 200
+
+
+def test_load_in_loop(app, db, taxonomy_tree, benchmark):
+    records = dataset_records(RECORD_COUNT)
+
+    def load_all():
+        # the way MarshmallowValidatedRecordMixin validates - a new schema for every record
+        return [DataSetMetadataSchemaV3().load(record) for record in records]
+
+    benchmark.group = 'batch-validation'
+    result = benchmark(load_all)
+    records_per_second(benchmark, RECORD_COUNT)
+    assert len(result) == RECORD_COUNT
+
+
+def test_batch_validator(app, db, taxonomy_tree, benchmark):
+    records = dataset_records(RECORD_COUNT)
+    validator = BatchValidator()
+
+    def validate_all():
+        return list(validator.validate(records))
+
+    benchmark.group = 'batch-validation'
+    result = benchmark(validate_all)
+    records_per_second(benchmark, RECORD_COUNT)
+    assert len(result) == RECORD_COUNT
+    assert all(r.errors is None for r in result)
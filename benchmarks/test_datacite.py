@@ -0,0 +1,36 @@
+import io
+
+import pytest
+
+from nr_datasets_metadata.serializers import datacite, xml
+
+from benchmarks.utils import RECORD_SIZES, records_per_second, synthetic_record
+
+RECORDS = 50000
+"""Size of a DOI registration batch."""
+
+BACKENDS = [pytest.param('lxml', marks=pytest.mark.skipif(xml.etree is None, reason='lxml is not installed')),
+            'stdlib']
+
+
+def write_xml(records):
+    stream = io.BytesIO()
+    datacite.write_xml(stream, records)
+    return len(stream.getvalue())
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_write_xml(backend, benchmark, monkeypatch):
+    benchmark.group = 'datacite-xml'
+    if backend == 'stdlib':
+        monkeypatch.setattr(xml, 'etree', None)
+    records = [synthetic_record(**RECORD_SIZES['typical'])] * RECORDS
+    assert benchmark.pedantic(write_xml, args=(records,), rounds=1) > 0
+    records_per_second(benchmark, RECORDS)
+
+
+def test_write_json(benchmark):
+    benchmark.group = 'datacite-json'
+    records = [synthetic_record(**RECORD_SIZES['typical'])] * RECORDS
+    benchmark.pedantic(lambda: datacite.write_json(io.StringIO(), records), rounds=1)
+    records_per_second(benchmark, RECORDS)
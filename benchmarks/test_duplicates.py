@@ -0,0 +1,19 @@
+import json
+
+import pytest
+
+from nr_datasets_metadata.marshmallow.subschemas.utils import no_duplicates
+
+KEYWORDS = [{'cs': f'klíčové slovo {i}', 'en': f'keyword {i}'} for i in range(1000)]
+
+
+def json_dumps_no_duplicates(value):
+    # the original implementation
+    v = [json.dumps(x, sort_keys=True) for x in value]
+    return len(set(v)) == len(value)
+
+
+@pytest.mark.parametrize('fn', [json_dumps_no_duplicates, no_duplicates], ids=['json-dumps', 'canonical-key'])
+def test_no_duplicates_1k_keywords(fn, benchmark):
+    benchmark.group = 'no-duplicates'
+    assert benchmark(fn, KEYWORDS)
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from nr_datasets_metadata import json_backend
+from nr_datasets_metadata.executor import ValidationReport, validate_lines
+
+from benchmarks.utils import DATASET_RECORD, records_per_second
+
+RECORD_COUNT = 2000
+
+PROCESSES = sorted({1, 2, os.cpu_count() or 1})
+
+
+@pytest.mark.parametrize('processes', PROCESSES)
+def test_validate_lines(processes, app, db, taxonomy_tree, benchmark):
+    line = json_backend.dumps(DATASET_RECORD).decode('utf-8')
+
+    def validate_all():
+        report = ValidationReport()
+        for result in validate_lines(((i, line) for i in range(RECORD_COUNT)), processes, chunk_size=100):
+            report.add(result)
+        return report
+
+    benchmark.group = 'parallel-validation'
+    report = benchmark.pedantic(validate_all, rounds=3)
+    records_per_second(benchmark, RECORD_COUNT)
+    benchmark.extra_info['processes'] = processes
+    assert report.total == RECORD_COUNT
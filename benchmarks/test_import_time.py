@@ -0,0 +1,14 @@
+import pytest
+
+from tests.utils import import_times
+
+
+@pytest.mark.parametrize('statement', [
+    'import nr_datasets_metadata.marshmallow',
+    'from nr_datasets_metadata.marshmallow import DataSetMetadataSchemaV3',
+], ids=['package', 'schema'])
+def test_import_time(statement, benchmark):
+    benchmark.group = 'import-time'
+    imported = benchmark.pedantic(import_times, args=(statement,), rounds=5)
+    benchmark.extra_info['import_time_us'] = imported['nr_datasets_metadata.marshmallow']
+    benchmark.extra_info['modules'] = len(imported)
@@ -0,0 +1,26 @@
+import pytest
+
+from nr_datasets_metadata.marshmallow import DataSetMetadataSchemaV3, IncrementalSchema, changed_fields
+
+from benchmarks.utils import RECORD_SIZES, synthetic_record
+
+PATCH = [{'op': 'replace', 'path': '/version', 'value': 'v2'}]
+
+
+@pytest.mark.parametrize('incremental', [False, True], ids=['full', 'incremental'])
+def test_edit_version_of_huge_record(incremental, benchmark, app, db, taxonomy_tree):
+    benchmark.group = 'incremental-validation'
+    record = synthetic_record(**RECORD_SIZES['huge'])
+    previous = DataSetMetadataSchemaV3().load(record)
+    edited = dict(record, version='v2')
+
+    if incremental:
+        def load():
+            return IncrementalSchema(DataSetMetadataSchemaV3(), previous, changed_fields(PATCH)).load(edited)
+    else:
+        def load():
+            return DataSetMetadataSchemaV3().load(edited)
+
+    ret = benchmark(load)
+    assert ret['version'] == 'v2'
+    assert len(ret['creators']) == RECORD_SIZES['huge']['creators']
@@ -0,0 +1,45 @@
+import json
+
+from nr_datasets_metadata.marshmallow.subschemas.interning import intern_strings
+
+from benchmarks.test_typed import allocated
+from benchmarks.utils import records_per_second
+
+RECORD_COUNT = 100000
+
+
+def enumerated_record(i):
+    """Record with the enumerated fields the way it is parsed from a JSON line: no string is shared."""
+    return json.loads(json.dumps({
+        'titles': [{'title': {'cs': f'Název {i}', 'en': f'Title {i}'}, 'titleType': 'mainTitle'},
+                   {'title': {'cs': f'Podnázev {i}'}, 'titleType': 'subtitle'}],
+        'creators': [{'fullName': f'Creator {i}-{j}', 'nameType': 'Personal',
+                      'authorityIdentifiers': [{'identifier': f'0000-0002-{j:04}-{i % 10000:04}', 'scheme': 'orcid'}]}
+                     for j in range(3)],
+        'persistentIdentifiers': [{'identifier': f'10.5281/zenodo.{i}', 'scheme': 'doi', 'status': 'registered'}],
+        'abstract': {'cs': f'Abstrakt {i}', 'en': f'Abstract {i}'},
+    }))
+
+
+def batch_memory(interned, count=RECORD_COUNT):
+    def build():
+        records = [enumerated_record(i) for i in range(count)]
+        if interned:
+            for record in records:
+                intern_strings(record)
+        return records
+
+    return allocated(build)[1]
+
+
+def test_intern_strings(benchmark):
+    benchmark.group = 'interning'
+    benchmark.extra_info['plain_batch_bytes'] = batch_memory(interned=False)
+    benchmark.extra_info['interned_batch_bytes'] = batch_memory(interned=True)
+    benchmark.pedantic(lambda records: [intern_strings(r) for r in records],
+                       setup=lambda: (([enumerated_record(i) for i in range(RECORD_COUNT)],), {}), rounds=3)
+    records_per_second(benchmark, RECORD_COUNT)
+
+
+def test_interned_batch_is_smaller():
+    assert batch_memory(True, 1000) < batch_memory(False, 1000)
@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from nr_datasets_metadata import json_backend
+from nr_datasets_metadata.streaming import write_jsonl
+
+from benchmarks.utils import DATASET_RECORD, records_per_second
+
+RECORDS = 100000
+
+BACKENDS = ['json', pytest.param('orjson', marks=pytest.mark.skipif(
+    json_backend.orjson is None, reason='orjson is not installed'))]
+
+
+def export(backend, records):
+    return sum(len(backend.dumps(r, default=str)) for r in records)
+
+
+def canonical_export(backend, records):
+    return sum(len(backend.canonical_dumps(r)) for r in records)
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_export(name, benchmark):
+    benchmark.group = 'json-export'
+    backend = json_backend.get_backend(name)
+    records = [DATASET_RECORD] * RECORDS
+    assert benchmark.pedantic(export, args=(backend, records), rounds=3) > 0
+    records_per_second(benchmark, RECORDS)
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_canonical_export(name, benchmark):
+    benchmark.group = 'json-canonical-export'
+    backend = json_backend.get_backend(name)
+    records = [DATASET_RECORD] * RECORDS
+    assert benchmark.pedantic(canonical_export, args=(backend, records), rounds=3) > 0
+    records_per_second(benchmark, RECORDS)
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_write_jsonl(name, benchmark):
+    benchmark.group = 'json-write-jsonl'
+    previous = json_backend.set_backend(name)
+    try:
+        benchmark.pedantic(lambda: write_jsonl(io.StringIO(), [DATASET_RECORD] * RECORDS), rounds=3)
+    finally:
+        json_backend.backend = previous
+    records_per_second(benchmark, RECORDS)
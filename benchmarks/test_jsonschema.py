@@ -0,0 +1,41 @@
+from oarepo_invenio_model import AllOfDraft7Validator
+
+from nr_datasets_metadata.validators import dataset_jsonschema_validator, dataset_schema_url, \
+    jsonschema_validators
+
+from benchmarks.utils import dataset_record, records_per_second
+
+
+def _records(new_datamodel_jschema_test, fundingReference_test):
+    return [dataset_record(), new_datamodel_jschema_test, fundingReference_test] * 50
+
+
+def test_allof_validator(app, new_datamodel_jschema_test, fundingReference_test, benchmark):
+    records = _records(new_datamodel_jschema_test, fundingReference_test)
+    schema = {'allOf': [{'$ref': dataset_schema_url()}]}
+
+    def validate_all():
+        # Record.validate creates a new validator, with all refs resolved again, for each record
+        return [len(list(AllOfDraft7Validator(schema).iter_errors(r))) for r in records]
+
+    benchmark.group = 'jsonschema'
+    errors = benchmark(validate_all)
+    records_per_second(benchmark, len(records))
+    assert len(errors) == len(records)
+
+
+def test_compiled_validator(app, new_datamodel_jschema_test, fundingReference_test, benchmark):
+    records = _records(new_datamodel_jschema_test, fundingReference_test)
+    schema = {'allOf': [{'$ref': dataset_schema_url()}]}
+    expected = [len(list(AllOfDraft7Validator(schema).iter_errors(r))) for r in records]
+    jsonschema_validators.clear()
+
+    def validate_all():
+        validator = dataset_jsonschema_validator()
+        return [len(list(validator.iter_errors(r))) for r in records]
+
+    benchmark.group = 'jsonschema'
+    errors = benchmark(validate_all)
+    records_per_second(benchmark, len(records))
+    assert errors == expected
+    assert jsonschema_validators.stats()['misses'] == 1
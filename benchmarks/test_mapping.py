@@ -0,0 +1,93 @@
+"""
+Index size of the generated mapping compared to the untuned one (every string a searchable keyword
+with doc values) on a local index stand-in: footprint() estimates the bytes a document adds to the
+inverted index, doc values and points of the mapped fields. Custom types (multilingual, taxonomy
+terms) are mapped the same in both and are not counted.
+"""
+import json
+
+import pytest
+
+from nr_datasets_metadata.date_ranges import SCHEMA_FILE, add_date_ranges
+from nr_datasets_metadata.mapping import MAPPING_OVERRIDES, generate_mapping
+
+from benchmarks.utils import RECORD_SIZES, records_per_second, synthetic_record
+
+UNTUNED_OVERRIDES = {'titles': {'type': 'nested'}, 'contributors.role': {'type': 'titled-taxonomy-term'}}
+
+POSTING = 8
+"""Bytes of a term occurrence in the postings (doc id, frequency)."""
+
+NESTED_DOC = 16
+"""Bytes of a hidden nested document."""
+
+NUMERIC_TYPES = ('date', 'long', 'double')
+
+
+def mapping_properties(overrides):
+    with open(SCHEMA_FILE) as f:
+        return generate_mapping(json.load(f), overrides=overrides)['mappings']['properties']
+
+
+MAPPINGS = {
+    'untuned': mapping_properties(UNTUNED_OVERRIDES),
+    'tuned': mapping_properties(MAPPING_OVERRIDES),
+}
+
+
+def field_footprint(mapping, value):
+    if 'properties' in mapping:
+        if not isinstance(value, dict):
+            return 0
+        return (NESTED_DOC if mapping['type'] == 'nested' else 0) + footprint(mapping['properties'], value)
+    size = 0
+    kind = mapping['type']
+    indexed, doc_values = mapping.get('index', True), mapping.get('doc_values', True)
+    if kind == 'keyword':
+        value = str(value)
+        if len(value) <= mapping.get('ignore_above', len(value)):
+            length = len(value.encode('utf-8'))
+            size += indexed * (length + POSTING) + doc_values * (length + 4)
+    elif kind == 'text':
+        size += indexed * sum(len(token.encode('utf-8')) + POSTING + 4 for token in str(value).split())
+    elif kind in NUMERIC_TYPES:
+        size += indexed * 8 + doc_values * 8
+    elif kind == 'date_range':
+        size += indexed * 16 + doc_values * 16
+    for subfield in mapping.get('fields', {}).values():
+        size += field_footprint(subfield, value)
+    return size
+
+
+def footprint(properties, doc):
+    """Estimated bytes the document adds to the index for the mapped fields."""
+    size = 0
+    for name, value in doc.items():
+        mapping = properties.get(name)
+        if mapping is None:
+            continue
+        for item in (value if isinstance(value, list) else [value]):
+            size += field_footprint(mapping, item)
+    return size
+
+
+def indexed_records(size, count):
+    return [add_date_ranges(synthetic_record(**RECORD_SIZES[size])) for _ in range(count)]
+
+
+@pytest.mark.parametrize('size', list(RECORD_SIZES))
+@pytest.mark.parametrize('mapping', list(MAPPINGS))
+def test_index_footprint(mapping, size, benchmark):
+    benchmark.group = f'mapping-{size}'
+    properties = MAPPINGS[mapping]
+    records = indexed_records(size, 10)
+    total = benchmark(lambda: sum(footprint(properties, r) for r in records))
+    records_per_second(benchmark, len(records))
+    benchmark.extra_info['index_bytes_per_record'] = total / len(records)
+    benchmark.extra_info['source_bytes_per_record'] = sum(len(json.dumps(r)) for r in records) / len(records)
+
+
+@pytest.mark.parametrize('size', list(RECORD_SIZES))
+def test_tuned_mapping_is_smaller(size):
+    record = indexed_records(size, 1)[0]
+    assert footprint(MAPPINGS['tuned'], record) < footprint(MAPPINGS['untuned'], record)
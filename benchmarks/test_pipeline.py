@@ -0,0 +1,55 @@
+import copy
+
+import pytest
+
+from nr_datasets_metadata.marshmallow import DataSetMetadataSchemaV3
+from nr_datasets_metadata.marshmallow.subschemas.utils import no_duplicates
+from nr_datasets_metadata.record import date_ranges_to_index
+from nr_datasets_metadata.validators import dataset_jsonschema_validator
+
+from benchmarks.utils import RECORD_SIZES, synthetic_record
+
+sizes = pytest.mark.parametrize('size', list(RECORD_SIZES))
+
+
+def size_info(benchmark, size):
+    benchmark.extra_info['size'] = size
+    benchmark.extra_info.update(RECORD_SIZES[size])
+
+
+@sizes
+def test_load(size, benchmark, app, db, taxonomy_tree):
+    benchmark.group = 'pipeline-load'
+    record = synthetic_record(**RECORD_SIZES[size])
+    size_info(benchmark, size)
+    ret = benchmark(lambda: DataSetMetadataSchemaV3().load(record))
+    assert len(ret['creators']) == RECORD_SIZES[size]['creators']
+
+
+@sizes
+def test_jsonschema(size, benchmark, app):
+    benchmark.group = 'pipeline-jsonschema'
+    record = synthetic_record(**RECORD_SIZES[size])
+    validator = dataset_jsonschema_validator()
+    size_info(benchmark, size)
+    benchmark(lambda: list(validator.iter_errors(record)))
+
+
+@sizes
+def test_date_ranges_to_index(size, benchmark):
+    benchmark.group = 'pipeline-date-ranges'
+    record = synthetic_record(**RECORD_SIZES[size])
+    size_info(benchmark, size)
+    # the indexed document is modified in place, index a fresh copy in every round
+    ret = benchmark.pedantic(date_ranges_to_index,
+                             setup=lambda: ((None,), {'json': copy.deepcopy(record)}), rounds=50)
+    assert 'dateCreatedRange' in ret
+
+
+@sizes
+def test_no_duplicates(size, benchmark):
+    benchmark.group = 'pipeline-no-duplicates'
+    record = synthetic_record(**RECORD_SIZES[size])
+    values = record['creators'] + record.get('relatedItems', [])
+    size_info(benchmark, size)
+    assert benchmark(no_duplicates, values) is values
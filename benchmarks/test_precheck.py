@@ -0,0 +1,54 @@
+import pytest
+
+from nr_datasets_metadata.precheck import StructuralPrecheck
+from nr_datasets_metadata.validators import DatasetValidator
+
+from benchmarks.utils import RECORD_SIZES, records_per_second, synthetic_record
+
+RECORDS = 1000
+INVALID_EVERY = 3
+
+
+def drop_abstract(record):
+    del record['abstract']
+
+
+def drop_main_title(record):
+    record['titles'] = [title for title in record['titles'] if title['titleType'] != 'mainTitle']
+
+
+def unknown_name_type(record):
+    record['creators'][-1]['nameType'] = 'Unknown'
+
+
+BREAKERS = [drop_abstract, drop_main_title, unknown_name_type]
+
+
+def mixed_records():
+    """Typical records, every INVALID_EVERY-th of them broken in a way the pre-check rejects."""
+    records = []
+    for i in range(RECORDS):
+        record = synthetic_record(**RECORD_SIZES['typical'])
+        if i % INVALID_EVERY == 0:
+            BREAKERS[i // INVALID_EVERY % len(BREAKERS)](record)
+        records.append(record)
+    return records
+
+
+def test_precheck_only(benchmark):
+    records = mixed_records()
+    precheck = StructuralPrecheck()
+    benchmark.group = 'precheck'
+    results = benchmark(lambda: [precheck.check(record) for record in records])
+    records_per_second(benchmark, RECORDS)
+    assert sum(1 for errors, marshmallow_errors in results if marshmallow_errors) == len(range(0, RECORDS, INVALID_EVERY))
+
+
+@pytest.mark.parametrize('precheck', [False, True])
+def test_validate_mixed(app, db, taxonomy_tree, precheck, benchmark):
+    records = mixed_records()
+    validator = DatasetValidator(precheck=precheck)
+    benchmark.group = 'precheck-validation'
+    results = benchmark.pedantic(lambda: [validator.validate(record) for record in records], rounds=3)
+    records_per_second(benchmark, RECORDS)
+    assert sum(1 for result in results if not result['valid']) >= len(range(0, RECORDS, INVALID_EVERY))
@@ -0,0 +1,20 @@
+import pytest
+
+from nr_datasets_metadata.marshmallow import BatchValidator, FieldTimings
+
+from benchmarks.utils import RECORD_SIZES, synthetic_record, records_per_second
+
+RECORDS = 20
+
+
+@pytest.mark.parametrize('profiled', [False, True], ids=['off', 'on'])
+def test_profiling_overhead(profiled, benchmark, app, db, taxonomy_tree):
+    benchmark.group = 'profiling'
+    timings = FieldTimings() if profiled else None
+    validator = BatchValidator(timings=timings)
+    records = [synthetic_record(**RECORD_SIZES['typical']) for _ in range(RECORDS)]
+    results = benchmark(lambda: list(validator.validate(records)))
+    assert all(r.errors is None for r in results)
+    records_per_second(benchmark, RECORDS)
+    if profiled:
+        assert timings.as_dict()['creators[]']['calls'] > 0
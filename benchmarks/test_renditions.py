@@ -0,0 +1,34 @@
+import pytest
+
+from nr_datasets_metadata.serializers.cache import RENDITION_FORMATS, RenditionCache
+
+from benchmarks.utils import RECORD_SIZES, records_per_second, synthetic_record
+
+RECORDS = 5000
+
+
+def harvest_records():
+    """Distinct typical records, as a ListRecords harvest over the full set sees them."""
+    record = synthetic_record(**RECORD_SIZES['typical'])
+    return [(i, dict(record, version=str(i))) for i in range(RECORDS)]
+
+
+@pytest.mark.parametrize('format', ['oai_dc', 'marcxml'])
+def test_list_records_uncached(format, benchmark):
+    benchmark.group = f'list-records-{format}'
+    serialize = RENDITION_FORMATS[format]
+    records = harvest_records()
+    benchmark.pedantic(lambda: [serialize(metadata) for _, metadata in records], rounds=1)
+    records_per_second(benchmark, RECORDS)
+
+
+@pytest.mark.parametrize('format', ['oai_dc', 'marcxml'])
+def test_list_records_cached(format, benchmark, tmp_path):
+    benchmark.group = f'list-records-{format}'
+    records = harvest_records()
+    cache = RenditionCache(str(tmp_path))
+    # the first harvest renders and stores the renditions
+    list(cache.render_many(records, format))
+    benchmark.pedantic(lambda: list(cache.render_many(records, format)), rounds=3)
+    assert cache.stats()['misses'] == RECORDS
+    records_per_second(benchmark, RECORDS)
@@ -0,0 +1,45 @@
+import re
+
+import pytest
+from marshmallow import ValidationError
+from marshmallow.utils import from_iso_datetime, from_iso_date
+
+from nr_datasets_metadata.marshmallow.subschemas.date import parse_string_date
+
+VALUES = ['2021', '202102', '2021-02-01', '2021-02-01T00:01:00+0200'] * 250
+
+PATTERNS = [re.compile(r'(?P<year>[0-9]{4})\Z'), re.compile(r'(?P<year>[0-9]{4})(?P<month>[0-9]{2})\Z')]
+
+
+def fallback_chain(value):
+    # the original implementation with anchored year and year-month patterns
+    for pattern in PATTERNS:
+        match = pattern.match(value)
+        if match:
+            month = match.groupdict().get('month', None)
+            if month and not (1 <= int(month) <= 12):
+                raise ValidationError('Bad month value')
+            return value
+    try:
+        from_iso_datetime(value)
+        return value
+    except:
+        pass
+    try:
+        from_iso_date(value)
+        return value
+    except:
+        pass
+    raise ValidationError('Unsupported date string')
+
+
+def validate_all(fn, values):
+    for value in values:
+        fn(value)
+    return len(values)
+
+
+@pytest.mark.parametrize('fn', [fallback_chain, parse_string_date], ids=['fallback-chain', 'combined-pattern'])
+def test_string_dates(fn, benchmark):
+    benchmark.group = 'string-date'
+    assert benchmark(validate_all, fn, VALUES) == len(VALUES)
@@ -0,0 +1,23 @@
+import pytest
+
+from nr_datasets_metadata.marshmallow import BatchValidator
+from nr_datasets_metadata.taxonomy_cache import TaxonomyTermCache
+
+from benchmarks.utils import dataset_records, records_per_second
+
+RECORDS = 50
+
+
+def validate_all(validator, records):
+    return sum(1 for r in validator.validate(records) if r.errors is None)
+
+
+@pytest.mark.parametrize('maxsize', [0, 10000], ids=['batch-scope', 'batch-and-process-cache'])
+def test_taxonomy_term_cache(maxsize, benchmark, app, db, taxonomy_tree):
+    benchmark.group = 'taxonomy-terms'
+    cache = TaxonomyTermCache(maxsize=maxsize)
+    validator = BatchValidator(term_cache=cache)
+    records = dataset_records(RECORDS)
+    assert benchmark(validate_all, validator, records) == RECORDS
+    records_per_second(benchmark, RECORDS)
+    benchmark.extra_info.update(cache.stats())
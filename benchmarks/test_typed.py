@@ -0,0 +1,60 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from nr_datasets_metadata.marshmallow.typed import to_dict, to_typed
+
+from benchmarks.utils import RECORD_SIZES, records_per_second, synthetic_record
+
+RECORD_COUNT = {'small': 1000, 'typical': 100, 'huge': 2}
+
+
+def allocated(build):
+    """Returns the value built by build() and the bytes it holds after garbage collection."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def records(size):
+    return [synthetic_record(**RECORD_SIZES[size]) for _ in range(RECORD_COUNT[size])]
+
+
+def memory_per_record(size, typed):
+    def build():
+        ret = records(size)
+        if typed:
+            for record in ret:
+                to_typed(record)
+        return ret
+
+    value, size_bytes = allocated(build)
+    return size_bytes / len(value)
+
+
+@pytest.mark.parametrize('size', list(RECORD_SIZES))
+def test_typed_memory(size):
+    assert memory_per_record(size, typed=True) < memory_per_record(size, typed=False)
+
+
+@pytest.mark.parametrize('size', list(RECORD_SIZES))
+def test_to_typed(size, benchmark):
+    benchmark.group = f'typed-{size}'
+    benchmark.extra_info['dict_bytes_per_record'] = memory_per_record(size, typed=False)
+    benchmark.extra_info['typed_bytes_per_record'] = memory_per_record(size, typed=True)
+    benchmark.pedantic(lambda data: [to_typed(r) for r in data], setup=lambda: ((records(size),), {}), rounds=5)
+    records_per_second(benchmark, RECORD_COUNT[size])
+
+
+@pytest.mark.parametrize('size', list(RECORD_SIZES))
+def test_to_dict(size, benchmark):
+    benchmark.group = f'typed-{size}'
+    data = [to_typed(r) for r in records(size)]
+    benchmark(lambda: [to_dict(r) for r in data])
+    records_per_second(benchmark, RECORD_COUNT[size])
@@ -0,0 +1,201 @@
+import copy
+
+DATASET_RECORD = {'abstract': {'cs': 'kchc'},
+                  'accessRights': [{'is_ancestor': False,
+                                    'level': 1,
+                                    'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/c-abf2'},
+                                    'relatedURI': {'coar': 'http://purl.org/coar/access_right/c_abf2',
+                                                   'eprint': 'http://purl.org/eprint/accessRights/OpenAccess',
+                                                   'vocabs': 'https://vocabs.acdh.oeaw.ac.at/archeaccessrestrictions/public'},
+                                    'title': {'cs': 'otevřený přístup', 'en': 'open access'}}],
+                  'contributors': [{'affiliation': [{'address': 'Malostranské náměstí 259/12, 118 00 Praha 1',
+                                                     'fullName': 'test',
+                                                     'ico': '61384984',
+                                                     'is_ancestor': False,
+                                                     'level': 1,
+                                                     'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/61384984'},
+                                                     'nameType': 'Organizational',
+                                                     'provider': True,
+                                                     'related': {'rid': '51000'},
+                                                     'title': {'cs': 'Akademie múzických umění v Praze',
+                                                               'en': 'Academy of Performing Arts in Prague'},
+                                                     'type': 'veřejná VŠ',
+                                                     'url': 'https://www.amu.cz'}],
+                                    'authorityIdentifiers': [{'identifier': 'jej---', 'scheme': 'orcid'}],
+                                    'fullName': 'Alzbeta Pokorna',
+                                    'nameType': 'Personal',
+                                    'role': [{'dataCiteCode': 'Supervisor',
+                                              'is_ancestor': False,
+                                              'level': 1,
+                                              'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/supervisor'},
+                                              'title': {'cs': 'supervizor', 'en': 'supervisor'}}]}],
+                  'creators': [{'affiliation': [{'address': 'Malostranské náměstí 259/12, 118 00 Praha 1',
+                                                 'fullName': 'test',
+                                                 'ico': '61384984',
+                                                 'is_ancestor': False,
+                                                 'level': 1,
+                                                 'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/61384984'},
+                                                 'nameType': 'Organizational',
+                                                 'provider': True,
+                                                 'related': {'rid': '51000'},
+                                                 'title': {'cs': 'Akademie múzických umění v Praze',
+                                                           'en': 'Academy of Performing Arts in Prague'},
+                                                 'type': 'veřejná VŠ',
+                                                 'url': 'https://www.amu.cz'}],
+                                'authorityIdentifiers': [{'identifier': 'jej---', 'scheme': 'orcid'}],
+                                'fullName': 'Alzbeta Pokorna',
+                                'nameType': 'Personal'}],
+                  'dateAvailable': '1970',
+                  'dateCollected': '2018-03',
+                  'dateCreated': '1996-10-12',
+                  'dateModified': '1999',
+                  'dateValidTo': '1996-10',
+                  'dateWithdrawn': {'date': '1970', 'dateInformation': 'informace'},
+                  'fundingReferences': [{'funder': [{'funderISVaVaICode': '123456789',
+                                                     'is_ancestor': False,
+                                                     'level': 1,
+                                                     'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/ntk'},
+                                                     'title': {'cs': 'Národní technická knihovna',
+                                                               'en': 'National library of technology'}}],
+                                         'fundingProgram': 'jeeej',
+                                         'projectID': 'kch',
+                                         'projectName': 'kk'}],
+                  'geoLocations': [{'geoLocationPlace': 'place',
+                                    'geoLocationPoint': {'pointLatitude': 0, 'pointLongitude': 100}}],
+                  'keywords': [{'cs': 'jej', 'en': 'yey'}, {'cs': 'jejj', 'en': 'yey!'}],
+                  'language': [{'is_ancestor': False,
+                                'level': 1,
+                                'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/cze'},
+                                'title': {'cs': 'čeština', 'en': 'Czech'}}],
+                  'methods': {'en': 'method'},
+                  'notes': ['nota1', 'nota2'],
+                  'persistentIdentifiers': [{'identifier': '10.1038/nphys1170',
+                                             'scheme': 'doi',
+                                             'status': 'requested'}],
+                  'relatedItems': [{'itemContributors': [{'affiliation': [{'address': 'Malostranské náměstí 259/12, '
+                                                                                      '118 00 Praha 1',
+                                                                           'fullName': 'test',
+                                                                           'ico': '61384984',
+                                                                           'is_ancestor': False,
+                                                                           'level': 1,
+                                                                           'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/61384984'},
+                                                                           'nameType': 'Organizational',
+                                                                           'provider': True,
+                                                                           'related': {'rid': '51000'},
+                                                                           'title': {'cs': 'Akademie múzických '
+                                                                                           'umění v Praze',
+                                                                                     'en': 'Academy of Performing '
+                                                                                           'Arts in Prague'},
+                                                                           'type': 'veřejná VŠ',
+                                                                           'url': 'https://www.amu.cz'}],
+                                                          'authorityIdentifiers': [{'identifier': 'jej---',
+                                                                                    'scheme': 'orcid'}],
+                                                          'fullName': 'Alzbeta Pokorna',
+                                                          'nameType': 'Personal',
+                                                          'role': [{'dataCiteCode': 'Supervisor',
+                                                                    'is_ancestor': False,
+                                                                    'level': 1,
+                                                                    'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/supervisor'},
+                                                                    'title': {'cs': 'supervizor',
+                                                                              'en': 'supervisor'}}]}],
+                                    'itemCreators': [{'affiliation': [{'address': 'Malostranské náměstí 259/12, 118 '
+                                                                                  '00 Praha 1',
+                                                                       'fullName': 'test',
+                                                                       'ico': '61384984',
+                                                                       'is_ancestor': False,
+                                                                       'level': 1,
+                                                                       'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/61384984'},
+                                                                       'nameType': 'Organizational',
+                                                                       'provider': True,
+                                                                       'related': {'rid': '51000'},
+                                                                       'title': {'cs': 'Akademie múzických umění v '
+                                                                                       'Praze',
+                                                                                 'en': 'Academy of Performing Arts '
+                                                                                       'in Prague'},
+                                                                       'type': 'veřejná VŠ',
+                                                                       'url': 'https://www.amu.cz'}],
+                                                      'authorityIdentifiers': [{'identifier': 'jej---',
+                                                                                'scheme': 'orcid'}],
+                                                      'fullName': 'Alzbeta Pokorna',
+                                                      'nameType': 'Personal'}],
+                                    'itemEndPage': 'konec',
+                                    'itemIssue': 'issue',
+                                    'itemPIDs': [{'identifier': '10.1038/nphys1170', 'scheme': 'doi'}],
+                                    'itemPublisher': 'publisher',
+                                    'itemRelationType': [{'is_ancestor': False,
+                                                          'level': 1,
+                                                          'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/article'},
+                                                          'title': {'cs': 'Article'}}],
+                                    'itemResourceType': [{'is_ancestor': False,
+                                                          'level': 1,
+                                                          'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/resourceType/datasets'},
+                                                          'title': {'cs': 'Datasety'}}],
+                                    'itemStartPage': 'start',
+                                    'itemTitle': 'titulek',
+                                    'itemVolume': 'volume',
+                                    'itemYear': '1970'}],
+                  'resourceType': [{'is_ancestor': False,
+                                    'level': 1,
+                                    'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/resourceType/datasets'},
+                                    'title': {'cs': 'Datasety'}}],
+                  'rights': [{'is_ancestor': False,
+                              'level': 1,
+                              'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/licenses/cc'},
+                              'title': {'cs': 'Licence Creative Commons'}}],
+                  'publisher': [{'is_ancestor': False,
+                                 'level': 1,
+                                 'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/licenses/cc'},
+                                 'title': {'cs': 'Licence Creative Commons'}},
+                                {'funderISVaVaICode': '123456789',
+                                 'is_ancestor': False,
+                                 'level': 1,
+                                 'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/ntk'},
+                                 'title': {'cs': 'Národní technická knihovna',
+                                           'en': 'National library of technology'}}],
+                  'subjectCategories': [{'DateRevised': '2007-01-26T16:14:37',
+                                         'is_ancestor': False,
+                                         'level': 1,
+                                         'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/psh3001'},
+                                         'relatedURI': [],
+                                         'title': {'cs': 'Reynoldsovo číslo', 'en': 'Reynolds number'}}],
+                  'technicalInfo': {'cs': 'das TechnicalInfo'},
+                  'titles': [{'title': {'cs': 'jeej'}, 'titleType': 'mainTitle'},
+                             {'title': {'cs': 'jeej'}, 'titleType': 'subtitle'}],
+                  'version': 'jeeej'}
+
+
+def dataset_record():
+    return copy.deepcopy(DATASET_RECORD)
+
+
+def dataset_records(count):
+    return [dataset_record() for _ in range(count)]
+
+
+RECORD_SIZES = {
+    'small': dict(creators=1, related_items=0),
+    'typical': dict(creators=50, related_items=10),
+    'huge': dict(creators=2000, related_items=500),
+}
+"""Numbers of creators and related items of synthetic records."""
+
+
+def synthetic_record(creators=1, related_items=0):
+    """DATASET_RECORD with the given number of (distinct) creators and related items."""
+    record = dataset_record()
+    creator = record['creators'][0]
+    record['creators'] = [dict(copy.deepcopy(creator), fullName=f'Creator {i}') for i in range(creators)]
+    item = record.pop('relatedItems')[0]
+    if related_items:
+        record['relatedItems'] = [
+            dict(copy.deepcopy(item), itemTitle=f'Related item {i}', itemYear=str(1900 + i % 120))
+            for i in range(related_items)
+        ]
+    return record
+
+
+def records_per_second(benchmark, count):
+    """Stores records/sec throughput of the benchmarked function in the benchmark report."""
+    benchmark.extra_info['records'] = count
+    if benchmark.stats:
+        benchmark.extra_info['records_per_second'] = count / benchmark.stats.stats.mean
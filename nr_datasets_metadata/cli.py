@@ -0,0 +1,170 @@
+import contextlib
+import os
+
+import click
+from flask.cli import FlaskGroup, with_appcontext
+
+from . import json_backend
+from .executor import ValidationReport, validate_lines
+from .mapping import MAPPING_FILE, build_mapping
+from .migration import Checkpoint, MigrationEngine, jsonl_records, save_records, stored_records
+from .streaming import open_input, open_output, read_lines, write_jsonl
+
+
+@click.group(name='nr-datasets')
+def datasets():
+    """NR datasets metadata commands."""
+
+
+@datasets.command('validate')
+@click.argument('input', default='-')
+@click.option('-o', '--output', default='-', help='Output JSON lines file, "-" for stdout. *.gz is gzipped.')
+@click.option('-p', '--processes', type=int, default=os.cpu_count(), show_default=True,
+              help='Number of worker processes, 1 validates in the current process.')
+@click.option('--chunk-size', type=int, default=100, show_default=True,
+              help='Number of records sent to a worker at once.')
+@click.option('--include-data', is_flag=True, default=False,
+              help='Output loaded metadata of valid records.')
+@click.option('--invalid-only', is_flag=True, default=False,
+              help='Output only results of invalid records.')
+@click.option('--report', type=click.Path(dir_okay=False), default=None,
+              help='Write a JSON report with error counts aggregated over all records.')
+@click.option('--precheck', is_flag=True, default=False,
+              help='Reject records missing required fields or with an unknown nameType without the full validation.')
+@with_appcontext
+def validate(input, output, processes, chunk_size, include_data, invalid_only, report, precheck):
+    """
+    Validates JSON lines (optionally gzipped) dataset metadata from INPUT ("-" for stdin).
+
+    Each record is validated against the JSON schema and the marshmallow schema,
+    one JSON line with the result is written to the output for each record.
+    """
+    aggregated = ValidationReport()
+    with open_input(input) as in_stream, open_output(output) as out_stream:
+        for result in validate_lines(read_lines(in_stream), processes, chunk_size, include_data,
+                                     precheck=precheck):
+            aggregated.add(result)
+            if result['valid'] and invalid_only:
+                continue
+            write_jsonl(out_stream, [result])
+    if report:
+        with open(report, 'wb') as f:
+            f.write(json_backend.dumps(aggregated.as_dict()))
+    click.secho(f'Validated {aggregated.total} records, {aggregated.invalid} invalid', err=True,
+                fg='red' if aggregated.invalid else 'green')
+
+
+@datasets.command('mapping')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), default=str(MAPPING_FILE), show_default=True,
+              help='Mapping include file, "-" for stdout.')
+@click.option('--check', is_flag=True, default=False,
+              help='Do not write anything, fail if the output file is not up to date.')
+def mapping(output, check):
+    """Generates the elasticsearch mapping include from the JSON schema."""
+    generated = build_mapping()
+    if check:
+        with open(output, encoding='utf-8') as f:
+            if f.read() != generated:
+                raise click.ClickException(f'{output} is not up to date, run nr-datasets mapping')
+        return
+    with click.open_file(output, 'w', encoding='utf-8') as f:
+        f.write(generated)
+
+
+@datasets.command('migrate')
+@click.argument('input', default='-')
+@click.option('-o', '--output', default='-', help='Output JSON lines file of migrated records, *.gz is gzipped.')
+@click.option('--stored', is_flag=True, default=False,
+              help='Migrate stored records in the database instead of INPUT.')
+@click.option('--target', default=None, help='Target schema, the preferred schema by default.')
+@click.option('--errors', type=click.Path(dir_okay=False), default=None,
+              help='JSON lines file for records that could not be migrated.')
+@click.option('--checkpoint', type=click.Path(dir_okay=False), default=None,
+              help='Checkpoint file, an interrupted migration is resumed from it and the outputs are appended to.')
+@click.option('--checkpoint-every', type=int, default=1000, show_default=True,
+              help='Number of records between checkpoints.')
+@click.option('--no-validate', is_flag=True, default=False,
+              help='Do not validate migrated records.')
+@with_appcontext
+def migrate(input, output, stored, target, errors, checkpoint, checkpoint_every, no_validate):
+    """
+    Migrates JSON lines dataset metadata from INPUT ("-" for stdin) or stored records to the target schema.
+
+    Valid migrated records are written to the output (or stored back with --stored), records that fail
+    to migrate or validate to the errors file.
+    """
+    checkpoint = Checkpoint(checkpoint) if checkpoint else None
+    resumed = bool(checkpoint and checkpoint.position is not None)
+    engine = MigrationEngine(target=target, validate=not no_validate, checkpoint=checkpoint,
+                             checkpoint_every=checkpoint_every)
+    with contextlib.ExitStack() as stack:
+        if stored:
+            from invenio_db import db
+
+            results = save_records(engine.migrate(stored_records(after=checkpoint.position if resumed else None)))
+            out_stream = None
+        else:
+            in_stream = stack.enter_context(open_input(input))
+            results = engine.migrate(jsonl_records(in_stream))
+            out_stream = stack.enter_context(open_output(output, append=resumed))
+        err_stream = stack.enter_context(open_output(errors, append=resumed)) if errors else None
+
+        def flush():
+            # everything written before a checkpoint must survive an interruption
+            if stored:
+                db.session.commit()
+            for stream in (out_stream, err_stream):
+                if stream:
+                    stream.flush()
+
+        engine.on_checkpoint = flush
+        for result in results:
+            if result.valid:
+                if out_stream:
+                    write_jsonl(out_stream, [result.data])
+            elif err_stream:
+                write_jsonl(err_stream, [{'position': result.position, 'errors': result.errors}])
+    metrics = engine.metrics
+    click.secho(f'Migrated {metrics.migrated} of {metrics.read} records, {metrics.invalid} invalid, '
+                f'{metrics.failed} failed, {metrics.records_per_second:.0f} records/s', err=True,
+                fg='red' if metrics.invalid or metrics.failed else 'green')
+
+
+@datasets.command('datacite')
+@click.argument('input', default='-')
+@click.option('-o', '--output', default='-', help='Output file, "-" for stdout. *.gz is gzipped.')
+@click.option('-d', '--directory', type=click.Path(file_okay=False), default=None,
+              help='Write a file per record (named by the record id or line number) into the directory.')
+@click.option('-f', '--format', 'format', type=click.Choice(['xml', 'json']), default='xml', show_default=True,
+              help='xml writes a single <resources> document, json writes JSON lines.')
+@click.option('--stored', is_flag=True, default=False,
+              help='Export stored records in the database instead of INPUT.')
+@with_appcontext
+def datacite(input, output, directory, format, stored):
+    """Exports JSON lines dataset metadata from INPUT ("-" for stdin) or stored records to DataCite 4."""
+    from .serializers import datacite as datacite_serializer
+
+    with contextlib.ExitStack() as stack:
+        if stored:
+            records = stored_records()
+        else:
+            in_stream = stack.enter_context(open_input(input))
+            records = ((line_no, json_backend.loads(line)) for line_no, line in read_lines(in_stream))
+        if directory:
+            datacite_serializer.write_files(directory, records, format=format)
+            return
+        metadata = (data for _, data in records)
+        if format == 'xml':
+            datacite_serializer.write_xml(stack.enter_context(open_output(output, binary=True)), metadata)
+        else:
+            datacite_serializer.write_json(stack.enter_context(open_output(output)), metadata)
+
+
+def create_app(*args, **kwargs):
+    from invenio_app.factory import create_api
+    return create_api(*args, **kwargs)
+
+
+# standalone ``nr-datasets`` script, the same commands are available as ``invenio nr-datasets``
+main = FlaskGroup(name='nr-datasets', create_app=create_app, add_default_commands=False,
+                  commands=datasets.commands, help=datasets.help)
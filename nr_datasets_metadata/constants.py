@@ -2,3 +2,17 @@ import os
 
 DATASETS_ALLOWED_SCHEMAS = ['nr_datasets_metadata/nr-datasets-metadata-v3.0.0.json']
 DATASETS_PREFERRED_SCHEMA = 'nr_datasets_metadata/nr-datasets-metadata-v3.0.0.json'
+
+IDENTIFIER_CACHE_SIZE = int(os.environ.get('NR_DATASETS_IDENTIFIER_CACHE_SIZE', 10000))
+
+TAXONOMY_CACHE_SIZE = int(os.environ.get('NR_DATASETS_TAXONOMY_CACHE_SIZE', 10000))
+"""Maximum number of taxonomy terms (with their ancestors) cached in a process, 0 disables the cache."""
+
+TAXONOMY_CACHE_TTL = float(os.environ.get('NR_DATASETS_TAXONOMY_CACHE_TTL', 300))
+"""Seconds a cached taxonomy term is used before it is fetched again."""
+
+JSON_BACKEND = os.environ.get('NR_DATASETS_JSON_BACKEND', 'auto')
+"""JSON library used for serialization: 'orjson', 'json' (stdlib) or 'auto' (orjson if installed)."""
+
+RENDITION_CACHE_SIZE = int(os.environ.get('NR_DATASETS_RENDITION_CACHE_SIZE', 1024 ** 3))
+"""Maximum total size in bytes of the serialized renditions kept on disk by RenditionCache."""
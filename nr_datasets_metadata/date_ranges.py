@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+SCHEMA_FILE = Path(__file__).parent / 'jsonschemas' / 'nr_datasets_metadata' / 'nr-datasets-metadata-v3.0.0.json'
+
+ARRAY_ITEMS = '[]'
+"""Path element standing for all items of an array."""
+
+OPEN_END = '..'
+
+
+def date_range_paths(schema, definition='DataSet', range_definitions=('dateOrRange',)):
+    """
+    Returns paths of all properties of the definition that reference one of range_definitions.
+
+    A path is a tuple of property names, ARRAY_ITEMS stands for items of an array,
+    for example ('relatedItems', '[]', 'itemYear').
+    """
+    definitions = schema['definitions']
+    refs = {f'#/definitions/{x}' for x in range_definitions}
+    paths = set()
+
+    def walk(node, path, expanding):
+        if not isinstance(node, dict):
+            return
+        ref = node.get('$ref')
+        if ref in refs:
+            paths.add(path)
+            return
+        if ref and ref.startswith('#/definitions/'):
+            name = ref[len('#/definitions/'):]
+            if name not in expanding:
+                walk(definitions[name], path, expanding | {name})
+        for combinator in ('allOf', 'anyOf', 'oneOf'):
+            for sub in node.get(combinator, ()):
+                walk(sub, path, expanding)
+        for name, prop in node.get('properties', {}).items():
+            walk(prop, path + (name,), expanding)
+        if isinstance(node.get('items'), dict):
+            walk(node['items'], path + (ARRAY_ITEMS,), expanding)
+
+    walk(definitions[definition], (), frozenset({definition}))
+    return sorted(paths)
+
+
+def compile_paths(paths):
+    """Merges paths into a tree so that a shared prefix is walked only once. Leaves are None."""
+    tree = {}
+    for path in paths:
+        node = tree
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = None
+    return tree
+
+
+def load_date_range_tree(schema_file=SCHEMA_FILE, **kwargs):
+    with open(schema_file) as f:
+        return compile_paths(date_range_paths(json.load(f), **kwargs))
+
+
+DATE_RANGE_TREE = load_date_range_tree()
+
+
+def parse_date_range(value):
+    """
+    Converts EDTF date or interval to elasticsearch range, open ends (``../2020``,
+    ``2020/..`` or an empty side) are left out of the range. Returns None if there is no bound.
+    """
+    if not isinstance(value, str):
+        return None
+    since, sep, until = value.partition('/')
+    if not sep:
+        until = since
+    ret = {}
+    if since and since != OPEN_END:
+        ret['gte'] = since
+    if until and until != OPEN_END:
+        ret['lte'] = until
+    return ret or None
+
+
+def add_date_ranges(data, tree=DATE_RANGE_TREE):
+    """Adds ``<field>Range`` next to each date field of the tree in a single pass over data."""
+    if isinstance(data, list):
+        items = tree.get(ARRAY_ITEMS)
+        if items is not None:
+            for item in data:
+                add_date_ranges(item, items)
+        return data
+
+    if not isinstance(data, dict):
+        return data
+
+    for key, subtree in tree.items():
+        value = data.get(key)
+        if value is None:
+            continue
+        if subtree is None:
+            date_range = parse_date_range(value)
+            if date_range:
+                data[f'{key}Range'] = date_range
+        else:
+            add_date_ranges(value, subtree)
+    return data
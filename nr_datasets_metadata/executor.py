@@ -0,0 +1,179 @@
+import collections
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from flask import current_app
+
+from . import json_backend
+from .constants import DATASETS_PREFERRED_SCHEMA
+from .streaming import bounded_map, chunked
+
+_worker_app = None
+_worker_validator = None
+
+
+def _warm_worker(schema, precheck=False):
+    global _worker_validator
+    from .validators import DatasetValidator
+
+    _worker_validator = DatasetValidator(schema, precheck=precheck)
+
+
+def _init_worker(schema, precheck=False):
+    # runs in a forked worker: the application is inherited from the parent process,
+    # database connections are not and must be reopened
+    from invenio_db import db
+
+    _worker_app.app_context().push()
+    db.engine.dispose()
+    _warm_worker(schema, precheck)
+
+
+def _validate_line(line_no, line, include_data):
+    try:
+        data = json_backend.loads(line)
+    except ValueError as e:
+        return {'line': line_no, 'valid': False, 'error': f'Invalid JSON: {e}'}
+    if not isinstance(data, dict):
+        return {'line': line_no, 'valid': False, 'error': 'Record must be a JSON object'}
+    return {'line': line_no, **_worker_validator.validate(data, include_data=include_data)}
+
+
+def _validate_chunk(chunk, include_data=False):
+    return [_validate_line(line_no, line, include_data) for line_no, line in chunk]
+
+
+def _validate_record_chunk(chunk, include_data=False, record_class=None):
+    if record_class is None:
+        from .record import DatasetBaseRecord as record_class
+    records = {str(record.id): record for record in record_class.get_records(chunk)}
+    ret = []
+    for record_id in map(str, chunk):
+        record = records.get(record_id)
+        if record is None:
+            ret.append({'id': record_id, 'valid': False, 'error': 'Record not found'})
+            continue
+        # validated against the target schema, not the one the record was stored with
+        data = {k: v for k, v in record.items() if k != '$schema'}
+        ret.append({'id': record_id, **_worker_validator.validate(data, include_data=include_data)})
+    return ret
+
+
+def _map_chunks(fn, chunks, processes, schema, precheck=False):
+    global _worker_app
+    if processes <= 1:
+        _warm_worker(schema, precheck)
+        for chunk in chunks:
+            yield from fn(chunk)
+        return
+
+    _worker_app = current_app._get_current_object()
+    with ProcessPoolExecutor(max_workers=processes,
+                             mp_context=multiprocessing.get_context('fork'),
+                             initializer=_init_worker,
+                             initargs=(schema, precheck)) as executor:
+        for chunk_results in bounded_map(executor, fn, chunks, window=2 * processes):
+            yield from chunk_results
+
+
+def validate_lines(lines, processes, chunk_size, include_data=False, schema=DATASETS_PREFERRED_SCHEMA,
+                   precheck=False):
+    """
+    Validates (line number, json line) pairs, yielding results in the input order.
+
+    At most 2 * processes chunks are read ahead, so that memory stays constant
+    regardless of the size of the input. With precheck, records failing the structural
+    pre-check are not fully validated (see DatasetValidator).
+    """
+    yield from _map_chunks(partial(_validate_chunk, include_data=include_data),
+                           chunked(lines, chunk_size), processes, schema, precheck)
+
+
+def validate_record_ids(record_ids, processes, chunk_size, include_data=False,
+                        schema=DATASETS_PREFERRED_SCHEMA, record_class=None, precheck=False):
+    """
+    Validates stored records against the schema, yielding results (keyed by 'id') in the order
+    of record_ids. Workers load the records from the database chunk by chunk, record_ids can be
+    a lazy iterable (for example a query over RecordMetadata.id), it is read ahead the same way
+    as in validate_lines. Needs an application context.
+    """
+    yield from _map_chunks(partial(_validate_record_chunk, include_data=include_data, record_class=record_class),
+                           chunked(record_ids, chunk_size), processes, schema, precheck)
+
+
+def error_path(path):
+    """Error path with array indices replaced by '*', so that the same error in different items is counted once."""
+    return '/'.join('*' if isinstance(x, int) or str(x).isdigit() else str(x) for x in path)
+
+
+def flatten_messages(messages, path=()):
+    """Yields (path, message) pairs of nested marshmallow error messages."""
+    if isinstance(messages, dict):
+        for key, value in messages.items():
+            yield from flatten_messages(value, path + (key,))
+    elif isinstance(messages, (list, tuple)):
+        for value in messages:
+            if isinstance(value, (dict, list, tuple)):
+                yield from flatten_messages(value, path)
+            else:
+                yield path, str(value)
+    else:
+        yield path, str(messages)
+
+
+def result_errors(result):
+    """Yields (source, path, message) for all errors of a validation result."""
+    if 'error' in result:
+        yield 'input', '', result['error']
+    for error in result.get('jsonschemaErrors', ()):
+        yield 'jsonschema', error_path(error['path'].split('/')), error['message']
+    for path, message in flatten_messages(result.get('marshmallowErrors', {})):
+        yield 'marshmallow', error_path(path), message
+
+
+class ValidationReport:
+    """
+    Aggregates validation results into error counts with at most max_examples record keys each,
+    so its size does not grow with the number of records. Examples are kept in the order the results
+    were added, validate_lines and validate_record_ids keep the input order, so the report does not
+    depend on the number of processes.
+    """
+
+    def __init__(self, key='line', max_examples=10):
+        self.key = key
+        self.max_examples = max_examples
+        self.total = 0
+        self.invalid = 0
+        self.errors = collections.Counter()
+        self.examples = collections.defaultdict(list)
+
+    def add(self, result):
+        self.total += 1
+        if result['valid']:
+            return
+        self.invalid += 1
+        key = result[self.key]
+        for error in set(result_errors(result)):
+            self.errors[error] += 1
+            examples = self.examples[error]
+            if len(examples) < self.max_examples:
+                examples.append(key)
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'valid': self.total - self.invalid,
+            'invalid': self.invalid,
+            'errors': [
+                {
+                    'source': source,
+                    'path': path,
+                    'message': message,
+                    'count': count,
+                    'examples': self.examples[(source, path, message)]
+                }
+                for (source, path, message), count in sorted(
+                    self.errors.items(), key=lambda x: (-x[1], x[0]))
+            ]
+        }
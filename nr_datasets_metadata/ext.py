@@ -0,0 +1,13 @@
+from .taxonomy_cache import connect_signals, taxonomy_terms
+
+
+class NRDatasetsMetadata:
+    """Invenio extension, invalidates the process-wide taxonomy term cache on flask_taxonomies changes."""
+
+    def __init__(self, app=None):
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        connect_signals(taxonomy_terms)
+        app.extensions['nr-datasets-metadata'] = self
@@ -0,0 +1,128 @@
+from collections import namedtuple
+from datetime import timezone
+from functools import partial
+
+from . import json_backend
+from .date_ranges import add_date_ranges
+from .streaming import bounded_map
+
+DEFAULT_ENRICHERS = (add_date_ranges,)
+"""Functions called with the document to be indexed, returning the enriched document."""
+
+DEFAULT_CHUNK_BYTES = 10 * 1024 * 1024
+
+BulkChunk = namedtuple('BulkChunk', ['body', 'actions', 'size'])
+BulkChunk.__doc__ = """Newline delimited elasticsearch bulk request body with the number of actions and size in bytes."""
+
+
+def record_source(record):
+    """Returns (id, version, document) for a DatasetBaseRecord or an (id, document) tuple."""
+    if isinstance(record, tuple):
+        record_id, data = record
+        return str(record_id), None, data
+    data = record.dumps()
+    # the same metadata RecordIndexer adds
+    for field, value in (('_created', record.created), ('_updated', record.updated)):
+        data[field] = value.replace(tzinfo=timezone.utc).isoformat() if value else None
+    return str(record.id), record.revision_id, data
+
+
+def prepare_batch(batch, index, enrichers=DEFAULT_ENRICHERS):
+    """
+    Enriches a batch of (id, version, document) and serializes it to bulk action lines with the json_backend.
+    Runs in a worker, so that both enriching and serialization are done in parallel.
+    Enrichers may modify the documents in place.
+    """
+    lines = []
+    for record_id, version, data in batch:
+        for enricher in enrichers:
+            data = enricher(data)
+        action = {'_index': index, '_id': record_id}
+        if version is not None:
+            action['version'] = version
+            action['version_type'] = 'external_gte'
+        lines.append(json_backend.dumps({'index': action}))
+        lines.append(json_backend.dumps(data))
+    return lines
+
+
+def bulk_chunks(prepared_batches, max_chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Packs prepared (action, document) line pairs into BulkChunks of at most max_chunk_bytes."""
+    lines = []
+    size = 0
+    for batch_lines in prepared_batches:
+        for idx in range(0, len(batch_lines), 2):
+            pair = batch_lines[idx:idx + 2]
+            pair_size = len(pair[0]) + len(pair[1]) + 2
+            if lines and size + pair_size > max_chunk_bytes:
+                yield BulkChunk(b'\n'.join(lines) + b'\n', len(lines) // 2, size)
+                lines = []
+                size = 0
+            lines.extend(pair)
+            size += pair_size
+    if lines:
+        yield BulkChunk(b'\n'.join(lines) + b'\n', len(lines) // 2, size)
+
+
+def bulk_index_chunks(batches, index, executor=None, enrichers=DEFAULT_ENRICHERS,
+                      max_chunk_bytes=DEFAULT_CHUNK_BYTES, window=None):
+    """
+    Generator of elasticsearch bulk request chunks for batches of records.
+
+    :param batches:     iterable of lists of DatasetBaseRecord or (id, document) tuples
+    :param index:       name of the target index
+    :param executor:    concurrent.futures executor to prepare the documents in,
+                        documents are prepared in the current process if not set
+    :param enrichers:   functions to call on each document, defaults to date range enrichment
+    :param window:      maximum number of batches being prepared at once,
+                        defaults to twice the number of executor workers
+    """
+    sources = ([record_source(r) for r in batch] for batch in batches)
+    prepare = partial(prepare_batch, index=index, enrichers=enrichers)
+    if executor is None:
+        prepared = map(prepare, sources)
+    else:
+        window = window or 2 * getattr(executor, '_max_workers', 1)
+        prepared = bounded_map(executor, prepare, sources, window)
+    return bulk_chunks(prepared, max_chunk_bytes)
+
+
+def bulk_index(chunks, sink):
+    """Sends all chunks to the sink, returns the number of indexed documents."""
+    count = 0
+    for chunk in chunks:
+        sink(chunk)
+        count += chunk.actions
+    return count
+
+
+def elasticsearch_bulk_sink(client, **kwargs):
+    """Sink sending chunks to elasticsearch, raising an exception if any of the actions failed."""
+
+    def sink(chunk):
+        response = client.bulk(body=chunk.body, **kwargs)
+        if response.get('errors'):
+            failed = [x for x in response['items'] if x['index'].get('error')]
+            raise BulkIndexError(f'{len(failed)} documents failed to index', failed)
+        return response
+
+    return sink
+
+
+class BulkIndexError(Exception):
+    pass
+
+
+class MemoryBulkSink:
+    """Local stand-in for elasticsearch bulk API, keeps the indexed documents in memory."""
+
+    def __init__(self):
+        self.chunks = []
+        self.documents = {}
+
+    def __call__(self, chunk):
+        self.chunks.append(chunk)
+        lines = chunk.body.splitlines()
+        for action_line, document_line in zip(lines[::2], lines[1::2]):
+            action = json_backend.loads(action_line)['index']
+            self.documents[(action['_index'], action['_id'])] = json_backend.loads(document_line)
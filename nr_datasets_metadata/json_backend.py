@@ -0,0 +1,120 @@
+import json
+
+from .constants import JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+PLAIN_TYPES = (str, int, bool, type(None))
+
+
+def orjson_canonical_safe(value):
+    """
+    True if orjson serializes the value exactly as the stdlib: no floats (orjson formats some of them
+    differently, 1e-05 vs 0.00001) and nothing but plain dicts, lists, tuples, strings, ints, bools and None.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is dict:
+            stack.extend(value.values())
+        elif value_type is list or value_type is tuple:
+            stack.extend(value)
+        elif value_type not in PLAIN_TYPES:
+            return False
+    return True
+
+
+class StdlibJSONBackend:
+    """JSON backend based on the standard library. All dumps return compact UTF-8 bytes."""
+    name = 'json'
+
+    def dumps(self, value, default=None):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=default).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def canonical_dumps(self, value):
+        """Compact, key-sorted UTF-8 JSON. Equal for values with the same subschemas.utils.canonical_key."""
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+    def stable_dumps(self, value):
+        """Key-sorted UTF-8 JSON, the same for the same value with this backend. For hashing."""
+        return self.canonical_dumps(value)
+
+
+class OrjsonJSONBackend(StdlibJSONBackend):
+    """
+    orjson based backend. canonical_dumps output is byte-identical to the stdlib one: documents
+    with floats, integers over 64 bits or non-string keys are serialized by the stdlib.
+    """
+    name = 'orjson'
+
+    # like the stdlib, pass datetimes and dataclasses to default instead of serializing them natively
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson else 0
+
+    def dumps(self, value, default=None):
+        try:
+            return orjson.dumps(value, default=default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().dumps(value, default=default)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def canonical_dumps(self, value):
+        if not orjson_canonical_safe(value):
+            return super().canonical_dumps(value)
+        try:
+            return orjson.dumps(value, option=self.options | orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            return super().canonical_dumps(value)
+
+    def stable_dumps(self, value):
+        # without the float check of canonical_dumps, floats are formatted by orjson
+        try:
+            return orjson.dumps(value, option=self.options | orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            return super().canonical_dumps(value)
+
+
+def get_backend(name=JSON_BACKEND):
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'json'
+    if name == 'orjson':
+        if orjson is None:
+            raise ImportError('orjson JSON backend requested but orjson is not installed')
+        return OrjsonJSONBackend()
+    if name == 'json':
+        return StdlibJSONBackend()
+    raise ValueError(f'Unknown JSON backend {name}')
+
+
+backend = get_backend()
+
+
+def set_backend(name):
+    """Switches the JSON backend used by dumps, loads and canonical_dumps, returns the previous one."""
+    global backend
+    previous, backend = backend, get_backend(name)
+    return previous
+
+
+def dumps(value, default=None):
+    return backend.dumps(value, default=default)
+
+
+def loads(data):
+    return backend.loads(data)
+
+
+def canonical_dumps(value):
+    return backend.canonical_dumps(value)
+
+
+def stable_dumps(value):
+    return backend.stable_dumps(value)
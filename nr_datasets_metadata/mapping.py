@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+from .date_ranges import SCHEMA_FILE
+
+MAPPING_INCLUDES_DIR = Path(__file__).parent / 'mapping_includes' / 'v7'
+
+RELEASED_MAPPING_FILE = MAPPING_INCLUDES_DIR / 'nr-datasets-metadata-v3.0.0.json'
+"""Hand-written mapping include of the existing indices, kept as released: their field types can not change."""
+
+MAPPING_FILE = MAPPING_INCLUDES_DIR / 'nr-datasets-metadata-v3.1.0.json'
+"""Generated mapping include for new indices, data of an existing index are reindexed and the alias switched."""
+
+LOCAL_REF = '#/definitions/'
+
+REF_MAPPINGS = {
+    '../multilingual-v2.0.0.json#/definitions/multilingual': {'type': 'multilingual'},
+    '../taxonomy-v2.0.0.json#/definitions/Term': {'type': 'titled-taxonomy-term'},
+    '#/definitions/date': {'type': 'date'},
+}
+"""Mappings of referenced definitions, the types are resolved by oarepo-mapping-includes."""
+
+TYPE_MAPPINGS = {
+    'string': {'type': 'keyword'},
+    'integer': {'type': 'long'},
+    'number': {'type': 'double'},
+    'boolean': {'type': 'boolean'},
+}
+
+DATE_RANGE_MAPPING = {'type': 'date_range', 'format': 'strict_date_optional_time'}
+"""Mapping of ``<field>Range`` added next to each dateOrRange field by date_ranges.add_date_ranges."""
+
+NOT_SEARCHED = {'type': 'keyword', 'index': False, 'doc_values': False}
+"""Kept only in _source: not searchable, not sortable, not aggregatable."""
+
+AGGREGATED_TEXT = {'type': 'text', 'fields': {'keyword': {'type': 'keyword', 'ignore_above': 256}}}
+"""Full text search on the field, exact match filters, terms aggregations and sorting on ``<field>.keyword``."""
+
+MAPPING_OVERRIDES = {
+    'titles': {'type': 'nested'},
+    # StringDateField accepts values elasticsearch date formats do not (202102, 2021-2-1, space separated time)
+    'relatedItems.itemYear': {'type': 'keyword'},
+    'contributors.role': {'type': 'titled-taxonomy-term'},
+    'notes': NOT_SEARCHED,
+    'relatedItems.itemURL': NOT_SEARCHED,
+    'relatedItems.itemVolume': NOT_SEARCHED,
+    'relatedItems.itemIssue': NOT_SEARCHED,
+    'relatedItems.itemStartPage': NOT_SEARCHED,
+    'relatedItems.itemEndPage': NOT_SEARCHED,
+    'relatedItems.itemTitle': AGGREGATED_TEXT,
+    'fundingReferences.projectName': AGGREGATED_TEXT,
+    'geoLocations.geoLocationPlace': AGGREGATED_TEXT,
+}
+"""Dotted field path -> mapping merged over the mapping generated from the JSON schema."""
+
+
+def generate_mapping(schema, definition='DataSet', overrides=MAPPING_OVERRIDES, range_definitions=('dateOrRange',)):
+    """
+    Generates elasticsearch mapping include of the definition from the JSON schema.
+
+    Arrays are mapped as their items, objects (including properties merged from local references,
+    allOf, anyOf and oneOf) as ``object``. Each dateOrRange field gets a ``<field>Range`` sibling.
+    """
+    definitions = schema['definitions']
+    range_refs = {f'{LOCAL_REF}{x}' for x in range_definitions}
+
+    def local_definition(node, expanding):
+        ref = node.get('$ref', '')
+        if ref.startswith(LOCAL_REF) and ref[len(LOCAL_REF):] not in expanding:
+            return ref[len(LOCAL_REF):]
+
+    def collect_properties(node, expanding):
+        properties = {}
+        name = local_definition(node, expanding)
+        if name:
+            properties.update(collect_properties(definitions[name], expanding | {name}))
+        for combinator in ('allOf', 'anyOf', 'oneOf'):
+            for sub in node.get(combinator, ()):
+                properties.update(collect_properties(sub, expanding))
+        properties.update(node.get('properties', {}))
+        return properties
+
+    def field_mapping(node, expanding):
+        ref = node.get('$ref')
+        if ref in REF_MAPPINGS:
+            return dict(REF_MAPPINGS[ref])
+        if node.get('type') == 'array' and isinstance(node.get('items'), dict):
+            return field_mapping(node['items'], expanding)
+        properties = collect_properties(node, expanding)
+        if properties:
+            return {'type': 'object', 'properties': properties_mapping(properties, expanding)}
+        ref = ref or ''
+        if ref.startswith(LOCAL_REF):
+            name = local_definition(node, expanding)
+            if not name:
+                # recursive definition, elasticsearch maps the deeper levels dynamically
+                return {'type': 'object'}
+            return field_mapping(definitions[name], expanding | {name})
+        return dict(TYPE_MAPPINGS.get(node.get('type'), TYPE_MAPPINGS['string']))
+
+    def properties_mapping(properties, expanding):
+        ret = {}
+        for name, prop in properties.items():
+            ret[name] = field_mapping(prop, expanding)
+            if prop.get('$ref') in range_refs:
+                ret[f'{name}Range'] = dict(DATE_RANGE_MAPPING)
+        return ret
+
+    properties = properties_mapping(collect_properties(definitions[definition], frozenset({definition})),
+                                    frozenset({definition}))
+    for path, override in overrides.items():
+        *parents, name = path.split('.')
+        node = properties
+        for parent in parents:
+            node = node[parent]['properties']
+        node[name] = {**node.get(name, {}), **override}
+    return {'mappings': {'properties': properties}}
+
+
+def dumps_mapping(mapping):
+    return json.dumps(mapping, indent=2, ensure_ascii=False) + '\n'
+
+
+def build_mapping(schema_file=SCHEMA_FILE, **kwargs):
+    """Returns the generated mapping include as it is stored in MAPPING_FILE."""
+    with open(schema_file) as f:
+        return dumps_mapping(generate_mapping(json.load(f), **kwargs))
@@ -9,6 +9,35 @@
 
 from __future__ import absolute_import, print_function
 
-from .subschemas.dataset import DataSetMetadataSchemaV3
+import importlib
 
-__all__ = ('DataSetMetadataSchemaV3',)
+_LAZY_IMPORTS = {
+    'DataSetMetadataSchemaV3': '.subschemas.dataset',
+    'BatchResult': '.batch',
+    'BatchValidator': '.batch',
+    'validate_batch': '.batch',
+    'FieldTimings': '.profiling',
+    'instrument_schema': '.profiling',
+    'IncrementalSchema': '.incremental',
+    'changed_fields': '.incremental',
+    'to_typed': '.typed',
+    'to_dict': '.typed',
+}
+"""Exported names and the modules they live in. The schemas pull in taxonomies, multilingual,
+idutils and babel, so they are imported only on first access."""
+
+__all__ = ('DataSetMetadataSchemaV3', 'BatchResult', 'BatchValidator', 'validate_batch',
+           'FieldTimings', 'instrument_schema', 'IncrementalSchema', 'changed_fields', 'to_typed', 'to_dict')
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
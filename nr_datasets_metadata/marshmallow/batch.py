@@ -0,0 +1,96 @@
+from collections import namedtuple
+
+from marshmallow import ValidationError, fields
+
+from nr_datasets_metadata.streaming import chunked
+from nr_datasets_metadata.taxonomy_cache import term_scope
+from nr_datasets_metadata.marshmallow.profiling import instrument_schema
+from nr_datasets_metadata.marshmallow.subschemas.interning import intern_strings
+from nr_datasets_metadata.marshmallow.typed import to_typed
+
+DEFAULT_PREFETCH_SIZE = 100
+
+BatchResult = namedtuple('BatchResult', ['index', 'data', 'errors'])
+BatchResult.__doc__ = """Outcome of one record in a batch: loaded data or marshmallow error messages."""
+
+
+def prepare_schema(schema):
+    """Binds all nested schemas of the schema graph so that the first record does not pay for it."""
+    for field in schema.fields.values():
+        _prepare_field(field)
+    return schema
+
+
+def _prepare_field(field):
+    if isinstance(field, fields.List):
+        _prepare_field(field.inner)
+    elif isinstance(field, fields.Nested):
+        nested = field.schema
+        if nested is not None:
+            prepare_schema(nested)
+
+
+class BatchValidator:
+    """
+    Validates many metadata records with a single, prebuilt schema instance.
+
+    Loading a record via ``DataSetMetadataSchemaV3().load`` deep copies all declared fields
+    and binds the nested schemas (creators, related items, identifiers, ...) again for every
+    record. The batch validator builds the schema graph once and reuses it for all records.
+    Taxonomy terms of a chunk of records are prefetched with one lookup per taxonomy.
+    """
+
+    def __init__(self, schema_class=None, context=None, term_cache=None, prefetch_size=DEFAULT_PREFETCH_SIZE,
+                 timings=None, intern=False, typed=False):
+        """
+        :param term_cache:      process-wide TaxonomyTermCache, the default one if not set
+        :param prefetch_size:   number of records whose taxonomy terms are fetched at once
+        :param timings:         FieldTimings to record per-field validation times to, off if not set
+        :param intern:          intern enumerated values and dict keys of loaded data (see subschemas.interning)
+        :param typed:           return loaded data in the compact typed representation (see typed.to_typed)
+        """
+        from nr_datasets_metadata.taxonomy_cache import TaxonomyTermScope
+
+        if schema_class is None:
+            from .subschemas.dataset import DataSetMetadataSchemaV3
+            schema_class = DataSetMetadataSchemaV3
+        # activated per load, nested schemas share their context with all other schema instances
+        self.terms = TaxonomyTermScope(term_cache)
+        self.prefetch_size = prefetch_size
+        self.intern = intern
+        self.typed = typed
+        self.schema = prepare_schema(schema_class(context=dict(context or {})))
+        if timings is not None:
+            self.schema = instrument_schema(self.schema, timings)
+
+    def validate(self, records, **kwargs):
+        """Returns a generator of BatchResult, one for each record, in the input order."""
+        index = 0
+        for chunk in chunked(records, self.prefetch_size):
+            self.terms.clear()
+            self.terms.prefetch_records(chunk)
+            for record in chunk:
+                yield self._load(record, index, **kwargs)
+                index += 1
+
+    def validate_one(self, record, index=0, **kwargs):
+        self.terms.clear()
+        self.terms.prefetch_records([record])
+        return self._load(record, index, **kwargs)
+
+    def _load(self, record, index, **kwargs):
+        try:
+            with term_scope(self.terms):
+                data = self.schema.load(record, **kwargs)
+        except ValidationError as e:
+            return BatchResult(index, None, e.messages)
+        if self.intern:
+            data = intern_strings(data)
+        if self.typed:
+            data = to_typed(data)
+        return BatchResult(index, data, None)
+
+
+def validate_batch(records, schema_class=None, context=None, term_cache=None, **kwargs):
+    """Validates an iterable of metadata records, yielding a BatchResult for each of them."""
+    return BatchValidator(schema_class, context=context, term_cache=term_cache).validate(records, **kwargs)
@@ -0,0 +1,109 @@
+import re
+
+from marshmallow import ValidationError
+
+
+def top_level_field(path):
+    """
+    Returns the top-level field of a JSON pointer (``/relatedItems/0/itemTitle``) or a dotted path
+    (``relatedItems.0.itemTitle``, ``relatedItems[0]``). Returns None for the whole document.
+    """
+    if path.startswith('/'):
+        token = path[1:].split('/', 1)[0].replace('~1', '/').replace('~0', '~')
+    else:
+        token = re.split(r'[.\[]', path, 1)[0]
+    return token or None
+
+
+def changed_fields(changes):
+    """
+    Returns the set of top-level fields touched by a JSON Patch (list of operations)
+    or by an iterable of changed paths. Returns None if the whole document might have changed.
+    """
+    if changes is None:
+        return None
+    ret = set()
+    for change in changes:
+        if isinstance(change, dict):
+            paths = [change['path']]
+            if 'from' in change:
+                paths.append(change['from'])
+        else:
+            paths = [change]
+        for path in paths:
+            field = top_level_field(path)
+            if field is None:
+                return None
+            ret.add(field)
+    return ret
+
+
+def has_root_hooks(schema):
+    return any(schema._hooks.values())
+
+
+class IncrementalSchema:
+    """
+    Loads only the top-level fields that changed since the previous validated data and takes
+    the rest from previous. Nested schemas validate within a single top-level field, so the result
+    is the same as of a full load as long as the root schema has no cross-field hooks - if it has,
+    the whole document is loaded. ``dependencies`` maps a field to the fields that must be
+    revalidated with it.
+
+    :param schema:      schema instance, for example ``DataSetMetadataSchemaV3()``
+    :param previous:    result of the previous (successful) load of the document
+    :param changed:     top-level data keys that changed (see changed_fields), None for all
+    """
+
+    def __init__(self, schema, previous, changed, dependencies=None):
+        self.schema = schema
+        self.previous = previous
+        self.changed = self._with_dependencies(changed, dependencies or {})
+
+    @staticmethod
+    def _with_dependencies(changed, dependencies):
+        if changed is None:
+            return None
+        ret = set()
+        pending = list(changed)
+        while pending:
+            field = pending.pop()
+            if field not in ret:
+                ret.add(field)
+                pending.extend(dependencies.get(field, ()))
+        return ret
+
+    @property
+    def context(self):
+        return self.schema.context
+
+    def load(self, data, **kwargs):
+        if self.changed is None or self.previous is None or has_root_hooks(self.schema):
+            return self.schema.load(data, **kwargs)
+
+        unchanged = {}
+        changed_attributes = set()
+        for name, field in self.schema.load_fields.items():
+            attribute = field.attribute or name
+            if (field.data_key or name) in self.changed:
+                changed_attributes.add(attribute)
+            else:
+                unchanged[name] = attribute
+
+        kept = {k: v for k, v in self.previous.items() if k not in changed_attributes}
+        subset = {k: v for k, v in data.items() if k in self.changed}
+        try:
+            loaded = self.schema.load(subset, partial=tuple(unchanged), **kwargs)
+        except ValidationError as e:
+            e.valid_data = {**kept, **(e.valid_data or {})}
+            raise
+        return {**kept, **loaded}
+
+
+def incremental_schema(schema_class, previous, changed, dependencies=None):
+    """Returns a schema factory (taking the same arguments as schema_class) of IncrementalSchemas."""
+
+    def factory(*args, **kwargs):
+        return IncrementalSchema(schema_class(*args, **kwargs), previous, changed, dependencies)
+
+    return factory
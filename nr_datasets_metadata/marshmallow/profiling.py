@@ -0,0 +1,131 @@
+import copy
+import functools
+import threading
+import time
+from collections import defaultdict
+
+from marshmallow import fields
+from marshmallow.decorators import VALIDATES_SCHEMA
+
+ARRAY_ITEMS = '[]'
+
+
+class FieldTimings:
+    """
+    Cumulative deserialization time and number of calls per field path, for example
+    ``relatedItems[].itemCreators``. Schema validators are recorded as ``<path>@<method name>``.
+    Times of nested fields are included in the times of their parents.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def record(self, path, seconds):
+        with self._lock:
+            self.calls[path] += 1
+            self.seconds[path] += seconds
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                path: {'calls': self.calls[path], 'seconds': self.seconds[path]}
+                for path in sorted(self.calls)
+            }
+
+    def to_prometheus(self, prefix='nr_datasets_validation'):
+        """Returns the timings as Prometheus text exposition format counters."""
+        timings = self.as_dict()
+        lines = []
+        for metric, key, help_text in (
+                ('field_seconds_total', 'seconds', 'Cumulative time spent deserializing the field'),
+                ('field_calls_total', 'calls', 'Number of deserializations of the field')):
+            name = f'{prefix}_{metric}'
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for path, values in timings.items():
+                escaped = path.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{name}{{path="{escaped}"}} {values[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self.calls.clear()
+            self.seconds.clear()
+
+
+def timed(fn, path, timings):
+    perf_counter = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings.record(path, perf_counter() - start)
+
+    return wrapper
+
+
+def _own_field(field, parent):
+    field = copy.copy(field)
+    field.parent = parent
+    return field
+
+
+def _own_fields(schema):
+    """
+    Shallow copy of the schema instance with its own copies of the field objects. Nested schema
+    instances share their field objects with all other instances, they must not be modified.
+    """
+    schema = copy.copy(schema)
+    copies = {}
+    for attr in ('declared_fields', 'fields', 'load_fields', 'dump_fields'):
+        owned = {}
+        for name, field in getattr(schema, attr).items():
+            if id(field) not in copies:
+                copies[id(field)] = _own_field(field, schema)
+            owned[name] = copies[id(field)]
+        setattr(schema, attr, owned)
+    return schema
+
+
+def instrument_schema(schema, timings, path=''):
+    """
+    Returns a copy of the schema instance recording timings of all fields and validates_schema hooks
+    of the schema and its nested schemas. The copy has its own field objects and nested schemas,
+    the schema passed in and all other instances are not instrumented and have no overhead at all.
+
+    Schemas that load the data with other schema instances than those of their fields (AuthoritySchema
+    and its wrapped person/organization schemas) define ``instrument_delegates(instrument)``, it is called
+    on the copy with a function returning instrumented copies of schemas loading the data at the same path.
+    """
+    schema = _own_fields(schema)
+    for name, field in schema.fields.items():
+        key = field.data_key or name
+        instrument_field(field, timings, f'{path}.{key}' if path else key)
+    for key, attr_names in schema._hooks.items():
+        # field validators are registered under a plain 'validates' key, the others under (tag, pass_many)
+        if isinstance(key, tuple) and key[0] == VALIDATES_SCHEMA:
+            for attr_name in attr_names:
+                # a copy of an instrumented schema gets new wrappers, not stacked ones
+                schema.__dict__.pop(attr_name, None)
+                setattr(schema, attr_name, timed(getattr(schema, attr_name), f'{path}@{attr_name}', timings))
+    if hasattr(schema, 'instrument_delegates'):
+        schema.instrument_delegates(lambda delegate: instrument_schema(delegate, timings, path))
+    return schema
+
+
+def instrument_field(field, timings, path):
+    """Instruments a field owned by the schema copy made by instrument_schema."""
+    field.__dict__.pop('deserialize', None)
+    field.deserialize = timed(field.deserialize, path, timings)
+    if isinstance(field, fields.List):
+        field.inner = _own_field(field.inner, field)
+        instrument_field(field.inner, timings, path + ARRAY_ITEMS)
+    elif isinstance(field, fields.Nested):
+        nested = field.schema
+        if nested is not None:
+            field._schema = instrument_schema(nested, timings, path + ARRAY_ITEMS if field.many else path)
@@ -1,13 +1,27 @@
-import functools
-import inspect
+import threading
 
 from flask_babelex import lazy_gettext as _
 from marshmallow import Schema, fields, ValidationError
+from marshmallow.error_store import merge_errors
 from marshmallow_oneofschema import OneOfSchema
 from marshmallow_utils.fields import SanitizedUnicode
-from marshmallow_utils.schemas import IdentifierSchema
 from oarepo_rdm_records.marshmallow.mixins import TitledMixin
-from oarepo_taxonomies.marshmallow import TaxonomyField, TaxonomySchema
+
+from nr_datasets_metadata.marshmallow.subschemas.identifiers import CachedIdentifierSchema
+from nr_datasets_metadata.marshmallow.subschemas.taxonomy import TaxonomyField, CachedTaxonomySchema
+
+NAME_TYPES = ("Personal", "Organizational")
+
+
+def name_types_error(name_types):
+    """Error message of an authority whose items have the given set of nameTypes, None if it is valid."""
+    if len(name_types) > 1:
+        return _('Can not mix personal and organizational authorities')
+    if not name_types:
+        return _('nameType is missing')
+    if next(iter(name_types)) not in NAME_TYPES:
+        return _('Unknown nameType. Must be one of "Personal", "Organizational"')
+    return None
 
 
 class AuthorityBaseSchema(Schema):
@@ -20,7 +34,7 @@ class AuthorityBaseSchema(Schema):
             # TODO: IdentifierSchema performs checks for values which would fail here ...
             # TODO: setting fail_on_unknown disables this but should be handled by extending
             # TODO: the validation criteria
-            IdentifierSchema(allowed_schemes=(
+            CachedIdentifierSchema(allowed_schemes=(
                 "orcid",
                 "scopusID",
                 "researcherID",
@@ -41,40 +55,125 @@ class PersonSchema(AuthorityBaseSchema):
     affiliation = TaxonomyField(mixins=[TitledMixin], required=False, many=True)
 
 
-class OrganizationSchema(AuthorityBaseSchema, TaxonomySchema):
+class OrganizationSchema(AuthorityBaseSchema, CachedTaxonomySchema):
     name_type = SanitizedUnicode(data_key='nameType', attribute='nameType',
                                  choices=("Organizational",))
 
 
+class WrappedSchemaRegistry:
+    """
+    Thread-safe registry of person/organization schemas extended with the fields
+    of the authority schema that uses them (for example role of ContributorSchema).
+
+    The wrapped class and its instance are created only once per (authority class, base class)
+    and shared by all authority schema instances.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, authority_class, clz):
+        key = (authority_class, clz)
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self.hits += 1
+                return schema
+            self.misses += 1
+            wrapped = type(clz.__name__, (clz,), dict(authority_class._declared_fields))
+            schema = self._schemas[key] = wrapped()
+            return schema
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._schemas)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._schemas.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+wrapped_schemas = WrappedSchemaRegistry()
+
+
 class AuthoritySchema(Schema):
+    """
+    Person or organization. The item is checked with validate_authority and loaded
+    by the shared wrapped Person/Organization schema in a single pass, errors of both
+    are reported together.
+    """
 
-    @functools.lru_cache(maxsize=2)
     def wrap_class(self, clz):
         # add extra fields to the class
-        return type(clz.__name__, (clz,), self.declared_fields)
+        return type(self.wrapped_schema(clz))
+
+    def wrapped_schema(self, clz):
+        own = self.__dict__.get('_wrapped_schemas')
+        if own is not None:
+            return own[clz]
+        return wrapped_schemas.get(type(self), clz)
+
+    def instrument_delegates(self, instrument):
+        """Called by profiling.instrument_schema on its copy of the schema, loads with instrumented wrapped schemas."""
+        self._wrapped_schemas = {
+            clz: instrument(wrapped_schemas.get(type(self), clz)) for clz in (PersonSchema, OrganizationSchema)
+        }
+
+    def validate_authority(self, data, name_type):
+        """Checks an authority before it is loaded, returns a dict of field errors. Hook for subclasses."""
+        return {}
 
     def load(self, data, *, many=None, partial=None, unknown=None, **kwargs):
-        if isinstance(data, (list, tuple)):
-            types = set()
-            for d in data:
-                types.add(d['nameType'])
-            if len(types) > 1:
-                raise ValidationError(message=_('Can not mix personal and organizational authorities'))
-            name_type = list(types)[0]
-            if name_type == 'Personal':
-                return self.wrap_class(PersonSchema)().load(data, many=True, partial=partial, unknown=unknown)
-            else:
-                return self.wrap_class(OrganizationSchema)().load(data, many=True, partial=partial, unknown=unknown)
-
-        name_type = data.get('nameType')
-        if not name_type:
-            raise ValidationError(message=_('nameType is missing'))
-
-        if name_type == 'Personal':
-            return self.wrap_class(PersonSchema)().load(data, many=False, partial=partial, unknown=unknown)
-        elif name_type == 'Organizational':
-            if not isinstance(data, (list, tuple)):
-                data = [data]
-            return self.wrap_class(OrganizationSchema)().load(data, many=True, partial=partial, unknown=unknown)
+        # a list is an organization with its taxonomy ancestors
+        many = isinstance(data, (list, tuple))
+        if not many and not isinstance(data, dict):
+            raise ValidationError(message=_('Invalid input type'))
+
+        name_types = set()
+        errors = {}
+        checked = []
+        for idx, item in enumerate(data if many else [data]):
+            if not isinstance(item, dict):
+                # taxonomy reference, resolved by the organization schema
+                checked.append(item)
+                continue
+            name_type = item.get('nameType')
+            if name_type:
+                name_types.add(name_type)
+            item_errors = self.validate_authority(item, name_type)
+            if item_errors:
+                # do not pass invalid fields to the schema, their errors are already known
+                item = {k: v for k, v in item.items() if k not in item_errors}
+                errors.update({idx: item_errors} if many else item_errors)
+            checked.append(item)
+
+        message = name_types_error(name_types)
+        if message:
+            raise ValidationError(message=message)
+
+        if name_types.pop() == 'Personal':
+            schema = self.wrapped_schema(PersonSchema)
+            data = checked if many else checked[0]
         else:
-            raise ValidationError(message=_('Unknown nameType. Must be one of "Personal", "Organizational"'))
+            # organization is a taxonomy term, always loaded as a list
+            schema = self.wrapped_schema(OrganizationSchema)
+            data = checked
+
+        try:
+            ret = schema.load(data, many=isinstance(data, list), partial=partial, unknown=unknown)
+        except ValidationError as e:
+            if not errors:
+                raise
+            raise ValidationError(merge_errors(errors, e.messages))
+        if errors:
+            raise ValidationError(errors, valid_data=ret)
+        return ret
@@ -3,7 +3,6 @@ from functools import partial
 from marshmallow import Schema, fields
 from marshmallow_utils.fields import EDTFDateString
 from oarepo_multilingual.marshmallow import MultilingualStringV2
-from oarepo_taxonomies.marshmallow import TaxonomyField
 
 from nr_datasets_metadata.marshmallow.constants import RDM_RECORDS_IDENTIFIERS_SCHEMES
 from nr_datasets_metadata.marshmallow.subschemas.date import DateWithdrawn
@@ -12,7 +11,7 @@ from nr_datasets_metadata.marshmallow.subschemas.geo import GeoLocationSchema
 from nr_datasets_metadata.marshmallow.subschemas.person import CreatorSchema, ContributorSchema
 from nr_datasets_metadata.marshmallow.subschemas.pids import PersistentIdentifierSchema
 from nr_datasets_metadata.marshmallow.subschemas.related import RelatedItemSchema
-from nr_datasets_metadata.marshmallow.subschemas.taxonomy import SingleValuedMixin
+from nr_datasets_metadata.marshmallow.subschemas.taxonomy import SingleValuedMixin, TaxonomyField
 from nr_datasets_metadata.marshmallow.subschemas.titles import TitlesList
 from nr_datasets_metadata.marshmallow.subschemas.utils import no_duplicates, not_empty
 
@@ -1,23 +1,63 @@
+import datetime
 import re
 
 from flask_babelex import lazy_gettext as _
 from marshmallow import fields, ValidationError, Schema
-from marshmallow.utils import from_iso_datetime, from_iso_date
 from marshmallow_utils.fields import EDTFDateString
 
 
-def to_pattern(pattern):
-    pattern = pattern.replace('Y', '(?P<year>[0-9]{4})').replace('Y', '(?P<month>[0-9]{1,2})')
-    return re.compile(pattern)
+DATE_PATTERN = re.compile(r"""
+    (?P<year>\d{4})
+    (?:
+        (?P<compact_month>\d{2})
+      | -(?P<month>\d{1,2})
+        (?:
+            -(?P<day>\d{1,2})
+            (?:
+                [T\ ](?P<hour>\d{1,2}):(?P<minute>\d{1,2})
+                (?::(?P<second>\d{1,2})(?:\.(?P<microsecond>\d{1,6})\d{0,6})?)?
+                (?P<tzinfo>Z|[+-]\d{2}(?::?\d{2})?)?
+            )?
+        )?
+    )?
+    \Z""", re.VERBOSE)
+"""Year (2021), year-month (202102, 2021-02), ISO date and ISO datetime in a single anchored pattern."""
+
+DATE_COMPONENTS = ('year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond')
+
+
+def parse_string_date(value):
+    """
+    Parses the value with DATE_PATTERN and returns a dict with integer year, month, day, hour,
+    minute, second and microsecond (those present in the value) plus string tzinfo if present.
+
+    Raises ValidationError if the value is not a supported date string.
+    """
+    match = DATE_PATTERN.match(value) if isinstance(value, str) else None
+    if not match:
+        raise ValidationError(message=_('Unsupported date string'))
+
+    groups = match.groupdict()
+    if groups['compact_month']:
+        groups['month'] = groups['compact_month']
+    ret = {k: int(groups[k]) for k in DATE_COMPONENTS if groups[k]}
+    if groups['microsecond']:
+        ret['microsecond'] = int(groups['microsecond'].ljust(6, '0'))
+    if groups['tzinfo']:
+        ret['tzinfo'] = groups['tzinfo']
+
+    month = ret.get('month')
+    if month is not None and not (1 <= month <= 12):
+        raise ValidationError(message=_('Bad month value'))
+    if 'day' in ret:
+        try:
+            datetime.datetime(**{k: v for k, v in ret.items() if k != 'tzinfo'})
+        except ValueError:
+            raise ValidationError(message=_('Unsupported date string'))
+    return ret
 
 
 class StringDateField(fields.Field):
-    valid_patterns = [
-        to_pattern(x) for x in (
-            'Y',
-            'YM'
-        )
-    ]
 
     def _serialize(self, value, attr, obj, **kwargs):
         if value is None:
@@ -28,31 +68,8 @@ class StringDateField(fields.Field):
         if value is None:
             return None
 
-        for pattern in self.valid_patterns:
-            match = pattern.match(value)
-            if match:
-                month = match.groupdict().get('month', None)
-                if month:
-                    if not (1 <= int(month) <= 12):
-                        raise ValidationError(
-                            message=_('Bad month value'),
-                            field_name=attr
-                        )
-                return value
-        try:
-            from_iso_datetime(value)
-            return value
-        except:
-            pass
-        try:
-            from_iso_date(value)
-            return value
-        except:
-            pass
-        raise ValidationError(
-            message=_('Unsupported date string'),
-            field_name=attr
-        )
+        parse_string_date(value)
+        return value
 
 
 class DateWithdrawn(Schema):
@@ -1,5 +1,5 @@
 from marshmallow import Schema, fields
-from oarepo_taxonomies.marshmallow import TaxonomyField
+from nr_datasets_metadata.marshmallow.subschemas.taxonomy import TaxonomyField
 
 
 class FundingReference(Schema):
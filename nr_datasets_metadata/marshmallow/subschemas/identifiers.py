@@ -0,0 +1,129 @@
+import functools
+
+import idutils
+from marshmallow import ValidationError, pre_load, validates_schema, post_load
+from marshmallow_utils.schemas import IdentifierSchema
+
+from nr_datasets_metadata.constants import IDENTIFIER_CACHE_SIZE
+from nr_datasets_metadata.marshmallow.constants import RDM_RECORDS_IDENTIFIERS_SCHEMES
+
+
+def _detect_schemes(identifier):
+    return tuple(idutils.detect_identifier_schemes(identifier))
+
+
+def _is_valid(scheme, identifier):
+    # dispatch directly on the scheme instead of trying all the schemes in turn
+    scheme_def = RDM_RECORDS_IDENTIFIERS_SCHEMES.get(scheme)
+    if scheme_def:
+        return bool(scheme_def['validator'](identifier))
+    validator = getattr(idutils, f'is_{scheme.lower()}', None)
+    if validator is not None:
+        return bool(validator(identifier))
+    return scheme in _detect_schemes(identifier)
+
+
+class IdentifierCache:
+    """
+    Bounded LRU caches of idutils scheme detection, (scheme, identifier) validation and
+    normalization. Identifiers repeat a lot across related items, idutils is regex heavy.
+    """
+
+    def __init__(self, maxsize=IDENTIFIER_CACHE_SIZE):
+        self.configure(maxsize)
+
+    def configure(self, maxsize):
+        """Sets the size of each of the caches, drops the cached values."""
+        self.maxsize = maxsize
+        self.detect_schemes = functools.lru_cache(maxsize=maxsize)(_detect_schemes)
+        self.is_valid = functools.lru_cache(maxsize=maxsize)(_is_valid)
+        self.normalize = functools.lru_cache(maxsize=maxsize)(idutils.normalize_pid)
+
+    def clear(self):
+        self.detect_schemes.cache_clear()
+        self.is_valid.cache_clear()
+        self.normalize.cache_clear()
+
+    def stats(self):
+        ret = {}
+        for name in ('detect_schemes', 'is_valid', 'normalize'):
+            info = getattr(self, name).cache_info()
+            calls = info.hits + info.misses
+            ret[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'maxsize': info.maxsize,
+                'hit_rate': info.hits / calls if calls else 0
+            }
+        return ret
+
+
+identifier_cache = IdentifierCache()
+
+
+class CachedIdentifierSchema(IdentifierSchema):
+    """
+    IdentifierSchema with cached scheme detection, validation and normalization.
+
+    If trust_declared_scheme is set, an identifier with an explicit scheme that passes the
+    scheme's validator is accepted without detecting schemes. Note that the plain
+    IdentifierSchema replaces the declared scheme with the detected one.
+    """
+
+    def __init__(self, *args, trust_declared_scheme=False, cache=None, **kwargs):
+        self.trust_declared_scheme = trust_declared_scheme
+        self.cache = cache or identifier_cache
+        super().__init__(*args, **kwargs)
+
+    def _detect_scheme(self, identifier):
+        detected_schemes = self.cache.detect_schemes(identifier)
+
+        if self.allowed_schemes:
+            for d in detected_schemes:
+                if d in self.allowed_schemes:
+                    return d
+
+        return detected_schemes[0] if detected_schemes else None
+
+    def _has_trusted_scheme(self, data):
+        if not self.trust_declared_scheme:
+            return False
+        scheme = data.get('scheme')
+        identifier = data.get('identifier')
+        return bool(scheme and identifier and self.cache.is_valid(scheme, identifier))
+
+    @pre_load(pass_many=False)
+    def load_scheme(self, data, **kwargs):
+        if self._has_trusted_scheme(data):
+            return data
+        return super().load_scheme(data, **kwargs)
+
+    @validates_schema
+    def validate_identifier(self, data, **kwargs):
+        identifier = data.get('identifier')
+        scheme = data.get('scheme')
+
+        if self.identifier_required and not identifier:
+            raise ValidationError('Missing required identifier.')
+
+        if identifier and not scheme:
+            raise ValidationError(f'Missing scheme value for identifier {identifier}.')
+
+        if identifier:
+            if scheme in self.forbidden_schemes:
+                raise ValidationError(f'Invalid scheme {scheme}.')
+
+            if self.allowed_schemes and scheme not in self.allowed_schemes:
+                raise ValidationError(f'Invalid scheme {scheme}.')
+
+            if self.fail_on_unknown and not self._has_trusted_scheme(data) and \
+                    scheme not in self.cache.detect_schemes(identifier):
+                raise ValidationError(f'Invalid scheme {scheme}.')
+
+    @post_load
+    def normalize_identifier(self, data, **kwargs):
+        identifier = data.get('identifier')
+        if identifier:
+            data['identifier'] = self.cache.normalize(identifier, data['scheme'])
+        return data
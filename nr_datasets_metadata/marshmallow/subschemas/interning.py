@@ -0,0 +1,36 @@
+import sys
+
+INTERNED_VALUE_FIELDS = frozenset({
+    'nameType',     # AuthorityBaseSchema: Personal, Organizational
+    'titleType',    # TitlesSchema: mainTitle, alternativeTitle, subtitle, other
+    'scheme',       # CachedIdentifierSchema: keys of RDM_RECORDS_IDENTIFIERS_SCHEMES, authority schemes
+    'status',       # PersistentIdentifierSchema
+})
+"""Fields with values from a small set of strings."""
+
+CONTAINERS = (dict, list)
+
+
+def intern_strings(data, value_fields=INTERNED_VALUE_FIELDS):
+    """
+    Post-load stage replacing, in place, all dict keys (field names, multilingual language codes,
+    taxonomy term keys) and string values of value_fields with interned strings, so that each of them
+    is stored once for all loaded records. Returns data.
+    """
+    intern = sys.intern
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            items = [
+                (intern(k), intern(v) if k in value_fields and type(v) is str else v)
+                if type(k) is str else (k, v)
+                for k, v in node.items()
+            ]
+            # assigning to an existing key keeps the original key object, the dict must be refilled
+            node.clear()
+            node.update(items)
+            stack.extend(v for _, v in items if type(v) in CONTAINERS)
+        elif type(node) is list:
+            stack.extend(v for v in node if type(v) in CONTAINERS)
+    return data
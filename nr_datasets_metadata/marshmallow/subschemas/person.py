@@ -9,41 +9,23 @@
 """RDM record schemas."""
 
 from flask_babelex import lazy_gettext as _
-from marshmallow import (
-    ValidationError, Schema,
-)
+from marshmallow import Schema
 from oarepo_rdm_records.marshmallow.mixins import TitledMixin
-from oarepo_taxonomies.marshmallow import TaxonomyField
+from nr_datasets_metadata.marshmallow.subschemas.taxonomy import TaxonomyField
 
 from nr_datasets_metadata.marshmallow.subschemas.authority import AuthoritySchema
 
 
 class AffiliationRequiredMixin(Schema):
-    def load(self, data, *, many=None, partial=None, unknown=None, **kwargs):
-        d = data
-
-        if not isinstance(d, (list, tuple)):
-            d = [d]
-
-        for dd in d:
-            affilliation = dd.get('affiliation', None)
-            nameType = dd.get('nameType', None)
-            if not affilliation:
-                if not nameType or (nameType != 'Organizational'):
-                    raise ValidationError(
-                        message=_('Required affiliation field not found')
-                    )
-            elif not isinstance(affilliation, (list, tuple)):
-                raise ValidationError(
-                    message=_('affiliation must be a taxonomy')
-                )
-            elif not len(affilliation):
-                if not nameType or (nameType != 'Organizational'):
-                    raise ValidationError(
-                        message=_('affiliation is not set up')
-                    )
-
-        return data
+    def validate_authority(self, data, name_type):
+        errors = super().validate_authority(data, name_type)
+        affiliation = data.get('affiliation', None)
+        if not affiliation:
+            if name_type != 'Organizational':
+                errors['affiliation'] = [_('Required affiliation field not found')]
+        elif not isinstance(affiliation, (list, tuple)):
+            errors['affiliation'] = [_('affiliation must be a taxonomy')]
+        return errors
 
 
 class ContributorSchema(AffiliationRequiredMixin, AuthoritySchema):
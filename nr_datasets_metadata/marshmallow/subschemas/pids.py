@@ -1,6 +1,7 @@
 from marshmallow import fields
-from marshmallow_utils.schemas import IdentifierSchema
 
+from nr_datasets_metadata.marshmallow.subschemas.identifiers import CachedIdentifierSchema
 
-class PersistentIdentifierSchema(IdentifierSchema):
+
+class PersistentIdentifierSchema(CachedIdentifierSchema):
     status = fields.Str(required=True)
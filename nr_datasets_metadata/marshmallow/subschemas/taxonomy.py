@@ -1,5 +1,12 @@
+import copy
+import types
+
 from marshmallow import ValidationError, validates_schema, Schema
 from flask_babelex import lazy_gettext as _
+from oarepo_taxonomies.marshmallow import TaxonomyField as upstream_taxonomy_field, TaxonomySchema, \
+    TaxonomyTermMerger
+
+from nr_datasets_metadata.taxonomy_cache import active_term_cache, term_key
 
 
 class SingleValuedMixin(Schema):
@@ -8,3 +15,68 @@ class SingleValuedMixin(Schema):
         if value and isinstance(value, (list, tuple)) and len(value) > 1:
             raise ValidationError(message=_('Only one value required'))
         return value
+
+
+def rebind_globals(function, **names):
+    """
+    Copy of an oarepo_taxonomies function (a schema hook or a field factory) that resolves the given
+    global names to other objects, so the upstream code is reused with the cached classes instead of copied.
+    """
+    rebound = types.FunctionType(function.__code__, {**function.__globals__, **names}, function.__name__,
+                                 function.__defaults__, function.__closure__)
+    rebound.__kwdefaults__ = function.__kwdefaults__
+    rebound.__doc__ = function.__doc__
+    # keeps the marshmallow hook registration of the function
+    rebound.__dict__.update(function.__dict__)
+    return rebound
+
+
+class CachedTaxonomyTermMerger(TaxonomyTermMerger):
+    """
+    Term merger taking the terms from the active TaxonomyTermScope (see taxonomy_cache.term_scope)
+    or the process-wide taxonomy term cache instead of the database. References and terms are collected
+    and merged in their order when the merged terms are requested, all the terms are fetched at once.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pending = []
+
+    def add_reference(self, ref):
+        self.pending.append((ref, None))
+
+    def add_term(self, term):
+        self.pending.append((self.term_link(term), term))
+
+    def get_merged_terms(self):
+        # ancestors are not fetched
+        resolved = active_term_cache().get_many(
+            [link for link, term in self.pending if term is None or not term.get('is_ancestor', False)])
+        for link, term in self.pending:
+            if term is not None:
+                self._add_term_internal(link, term)
+                if term.get('is_ancestor', False):
+                    continue
+            self.merge_resolved(link, resolved.get(link))
+        self.pending = []
+        return super().get_merged_terms()
+
+    def merge_resolved(self, ref, term_array):
+        if term_array is None:
+            code, slug = term_key(ref)
+            raise ValidationError(f"Taxonomy term '{code}/{slug}' has not been found")
+        for term in term_array:
+            link = self.term_link(term)
+            # cached terms are shared, merge only copies of them
+            self._add_term_internal(link, copy.deepcopy(term) if link in self.taxonomy_terms else term)
+            self.validated_terms.add(link)
+
+
+class CachedTaxonomySchema(TaxonomySchema):
+    """TaxonomySchema resolving terms with CachedTaxonomyTermMerger."""
+
+    resolve_links = rebind_globals(TaxonomySchema.resolve_links, TaxonomyTermMerger=CachedTaxonomyTermMerger)
+
+
+TaxonomyField = rebind_globals(upstream_taxonomy_field, TaxonomySchema=CachedTaxonomySchema)
+"""oarepo_taxonomies TaxonomyField resolving the terms via the taxonomy term cache."""
@@ -3,6 +3,10 @@ from marshmallow import Schema, validate, fields, ValidationError
 from marshmallow_utils.fields import SanitizedUnicode
 from oarepo_multilingual.marshmallow import MultilingualStringV2
 
+from nr_datasets_metadata.marshmallow.subschemas.utils import find_duplicates
+
+MAIN_TITLE_MISSING = _("At least one title must have type mainTitle")
+
 
 class TitlesSchema(Schema):
     """Titles of the object/work."""
@@ -28,8 +32,7 @@ class TitlesSchema(Schema):
 
 
 def _no_duplicates(value_list):
-    str_list = [str(value) for value in value_list]
-    return len(value_list) == len(set(str_list))
+    return find_duplicates(value_list) is None
 
 
 class TitlesList(fields.List):
@@ -49,7 +52,7 @@ class TitlesList(fields.List):
 
         if not main_title:
             raise ValidationError({
-                "titleType": _("At least one title must have type mainTitle")
+                "titleType": MAIN_TITLE_MISSING
             })
 
         if not _no_duplicates(value):
@@ -1,15 +1,39 @@
-import json
-
 from marshmallow import ValidationError
 from flask_babelex import lazy_gettext as _
 
 
+def canonical_key(value):
+    """
+    Returns a hashable key of a JSON-like value. Two values have the same key if and only if
+    json.dumps(value, sort_keys=True) would give the same string, without serializing anything.
+    """
+    if isinstance(value, dict):
+        return frozenset([(k, v if type(v) is str else canonical_key(v)) for k, v in value.items()])
+    if isinstance(value, (list, tuple)):
+        return tuple([v if type(v) is str else canonical_key(v) for v in value])
+    if type(value) in (bool, float):
+        # True == 1 == 1.0 in python but not in json
+        return type(value), value
+    return value
+
+
+def find_duplicates(values):
+    """Returns indices (first, second) of the first pair of equal items in values or None."""
+    seen = {}
+    for idx, value in enumerate(values):
+        first = seen.setdefault(canonical_key(value), idx)
+        if first != idx:
+            return first, idx
+    return None
+
+
 def no_duplicates(value):
     if value is None:
         return value
-    v = [json.dumps(x, sort_keys=True) for x in value]
-    if len(set(v)) != len(value):
-        raise ValidationError(message=_('Duplicates not allowed'))
+    duplicates = find_duplicates(value)
+    if duplicates:
+        raise ValidationError(message=_('Duplicates not allowed, item %(second)s is the same as item %(first)s',
+                                        first=duplicates[0], second=duplicates[1]))
     return value
 
 
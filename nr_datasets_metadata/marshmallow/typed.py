@@ -0,0 +1,148 @@
+"""
+Compact typed representation of loaded dataset metadata.
+
+Titles, authorities, related items, identifiers and geo locations of a loaded record are converted
+to slotted dataclasses, the other values (multilingual strings, taxonomy terms, dates) stay as they are.
+Values with keys the dataclass does not know (for example organizations loaded as taxonomy terms)
+are left as dicts, so that to_dict(to_typed(data)) == data.
+"""
+import sys
+from dataclasses import dataclass
+
+
+class TypedMetadata:
+    """Base of the typed metadata dataclasses. Fields that are None are left out of to_dict."""
+    __slots__ = ()
+
+    INTERNED = ()
+    """Fields with values from a small set (schemes, types), their strings are interned."""
+
+    NESTED = {}
+    """Field name -> TypedMetadata class of the field value (or of the items of a list value)."""
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict) or not data.keys() <= cls.FIELDS:
+            return data
+        values = []
+        for name in cls.__slots__:
+            value = data.get(name)
+            if name in cls.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            elif name in cls.NESTED and value is not None:
+                value = from_dict(cls.NESTED[name], value)
+            values.append(value)
+        return cls(*values)
+
+    def to_dict(self):
+        ret = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                ret[name] = to_dict(value)
+        return ret
+
+
+def typed(cls):
+    cls = dataclass(cls)
+    cls.FIELDS = frozenset(cls.__slots__)
+    return cls
+
+
+@typed
+class Title(TypedMetadata):
+    __slots__ = ('title', 'titleType')
+    INTERNED = ('titleType',)
+
+    title: dict
+    titleType: str
+
+
+@typed
+class Identifier(TypedMetadata):
+    __slots__ = ('identifier', 'scheme', 'status')
+    INTERNED = ('scheme', 'status')
+
+    identifier: str
+    scheme: str
+    status: str
+
+
+@typed
+class Authority(TypedMetadata):
+    __slots__ = ('fullName', 'nameType', 'authorityIdentifiers', 'affiliation', 'role')
+    INTERNED = ('nameType',)
+    NESTED = {'authorityIdentifiers': Identifier}
+
+    fullName: str
+    nameType: str
+    authorityIdentifiers: list
+    affiliation: list
+    role: list
+
+
+@typed
+class RelatedItem(TypedMetadata):
+    __slots__ = ('itemTitle', 'itemCreators', 'itemContributors', 'itemPIDs', 'itemURL', 'itemYear',
+                 'itemVolume', 'itemIssue', 'itemStartPage', 'itemEndPage', 'itemPublisher',
+                 'itemRelationType', 'itemResourceType')
+    NESTED = {'itemCreators': Authority, 'itemContributors': Authority, 'itemPIDs': Identifier}
+
+    itemTitle: str
+    itemCreators: list
+    itemContributors: list
+    itemPIDs: list
+    itemURL: str
+    itemYear: str
+    itemVolume: str
+    itemIssue: str
+    itemStartPage: str
+    itemEndPage: str
+    itemPublisher: str
+    itemRelationType: list
+    itemResourceType: list
+
+
+@typed
+class GeoLocation(TypedMetadata):
+    __slots__ = ('geoLocationPlace', 'geoLocationPoint')
+
+    geoLocationPlace: str
+    geoLocationPoint: dict
+
+
+TYPED_FIELDS = {
+    'titles': Title,
+    'creators': Authority,
+    'contributors': Authority,
+    'relatedItems': RelatedItem,
+    'geoLocations': GeoLocation,
+    'persistentIdentifiers': Identifier,
+}
+"""Top-level metadata field -> TypedMetadata class of its items."""
+
+
+def from_dict(cls, value):
+    if isinstance(value, list):
+        return [cls.from_dict(x) for x in value]
+    return cls.from_dict(value)
+
+
+def to_typed(data):
+    """Converts loaded metadata (DataSetMetadataSchemaV3 output) to the typed representation, in place."""
+    for name, cls in TYPED_FIELDS.items():
+        value = data.get(name)
+        if value is not None:
+            data[name] = from_dict(cls, value)
+    return data
+
+
+def to_dict(value):
+    """Converts the typed representation (or any value containing it) back to plain dicts and lists."""
+    if isinstance(value, TypedMetadata):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_dict(x) for x in value]
+    if isinstance(value, dict):
+        return {k: to_dict(v) for k, v in value.items()}
+    return value
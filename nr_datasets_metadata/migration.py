@@ -0,0 +1,347 @@
+"""
+Streaming migration of stored metadata between schema versions.
+
+Transforms between two versions are declared as a list of Rename, Move, Delete, SplitDate and
+RekeyIdentifiers and compiled by compile_transforms into a single upgrade function, which is registered
+in the SchemaVersionRegistry. MigrationEngine then upgrades a stream of (position, record) pairs
+(see jsonl_records and stored_records), validates the results with the cached validators of the
+target version and checkpoints the position of the last processed record.
+"""
+import json
+import logging
+import os
+import time
+from collections import namedtuple
+
+from . import json_backend
+from .date_ranges import ARRAY_ITEMS
+from .schema_versions import dataset_schemas
+from .streaming import read_lines
+
+log = logging.getLogger(__name__)
+
+
+def parse_path(path):
+    """'relatedItems[].itemYear' -> ('relatedItems', '[]', 'itemYear')"""
+    ret = []
+    for name in path.split('.'):
+        if name.endswith(ARRAY_ITEMS):
+            ret.extend((name[:-len(ARRAY_ITEMS)], ARRAY_ITEMS))
+        else:
+            ret.append(name)
+    return tuple(ret)
+
+
+def containers(data, path):
+    """Yields all dicts reached from data by path, ARRAY_ITEMS steps into each item of a list."""
+    nodes = [data]
+    for name in path:
+        if name == ARRAY_ITEMS:
+            nodes = [item for node in nodes if isinstance(node, list) for item in node]
+        else:
+            nodes = [node[name] for node in nodes if isinstance(node, dict) and name in node]
+    return [node for node in nodes if isinstance(node, dict)]
+
+
+class Transform:
+    """A declarative metadata transform, compile() returns a function modifying metadata in place."""
+
+    def compile(self):
+        raise NotImplementedError()
+
+
+class Rename(Transform):
+    """Renames the field at path (for example 'relatedItems[].itemURL') to name."""
+
+    def __init__(self, path, name):
+        self.path = parse_path(path)
+        self.name = name
+
+    def compile(self):
+        parent, key, name = self.path[:-1], self.path[-1], self.name
+
+        def rename(data):
+            for node in containers(data, parent):
+                if key in node:
+                    node[name] = node.pop(key)
+
+        return rename
+
+
+class Move(Transform):
+    """Moves the value at source to target, both are paths of nested objects (without arrays)."""
+
+    def __init__(self, source, target):
+        self.source = parse_path(source)
+        self.target = parse_path(target)
+        if ARRAY_ITEMS in self.source or ARRAY_ITEMS in self.target:
+            raise ValueError('Move does not support array items, use Rename inside arrays')
+
+    def compile(self):
+        source_parent, source_key = self.source[:-1], self.source[-1]
+        target_parent, target_key = self.target[:-1], self.target[-1]
+
+        def move(data):
+            for node in containers(data, source_parent):
+                if source_key in node:
+                    value = node.pop(source_key)
+                    target = data
+                    for name in target_parent:
+                        target = target.setdefault(name, {})
+                    target[target_key] = value
+
+        return move
+
+
+class Delete(Transform):
+    """Removes the field at path."""
+
+    def __init__(self, path):
+        self.path = parse_path(path)
+
+    def compile(self):
+        parent, key = self.path[:-1], self.path[-1]
+
+        def delete(data):
+            for node in containers(data, parent):
+                node.pop(key, None)
+
+        return delete
+
+
+class SplitDate(Transform):
+    """
+    Replaces an EDTF date or interval at path with its start and end in the sibling fields start
+    and end. An open end ('..' or empty) is left out, a single date is both the start and the end.
+    """
+
+    def __init__(self, path, start, end):
+        self.path = parse_path(path)
+        self.start = start
+        self.end = end
+
+    def compile(self):
+        parent, key, start, end = self.path[:-1], self.path[-1], self.start, self.end
+
+        def split_date(data):
+            for node in containers(data, parent):
+                value = node.pop(key, None)
+                if not isinstance(value, str):
+                    continue
+                since, sep, until = value.partition('/')
+                if not sep:
+                    until = since
+                if since and since != '..':
+                    node[start] = since
+                if until and until != '..':
+                    node[end] = until
+
+        return split_date
+
+
+class RekeyIdentifiers(Transform):
+    """Renames identifier schemes (schemes maps old to new) of the identifier objects at path."""
+
+    def __init__(self, path, schemes, key='scheme'):
+        self.path = parse_path(path)
+        self.schemes = dict(schemes)
+        self.key = key
+
+    def compile(self):
+        path, schemes, key = self.path, self.schemes, self.key
+
+        def rekey_identifiers(data):
+            for node in containers(data, path + (ARRAY_ITEMS,)):
+                scheme = node.get(key)
+                if scheme in schemes:
+                    node[key] = schemes[scheme]
+
+        return rekey_identifiers
+
+
+def compile_transforms(transforms):
+    """Compiles transforms into a single upgrade function for SchemaVersionRegistry.register."""
+    steps = [transform.compile() for transform in transforms]
+
+    def upgrade(metadata):
+        for step in steps:
+            step(metadata)
+        return metadata
+
+    return upgrade
+
+
+def jsonl_records(stream):
+    """Yields (line number, record) of a JSON lines stream, records are parsed by the engine."""
+    yield from read_lines(stream)
+
+
+def stored_records(after=None, chunk_size=1000):
+    """
+    Yields (id, record json) of stored records ordered by id, chunk_size rows are read at once.
+    Iteration starts after the given id, so that a migration can be resumed from a checkpoint.
+    """
+    from invenio_records.models import RecordMetadata
+
+    query = RecordMetadata.query.filter(RecordMetadata.json.isnot(None)).order_by(RecordMetadata.id)
+    while True:
+        rows = (query.filter(RecordMetadata.id > after) if after else query).limit(chunk_size).all()
+        if not rows:
+            return
+        for row in rows:
+            yield str(row.id), row.json
+        after = rows[-1].id
+
+
+def save_records(results, record_class=None, commit_every=100):
+    """
+    Stores the migrated data of valid MigrationResults back to the database, yields the results.
+    Results are not read ahead, pass db.session.commit as on_checkpoint of the engine, so that
+    checkpointed records are always committed.
+    """
+    from invenio_db import db
+
+    if record_class is None:
+        from .record import DatasetBaseRecord as record_class
+    for count, result in enumerate(results, start=1):
+        if result.valid:
+            record = record_class.get_record(result.position)
+            record.clear()
+            record.update(result.data)
+            # already validated by the migration
+            record.commit(validate_marshmallow=False)
+        if count % commit_every == 0:
+            db.session.commit()
+        yield result
+    db.session.commit()
+
+
+MigrationResult = namedtuple('MigrationResult', ['position', 'data', 'valid', 'errors'])
+MigrationResult.__doc__ = """Migrated record: upgraded data, validation errors or the migration error if not valid."""
+
+
+class MigrationMetrics:
+    """Counts of migrated records and throughput, kept across resumed runs."""
+
+    FIELDS = ('read', 'migrated', 'invalid', 'failed', 'elapsed')
+
+    def __init__(self, read=0, migrated=0, invalid=0, failed=0, elapsed=0.0):
+        self.read = read
+        self.migrated = migrated
+        self.invalid = invalid
+        self.failed = failed
+        self.elapsed = elapsed
+        self._started = None
+
+    def start(self):
+        self._started = time.monotonic()
+
+    def stop(self):
+        if self._started is not None:
+            self.elapsed += time.monotonic() - self._started
+            self._started = None
+
+    @property
+    def records_per_second(self):
+        elapsed = self.elapsed + (time.monotonic() - self._started if self._started is not None else 0)
+        return self.read / elapsed if elapsed else 0.0
+
+    def as_dict(self):
+        ret = {name: getattr(self, name) for name in self.FIELDS}
+        ret['records_per_second'] = self.records_per_second
+        return ret
+
+
+class Checkpoint:
+    """Position of the last processed record and the metrics so far, stored in a JSON file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.position = None
+        self.metrics = MigrationMetrics()
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.position = data['position']
+            self.metrics = MigrationMetrics(**{k: data['metrics'][k] for k in MigrationMetrics.FIELDS})
+
+    def save(self, position, metrics):
+        self.position = position
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'position': position, 'metrics': metrics.as_dict()}, f)
+        # atomic, a crash leaves either the previous or the new checkpoint
+        os.replace(tmp, self.path)
+
+
+class MigrationEngine:
+    """
+    Upgrades records to the target schema version with the registry's upgrade functions and validates
+    them with its cached validators.
+
+    :param checkpoint:          Checkpoint to resume from and to save the progress to
+    :param checkpoint_every:    number of records between checkpoints
+    :param on_checkpoint:       called before a checkpoint is saved, for example to flush outputs
+    """
+
+    def __init__(self, registry=dataset_schemas, target=None, validate=True, checkpoint=None,
+                 checkpoint_every=1000, on_checkpoint=None):
+        self.registry = registry
+        self.target = registry.resolve(target)
+        self.validate = validate
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.on_checkpoint = on_checkpoint
+        self.metrics = checkpoint.metrics if checkpoint else MigrationMetrics()
+
+    def migrate_one(self, position, data):
+        """Upgrades and validates a record, data can be a JSON string."""
+        try:
+            if isinstance(data, str):
+                data = json_backend.loads(data)
+            if not isinstance(data, dict):
+                raise ValueError('Record must be a JSON object')
+            data = self.registry.upgrade(data, self.target)
+            if not self.validate:
+                return MigrationResult(position, data, True, None)
+            # data without $schema would be validated with the preferred version, not the target one
+            result = self.registry.validator(self.target).validate({k: v for k, v in data.items() if k != '$schema'})
+        except Exception as e:
+            log.debug('Migration of record %s failed', position, exc_info=True)
+            return MigrationResult(position, None, False, {'error': str(e)})
+        errors = {k: v for k, v in result.items() if k in ('jsonschemaErrors', 'marshmallowErrors')}
+        return MigrationResult(position, data, result['valid'], errors or None)
+
+    def migrate(self, records):
+        """
+        Yields a MigrationResult for each (position, record) of records, in their order. Positions must be
+        increasing, records up to the checkpointed position are skipped. A position is checkpointed only
+        after the consumer asked for the next result, that is after it processed the result of the position.
+        """
+        resume_after = self.checkpoint.position if self.checkpoint else None
+        self.metrics.start()
+        position = None
+        try:
+            for position, data in records:
+                if resume_after is not None and position <= resume_after:
+                    continue
+                result = self.migrate_one(position, data)
+                self.metrics.read += 1
+                if result.valid:
+                    self.metrics.migrated += 1
+                elif result.data is None:
+                    self.metrics.failed += 1
+                else:
+                    self.metrics.invalid += 1
+                yield result
+                if self.checkpoint and self.metrics.read % self.checkpoint_every == 0:
+                    self.save_checkpoint(position)
+            if self.checkpoint and position is not None and position != self.checkpoint.position:
+                self.save_checkpoint(position)
+        finally:
+            self.metrics.stop()
+
+    def save_checkpoint(self, position):
+        if self.on_checkpoint:
+            self.on_checkpoint()
+        self.checkpoint.save(position, self.metrics)
@@ -0,0 +1,107 @@
+"""
+Structural pre-check of dataset metadata, run before the full JSON schema and marshmallow validation.
+
+The checks are generated from the top-level ``required`` list of the JSON schema and from the marshmallow
+schema: fields with ``required=True``, TitlesList fields (at least one mainTitle) and lists of authorities
+(nameType must be "Personal" or "Organizational"). They need neither the taxonomies nor the JSON schema
+validator, so records with a missing title, abstract, subjectCategories, publisher or accessRights
+or with an unknown nameType are rejected cheaply. Rejected records get the same error messages
+the full validation reports for these problems, the full validation might find more errors.
+Records that pass the pre-check still have to be fully validated.
+"""
+from marshmallow import fields
+
+from .marshmallow.incremental import has_root_hooks
+from .marshmallow.subschemas.authority import AuthoritySchema, name_types_error
+from .marshmallow.subschemas.titles import MAIN_TITLE_MISSING, TitlesList, TitlesSchema
+
+JSONSCHEMA_REQUIRED_MESSAGE = '%r is a required property'
+"""Message of a missing required property, as reported by jsonschema."""
+
+
+def required_properties(schema):
+    """Properties required on the top level of a (resolved) JSON schema."""
+    names = list(schema.get('required', ()))
+    for part in schema.get('allOf', ()):
+        names.extend(name for name in required_properties(part) if name not in names)
+    return names
+
+
+def authority_name_types(value):
+    """nameTypes of an authority - a dict or a list (organization with its taxonomy ancestors)."""
+    items = value if isinstance(value, (list, tuple)) else [value]
+    return {item['nameType'] for item in items if isinstance(item, dict) and item.get('nameType')}
+
+
+def main_title_missing(titles):
+    """
+    True if TitlesList would report just the missing mainTitle - every item is a well-formed title,
+    otherwise the errors of the items are reported instead.
+    """
+    if not isinstance(titles, list):
+        return False
+    for item in titles:
+        if not isinstance(item, dict) or item.keys() != {'title', 'titleType'}:
+            return False
+        title = item['title']
+        if not isinstance(title, dict) or not title or not all(isinstance(v, str) for v in title.values()):
+            return False
+        if item['titleType'] not in TitlesSchema.NAMES or item['titleType'] == 'mainTitle':
+            return False
+    return True
+
+
+class StructuralPrecheck:
+    """
+    :param schema_class:    marshmallow schema class, DataSetMetadataSchemaV3 if not set
+    :param jsonschema:      resolved JSON schema of the DataSet (the schema of the JSON schema validator),
+                            JSON schema errors are not pre-checked if not set
+    """
+
+    def __init__(self, schema_class=None, jsonschema=None):
+        if schema_class is None:
+            from .marshmallow.subschemas.dataset import DataSetMetadataSchemaV3
+            schema_class = DataSetMetadataSchemaV3
+        self.jsonschema_required = required_properties(jsonschema) if jsonschema else []
+        self.required = []
+        self.titles = []
+        self.authorities = []
+        schema = schema_class()
+        if has_root_hooks(schema):
+            # hooks can change the data before the fields are loaded
+            return
+        for name, field in schema.load_fields.items():
+            key = field.data_key or name
+            if field.required:
+                self.required.append((key, field.error_messages['required']))
+            if isinstance(field, TitlesList):
+                self.titles.append(key)
+            elif (isinstance(field, fields.List) and isinstance(field.inner, fields.Nested)
+                  and isinstance(field.inner.schema, AuthoritySchema)):
+                self.authorities.append(key)
+
+    def check(self, data):
+        """Returns (JSON schema errors, marshmallow errors) found in data, both are empty if the pre-check passes."""
+        if not isinstance(data, dict):
+            return [], {}
+        jsonschema_errors = [
+            {'path': '', 'message': JSONSCHEMA_REQUIRED_MESSAGE % name}
+            for name in self.jsonschema_required if name not in data
+        ]
+        marshmallow_errors = {key: [message] for key, message in self.required if key not in data}
+        for key in self.titles:
+            if main_title_missing(data.get(key)):
+                marshmallow_errors[key] = {'titleType': MAIN_TITLE_MISSING}
+        for key in self.authorities:
+            value = data.get(key)
+            if not isinstance(value, list):
+                continue
+            errors = {}
+            for idx, item in enumerate(value):
+                if isinstance(item, (dict, list, tuple)):
+                    message = name_types_error(authority_name_types(item))
+                    if message:
+                        errors[idx] = message
+            if errors:
+                marshmallow_errors[key] = errors
+        return jsonschema_errors, marshmallow_errors
@@ -2,37 +2,96 @@ from invenio_records.api import Record
 from oarepo_validate import SchemaKeepingRecordMixin, MarshmallowValidatedRecordMixin
 
 from .constants import DATASETS_ALLOWED_SCHEMAS, DATASETS_PREFERRED_SCHEMA
+from .date_ranges import add_date_ranges
 from .marshmallow import DataSetMetadataSchemaV3
+from .marshmallow.incremental import changed_fields, incremental_schema
+from .schema_versions import dataset_schemas
 from oarepo_invenio_model import InheritedSchemaRecordMixin
 
 
-DATE_RANGE_FIELDS = ['dateCreated', 'dateCollected']
-
-
-# TODO: this needs to be made more generic before we can support more schemas
 def date_ranges_to_index(sender, json=None, record=None,
                          index=None, doc_type=None, arguments=None, **kwargs):
+    """Adds elasticsearch date ranges for all dateOrRange fields of the JSON schema."""
+    return add_date_ranges(json)
+
+
+class IncrementalValidationMixin:
+    """
+    After patch(), marshmallow validation (on commit) loads only the top-level fields changed
+    by the patch and keeps the already validated values of the other fields.
+    The patched record must have been validated before, as any committed record has.
+    """
+
+    CROSS_FIELD_DEPENDENCIES = {}
+    """Top-level field -> fields that have to be revalidated when the field changes."""
+
+    _previous_validated = None
+    _changed_fields = None
+
+    def patch(self, patch):
+        record = super().patch(patch)
+        record._previous_validated = dict(self)
+        record._changed_fields = changed_fields(patch)
+        return record
+
+    def marshmallow_schema_class(self, data):
+        """Marshmallow schema class the data is validated with."""
+        return type(self).MARSHMALLOW_SCHEMA
+
+    def validate_marshmallow(self, data=None, validate_kwargs=None):
+        schema_class = self.marshmallow_schema_class(self if data is None else data)
+        incremental = data is None and self._previous_validated is not None and self._changed_fields is not None
+        if incremental:
+            schema_class = incremental_schema(
+                schema_class, self._previous_validated, self._changed_fields, self.CROSS_FIELD_DEPENDENCIES)
+        if schema_class is type(self).MARSHMALLOW_SCHEMA:
+            return super().validate_marshmallow(data, validate_kwargs)
+        self.MARSHMALLOW_SCHEMA = schema_class
+        try:
+            return super().validate_marshmallow(data, validate_kwargs)
+        finally:
+            del self.MARSHMALLOW_SCHEMA
+            if incremental:
+                # the next validation (also the one after a failed validation) loads the whole record
+                self._previous_validated = self._changed_fields = None
+
+
+def declaring_class(cls, name):
+    """The class of cls.__mro__ that sets the attribute, None if none does."""
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return klass
+    return None
+
 
-    for dr in DATE_RANGE_FIELDS:
-        if dr in json:
-            dates = json[dr].split('/', 1)
-            if len(dates) == 1:
-                since = until = dates[0]
-            else:
-                since, until = dates
+class SchemaVersionMixin:
+    """
+    Validates the record with the marshmallow schema of its $schema version. Records with a $schema
+    not registered in SCHEMA_VERSIONS are validated with MARSHMALLOW_SCHEMA, as are all records
+    of subclasses that set their own MARSHMALLOW_SCHEMA (below the class that sets SCHEMA_VERSIONS).
+    """
 
-            json[f"{dr}Range"] = {
-                'gte': since,
-                'lte': until
-            }
+    SCHEMA_VERSIONS = dataset_schemas
 
-    return json
+    def marshmallow_schema_class(self, data):
+        cls = type(self)
+        schema_owner = declaring_class(cls, 'MARSHMALLOW_SCHEMA')
+        versions_owner = declaring_class(cls, 'SCHEMA_VERSIONS')
+        if schema_owner is not None and schema_owner is not versions_owner and issubclass(schema_owner, versions_owner):
+            return cls.MARSHMALLOW_SCHEMA
+        schema = data.get('$schema')
+        if schema in self.SCHEMA_VERSIONS:
+            return self.SCHEMA_VERSIONS.marshmallow_schema_class(schema)
+        return cls.MARSHMALLOW_SCHEMA
 
 
-class DatasetBaseRecord(SchemaKeepingRecordMixin,
+class DatasetBaseRecord(SchemaVersionMixin,
+                        IncrementalValidationMixin,
+                        SchemaKeepingRecordMixin,
                         MarshmallowValidatedRecordMixin,
                         InheritedSchemaRecordMixin,
                         Record):
     ALLOWED_SCHEMAS = DATASETS_ALLOWED_SCHEMAS
     PREFERRED_SCHEMA = DATASETS_PREFERRED_SCHEMA
     MARSHMALLOW_SCHEMA = DataSetMetadataSchemaV3
+    SCHEMA_VERSIONS = dataset_schemas
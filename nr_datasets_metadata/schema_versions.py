@@ -0,0 +1,195 @@
+import copy
+import importlib
+import threading
+
+from .constants import DATASETS_ALLOWED_SCHEMAS, DATASETS_PREFERRED_SCHEMA
+
+SCHEMAS_ENDPOINT = '/schemas/'
+"""Path part of $schema URLs after which the schema path follows (invenio-jsonschemas JSONSCHEMAS_ENDPOINT)."""
+
+
+class SchemaVersion:
+    """A registered metadata schema version, see SchemaVersionRegistry.register."""
+
+    def __init__(self, schema, marshmallow_schema, previous=None, upgrade=None, jsonschema_validator=None):
+        self.schema = schema
+        self.marshmallow_schema = marshmallow_schema
+        self.previous = previous
+        self.upgrade = upgrade
+        self.jsonschema_validator = jsonschema_validator
+
+    def marshmallow_schema_class(self):
+        if isinstance(self.marshmallow_schema, str):
+            module, name = self.marshmallow_schema.split(':')
+            self.marshmallow_schema = getattr(importlib.import_module(module), name)
+        return self.marshmallow_schema
+
+    def build_validator(self):
+        from .validators import DatasetValidator
+
+        return DatasetValidator(
+            self.schema, schema_class=self.marshmallow_schema_class(),
+            jsonschema_validator=self.jsonschema_validator() if self.jsonschema_validator else None)
+
+
+class SchemaVersionRegistry:
+    """
+    Metadata schema versions served at the same time, for example during a migration.
+
+    Maps $schema of a record (URL or schema path) to its version in O(1) and keeps a DatasetValidator
+    (JSON schema validator and marshmallow schema) for each version, built on the first use and then
+    shared by all records of the version. Versions are linked by upgrade functions into a chain.
+    """
+
+    def __init__(self, preferred=DATASETS_PREFERRED_SCHEMA):
+        self.preferred = preferred
+        self._versions = {}
+        self._aliases = {}
+        self._validators = {}
+        self._upgrades = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, schema, marshmallow_schema, previous=None, upgrade=None, jsonschema_validator=None):
+        """
+        :param schema:                  schema path, e.g. nr_datasets_metadata/nr-datasets-metadata-v3.0.0.json
+        :param marshmallow_schema:      marshmallow schema class or 'module:ClassName' imported on the first use
+        :param previous:                schema path of the version that upgrade converts from
+        :param upgrade:                 function converting metadata (without $schema) of the previous version
+                                        to this one, returns the converted metadata
+        :param jsonschema_validator:    factory of the JSON schema validator, dataset_jsonschema_validator(schema)
+                                        (needs an application context) if not set
+        """
+        if previous is not None and previous not in self._versions:
+            raise KeyError(f'Unknown metadata schema {previous}')
+        if (previous is None) != (upgrade is None):
+            raise ValueError('Both previous and upgrade must be set')
+        with self._lock:
+            self._versions[schema] = SchemaVersion(schema, marshmallow_schema, previous, upgrade,
+                                                   jsonschema_validator)
+            self._aliases[schema] = schema
+            self._validators.pop(schema, None)
+            self._upgrades.clear()
+
+    @property
+    def schemas(self):
+        return list(self._versions)
+
+    def __contains__(self, schema):
+        """True if $schema (URL or path, None stands for the preferred schema) is a registered version."""
+        try:
+            return self.resolve(schema) in self._versions
+        except KeyError:
+            return False
+
+    def resolve(self, schema):
+        """Returns the registered schema path of a $schema URL or path, None stands for the preferred schema."""
+        if schema is None:
+            return self.preferred
+        path = self._aliases.get(schema)
+        if path is not None:
+            return path
+        path = schema.rpartition(SCHEMAS_ENDPOINT)[2]
+        if path not in self._versions:
+            raise KeyError(f'Unknown metadata schema {schema}')
+        self._aliases[schema] = path
+        return path
+
+    def marshmallow_schema_class(self, schema=None):
+        return self._versions[self.resolve(schema)].marshmallow_schema_class()
+
+    def validator(self, schema=None):
+        """DatasetValidator of the schema version."""
+        path = self.resolve(schema)
+        with self._lock:
+            validator = self._validators.get(path)
+            if validator is not None:
+                self.hits += 1
+                return validator
+            self.misses += 1
+            validator = self._validators[path] = self._versions[path].build_validator()
+            return validator
+
+    def upgrade_chain(self, source, target=None):
+        """Versions whose upgrade functions convert metadata of the source version to the target one."""
+        source, target = self.resolve(source), self.resolve(target)
+        chain = []
+        version = self._versions[target]
+        while version.schema != source:
+            if version.previous is None:
+                raise ValueError(f'Can not upgrade metadata schema {source} to {target}')
+            chain.append(version)
+            version = self._versions[version.previous]
+        chain.reverse()
+        return chain
+
+    def upgrade_function(self, source, target=None):
+        """
+        Single function converting metadata (without $schema) of the source version to the target one,
+        composed from the upgrade chain once per version pair.
+        """
+        key = (self.resolve(source), self.resolve(target))
+        function = self._upgrades.get(key)
+        if function is None:
+            upgrades = [version.upgrade for version in self.upgrade_chain(*key)]
+
+            def function(metadata):
+                for upgrade in upgrades:
+                    metadata = upgrade(metadata)
+                return metadata
+
+            function.target = key[1]
+            self._upgrades[key] = function
+        return function
+
+    def upgrade(self, data, target=None):
+        """
+        Converts data of its $schema version (the preferred one if data has no $schema) to the target version,
+        the preferred one by default. Returns the converted data, its $schema (if set) points to the target.
+        The upgrade functions work on a deep copy, data is never modified.
+        """
+        source = data.get('$schema')
+        function = self.upgrade_function(source, target)
+        if function.target == self.resolve(source):
+            return data
+        metadata = function(copy.deepcopy({k: v for k, v in data.items() if k != '$schema'}))
+        if source is not None:
+            # keep the form of the original $schema, URL or path
+            metadata['$schema'] = source[:len(source) - len(self.resolve(source))] + function.target
+        return metadata
+
+    def validate(self, data, include_data=False, upgrade=False):
+        """
+        Validates data with the validators of its $schema version, or of the preferred version
+        after upgrading it if upgrade is set. The result of DatasetValidator.validate has the schema path
+        the data was validated with in 'schema'.
+        """
+        if upgrade:
+            data = self.upgrade(data)
+        schema = data.get('$schema')
+        if schema is not None:
+            data = {k: v for k, v in data.items() if k != '$schema'}
+        return {'schema': self.resolve(schema), **self.validator(schema).validate(data, include_data=include_data)}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._validators)
+            }
+
+    def clear(self):
+        """Drops the built validators, registered versions are kept."""
+        with self._lock:
+            self._validators.clear()
+            self._upgrades.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+dataset_schemas = SchemaVersionRegistry()
+
+for _schema in DATASETS_ALLOWED_SCHEMAS:
+    dataset_schemas.register(_schema, 'nr_datasets_metadata.marshmallow:DataSetMetadataSchemaV3')
@@ -0,0 +1 @@
+"""Serializers of dataset metadata to export formats."""
@@ -0,0 +1,208 @@
+"""
+Content-addressed disk cache of serialized records (renditions) for OAI-PMH and exports.
+
+A rendition is stored under the hash of the record revision (key-sorted JSON of the metadata and
+RENDITIONS_VERSION), so a changed record never gets a stale rendition and records with the same
+metadata share it. When the caller passes the record id, the renditions of the previous revision
+of the record are removed as soon as a new revision is rendered. The total size of the cache is
+bounded, the least recently used renditions are evicted first.
+
+XML renditions are bare record elements without the XML declaration, so that they can be embedded
+as they are in OAI-PMH <metadata> elements.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+from urllib.parse import quote
+
+from .. import json_backend
+from ..constants import RENDITION_CACHE_SIZE
+from .datacite import serialize_json, serialize_xml
+from .dc import serialize_dc
+from .marcxml import serialize_marcxml
+
+RENDITIONS_VERSION = '2'
+"""Part of the revision hash, change it when a serializer changes to invalidate all cached renditions."""
+
+RENDITION_FORMATS = {
+    'oai_dc': partial(serialize_dc, xml_declaration=False),
+    'marcxml': partial(serialize_marcxml, xml_declaration=False),
+    'datacite': partial(serialize_xml, xml_declaration=False),
+    'datacite_json': serialize_json,
+}
+"""Format name -> function serializing record metadata to bytes."""
+
+RECORDS_DIRECTORY = 'records'
+
+
+def revision_hash(metadata):
+    """
+    Hex sha256 of the record revision, equal for equal metadata regardless of the key order.
+    Processes sharing a cache directory should use the same JSON backend, floats are formatted
+    differently by orjson and the stdlib.
+    """
+    digest = hashlib.sha256(RENDITIONS_VERSION.encode('ascii'))
+    digest.update(json_backend.stable_dumps(metadata))
+    return digest.hexdigest()
+
+
+class RenditionCache:
+    """
+    Renditions are files <directory>/<format>/<hash[:2]>/<hash>, their modification time is the time
+    of the last use. The least recently used renditions are removed when the total size exceeds max_size.
+    Several processes can share the directory, each of them keeps its own (approximate) size accounting.
+    """
+
+    def __init__(self, directory, max_size=RENDITION_CACHE_SIZE, formats=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.formats = RENDITION_FORMATS if formats is None else formats
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scan()
+
+    def _scan(self):
+        found = []
+        for format in self.formats:
+            top = os.path.join(self.directory, format)
+            if not os.path.isdir(top):
+                continue
+            for prefix in os.scandir(top):
+                if prefix.is_dir():
+                    for entry in os.scandir(prefix.path):
+                        if entry.is_file() and not entry.name.endswith('.tmp'):
+                            stat = entry.stat()
+                            found.append((stat.st_mtime, entry.path, stat.st_size))
+        found.sort()
+        for _, path, size in found:
+            self._entries[path] = size
+            self.size += size
+
+    def path(self, format, digest):
+        return os.path.join(self.directory, format, digest[:2], digest)
+
+    def _record_path(self, record_id):
+        return os.path.join(self.directory, RECORDS_DIRECTORY, quote(str(record_id), safe=''))
+
+    def get(self, metadata, format, record_id=None):
+        """Rendition of the record in the format, rendered and stored if it is not cached."""
+        serialize = self.formats[format]
+        digest = revision_hash(metadata)
+        if record_id is not None:
+            self._track(record_id, digest)
+        path = self.path(format, digest)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = serialize(metadata)
+            self._store(path, data)
+            with self._lock:
+                self.misses += 1
+            return data
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            pass
+        with self._lock:
+            self.hits += 1
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        return data
+
+    def render_many(self, records, format):
+        """Yields renditions of (record id, metadata) pairs one by one, for example for ListRecords."""
+        for record_id, metadata in records:
+            yield self.get(metadata, format, record_id=record_id)
+
+    def _track(self, record_id, digest):
+        path = self._record_path(record_id)
+        try:
+            with open(path) as f:
+                previous = f.read()
+        except FileNotFoundError:
+            previous = None
+        if previous == digest:
+            return
+        if previous:
+            self._remove_revision(previous)
+        self._write(path, digest.encode('ascii'))
+
+    def invalidate(self, record_id):
+        """Removes the renditions of the last rendered revision of the record, for example when it is deleted."""
+        path = self._record_path(record_id)
+        try:
+            with open(path) as f:
+                self._remove_revision(f.read())
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _remove_revision(self, digest):
+        for format in self.formats:
+            self._remove(self.path(format, digest))
+
+    def _remove(self, path):
+        with self._lock:
+            size = self._entries.pop(path, None)
+            if size is not None:
+                self.size -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        # readers see either no file or the complete rendition
+        os.replace(tmp, path)
+
+    def _store(self, path, data):
+        self._write(path, data)
+        evicted = []
+        with self._lock:
+            self.size += len(data) - self._entries.pop(path, 0)
+            self._entries[path] = len(data)
+            while self.size > self.max_size and len(self._entries) > 1:
+                old_path, size = self._entries.popitem(last=False)
+                self.size -= size
+                self.evictions += 1
+                evicted.append(old_path)
+        for old_path in evicted:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self.size,
+                'max_size': self.max_size
+            }
+
+    def clear(self):
+        """Removes all cached renditions."""
+        with self._lock:
+            paths = list(self._entries)
+            self._entries.clear()
+            self.size = 0
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,370 @@
+"""
+DataCite 4.x serializer of dataset metadata (DataSetMetadataSchemaV3 output or stored records).
+
+datacite_json maps the metadata to DataCite JSON (the attributes of the DataCite REST API),
+datacite_xml builds the DataCite XML resource element from it, so both formats always agree.
+Batches are streamed one record at a time into a single document (write_xml, write_json)
+or into a file per record (write_files).
+"""
+import os
+
+from .. import json_backend
+from ..marshmallow.constants import RDM_RECORDS_IDENTIFIERS_SCHEMES
+from ..streaming import write_jsonl
+from .xml import XML_LANG, XSI_NAMESPACE, XSI_SCHEMA_LOCATION, root_element, sub_element, tostring, xml_writer
+
+NAMESPACE = 'http://datacite.org/schema/kernel-4'
+SCHEMA_VERSION = NAMESPACE
+SCHEMA_LOCATION = f'{NAMESPACE} http://schema.datacite.org/meta/kernel-4.4/metadata.xsd'
+NSMAP = {None: NAMESPACE, 'xsi': XSI_NAMESPACE}
+
+PREFERRED_LANGUAGES = ('en', 'cs')
+"""Languages of multilingual values tried in order where DataCite allows a single value only."""
+
+TITLE_TYPES = {
+    'alternativeTitle': 'AlternativeTitle',
+    'subtitle': 'Subtitle',
+    'other': 'Other',
+}
+
+DATE_TYPES = {
+    'dateAvailable': 'Available',
+    'dateCreated': 'Created',
+    'dateCollected': 'Collected',
+    'dateModified': 'Updated',
+    'dateValidTo': 'Valid',
+}
+
+DESCRIPTION_TYPES = {
+    'abstract': 'Abstract',
+    'methods': 'Methods',
+    'technicalInfo': 'TechnicalInfo',
+}
+
+NAME_IDENTIFIER_SCHEMES = {
+    'orcid': ('ORCID', 'https://orcid.org'),
+    'scopusID': ('Scopus', 'https://www.scopus.com'),
+    'researcherID': ('ResearcherID', 'https://www.researcherid.com'),
+    'ISNI': ('ISNI', 'http://isni.org/isni/'),
+    'ROR': ('ROR', 'https://ror.org'),
+}
+"""Authority identifier scheme -> DataCite nameIdentifierScheme and schemeURI, others are passed as they are."""
+
+RESOURCE_TYPE_GENERAL = 'Dataset'
+DEFAULT_RELATION_TYPE = 'References'
+DEFAULT_CONTRIBUTOR_TYPE = 'Other'
+
+
+def _(tag):
+    return f'{{{NAMESPACE}}}{tag}'
+
+
+def terms(value):
+    """Taxonomy terms of a taxonomy field value without their ancestors."""
+    if isinstance(value, dict):
+        value = [value]
+    return [term for term in value or () if not term.get('is_ancestor')]
+
+
+def localized(value):
+    """(language, text) pairs of a multilingual string."""
+    if isinstance(value, str):
+        return [(None, value)]
+    return list((value or {}).items())
+
+
+def preferred(value):
+    """Text of a multilingual string in the first available preferred language."""
+    if not isinstance(value, dict):
+        return value
+    for lang in PREFERRED_LANGUAGES:
+        if value.get(lang):
+            return value[lang]
+    return next(iter(value.values()), None)
+
+
+def term_title(value):
+    """Title of the (first) term of a single-valued taxonomy field."""
+    found = terms(value)
+    return preferred(found[0].get('title')) if found else None
+
+
+def term_slug(term):
+    """Last path segment of the term's self link, the code of the term in its taxonomy."""
+    link = (term.get('links') or {}).get('self', '')
+    return link.rstrip('/').rpartition('/')[2] or None
+
+
+def identifier_type(scheme):
+    scheme_def = RDM_RECORDS_IDENTIFIERS_SCHEMES.get(scheme)
+    return scheme_def['datacite'] if scheme_def else scheme
+
+
+def _name(authority, contributor=False):
+    if isinstance(authority, list):
+        # an organization is stored as a taxonomy term with its ancestors
+        found = terms(authority)
+        term = found[0] if found else {}
+        ret = {'name': preferred(term.get('title')), 'nameType': 'Organizational'}
+        identifiers = [{'nameIdentifier': term['ico'], 'nameIdentifierScheme': 'ICO'}] if term.get('ico') else []
+        role = []
+    else:
+        ret = {'name': authority.get('fullName'), 'nameType': authority.get('nameType')}
+        identifiers = []
+        for identifier in authority.get('authorityIdentifiers') or ():
+            scheme, scheme_uri = NAME_IDENTIFIER_SCHEMES.get(identifier.get('scheme'), (identifier.get('scheme'), None))
+            identifiers.append({'nameIdentifier': identifier.get('identifier'), 'nameIdentifierScheme': scheme,
+                                **({'schemeUri': scheme_uri} if scheme_uri else {})})
+        affiliations = [preferred(term.get('title')) for term in terms(authority.get('affiliation'))]
+        if affiliations:
+            ret['affiliation'] = [{'name': name} for name in affiliations]
+        role = terms(authority.get('role'))
+    if identifiers:
+        ret['nameIdentifiers'] = identifiers
+    if contributor:
+        ret['contributorType'] = (role[0].get('dataCiteCode') if role else None) or DEFAULT_CONTRIBUTOR_TYPE
+    return ret
+
+
+def _publication_year(metadata):
+    for name in ('dateAvailable', 'dateCreated', 'dateCollected'):
+        value = metadata.get(name)
+        if value and value[:4].isdigit():
+            return value[:4]
+    return None
+
+
+def _related_identifiers(item):
+    relation = terms(item.get('itemRelationType'))
+    relation_type = (relation[0].get('dataCiteCode') if relation else None) or DEFAULT_RELATION_TYPE
+    ret = [
+        {'relatedIdentifier': pid.get('identifier'), 'relatedIdentifierType': identifier_type(pid.get('scheme')),
+         'relationType': relation_type}
+        for pid in item.get('itemPIDs') or ()
+    ]
+    if not ret and item.get('itemURL'):
+        ret.append({'relatedIdentifier': item['itemURL'], 'relatedIdentifierType': 'URL',
+                    'relationType': relation_type})
+    return ret
+
+
+def datacite_json(metadata):
+    """DataCite JSON of dataset metadata, fields without a value are left out."""
+    ret = {}
+    identifiers = metadata.get('persistentIdentifiers') or ()
+    doi = next((pid['identifier'] for pid in identifiers if pid.get('scheme') == 'doi'), None)
+    if doi:
+        ret['doi'] = doi
+    ret['identifiers'] = [
+        {'identifier': pid.get('identifier'), 'identifierType': identifier_type(pid.get('scheme'))}
+        for pid in identifiers if pid.get('identifier') != doi
+    ]
+    ret['creators'] = [_name(creator) for creator in metadata.get('creators') or ()]
+    ret['titles'] = [
+        {'title': text, **({'lang': lang} if lang else {}),
+         **({'titleType': TITLE_TYPES[title['titleType']]} if title.get('titleType') in TITLE_TYPES else {})}
+        for title in metadata.get('titles') or () for lang, text in localized(title.get('title'))
+    ]
+    ret['publisher'] = term_title(metadata.get('publisher'))
+    ret['publicationYear'] = _publication_year(metadata)
+    ret['types'] = {'resourceTypeGeneral': RESOURCE_TYPE_GENERAL}
+    resource_type = term_title(metadata.get('resourceType'))
+    if resource_type:
+        ret['types']['resourceType'] = resource_type
+    ret['subjects'] = [
+        {'subject': text, **({'lang': lang} if lang else {})}
+        for keyword in metadata.get('keywords') or () for lang, text in localized(keyword)
+    ] + [
+        {'subject': preferred(term.get('title')), **({'valueUri': term['links']['self']} if term.get('links') else {})}
+        for term in terms(metadata.get('subjectCategories'))
+    ]
+    ret['contributors'] = [_name(contributor, contributor=True) for contributor in metadata.get('contributors') or ()]
+    ret['dates'] = [
+        {'date': metadata[name], 'dateType': date_type} for name, date_type in DATE_TYPES.items() if metadata.get(name)
+    ]
+    withdrawn = metadata.get('dateWithdrawn')
+    if withdrawn and withdrawn.get('date'):
+        ret['dates'].append({'date': withdrawn['date'], 'dateType': 'Withdrawn',
+                             **({'dateInformation': withdrawn['dateInformation']}
+                                if withdrawn.get('dateInformation') else {})})
+    languages = [term_slug(term) for term in terms(metadata.get('language'))]
+    if languages and languages[0]:
+        ret['language'] = languages[0]
+    ret['relatedIdentifiers'] = [
+        identifier for item in metadata.get('relatedItems') or () for identifier in _related_identifiers(item)
+    ]
+    ret['rightsList'] = [
+        {'rights': preferred(term.get('title')), **({'rightsUri': term['links']['self']} if term.get('links') else {})}
+        for term in terms(metadata.get('rights'))
+    ] + [
+        {'rights': preferred(term.get('title')),
+         **({'rightsUri': term['relatedURI']['coar']} if (term.get('relatedURI') or {}).get('coar') else {})}
+        for term in terms(metadata.get('accessRights'))
+    ]
+    ret['descriptions'] = [
+        {'description': text, 'descriptionType': description_type, **({'lang': lang} if lang else {})}
+        for name, description_type in DESCRIPTION_TYPES.items() for lang, text in localized(metadata.get(name))
+    ] + [{'description': note, 'descriptionType': 'Other'} for note in metadata.get('notes') or ()]
+    ret['geoLocations'] = [
+        {'geoLocationPlace': location.get('geoLocationPlace'),
+         **({'geoLocationPoint': location['geoLocationPoint']} if location.get('geoLocationPoint') else {})}
+        for location in metadata.get('geoLocations') or ()
+    ]
+    ret['fundingReferences'] = [_funding_reference(reference) for reference in metadata.get('fundingReferences') or ()]
+    if metadata.get('version'):
+        ret['version'] = metadata['version']
+    ret['schemaVersion'] = SCHEMA_VERSION
+    return {k: v for k, v in ret.items() if v not in (None, [], {})}
+
+
+def _funding_reference(reference):
+    funder = terms(reference.get('funder'))
+    funder = funder[0] if funder else {}
+    ret = {'funderName': preferred(funder.get('title'))}
+    if funder.get('funderISVaVaICode'):
+        ret['funderIdentifier'] = funder['funderISVaVaICode']
+        ret['funderIdentifierType'] = 'Other'
+    if reference.get('projectID'):
+        ret['awardNumber'] = reference['projectID']
+    if reference.get('projectName'):
+        ret['awardTitle'] = reference['projectName']
+    return ret
+
+
+def _name_element(parent, tag, name):
+    element = sub_element(parent, _(tag))
+    sub_element(element, _(f'{tag}Name'), name.get('name'), {'nameType': name.get('nameType')})
+    for identifier in name.get('nameIdentifiers', ()):
+        sub_element(element, _('nameIdentifier'), identifier['nameIdentifier'],
+                    {'nameIdentifierScheme': identifier['nameIdentifierScheme'], 'schemeURI': identifier.get('schemeUri')})
+    for affiliation in name.get('affiliation', ()):
+        sub_element(element, _('affiliation'), affiliation['name'])
+    return element
+
+
+def datacite_xml(data):
+    """DataCite XML resource element of DataCite JSON (datacite_json output)."""
+    resource = root_element(_('resource'), NSMAP, {XSI_SCHEMA_LOCATION: SCHEMA_LOCATION})
+    sub_element(resource, _('identifier'), data.get('doi'), {'identifierType': 'DOI'})
+
+    parent = sub_element(resource, _('creators'))
+    for creator in data.get('creators', ()):
+        _name_element(parent, 'creator', creator)
+
+    parent = sub_element(resource, _('titles'))
+    for title in data.get('titles', ()):
+        sub_element(parent, _('title'), title['title'], {XML_LANG: title.get('lang'), 'titleType': title.get('titleType')})
+
+    sub_element(resource, _('publisher'), data.get('publisher'))
+    sub_element(resource, _('publicationYear'), data.get('publicationYear'))
+    sub_element(resource, _('resourceType'), data['types'].get('resourceType'),
+                {'resourceTypeGeneral': data['types']['resourceTypeGeneral']})
+
+    if data.get('subjects'):
+        parent = sub_element(resource, _('subjects'))
+        for subject in data['subjects']:
+            sub_element(parent, _('subject'), subject['subject'],
+                        {XML_LANG: subject.get('lang'), 'valueURI': subject.get('valueUri')})
+
+    if data.get('contributors'):
+        parent = sub_element(resource, _('contributors'))
+        for contributor in data['contributors']:
+            _name_element(parent, 'contributor', contributor).set('contributorType', contributor['contributorType'])
+
+    if data.get('dates'):
+        parent = sub_element(resource, _('dates'))
+        for date in data['dates']:
+            sub_element(parent, _('date'), date['date'],
+                        {'dateType': date['dateType'], 'dateInformation': date.get('dateInformation')})
+
+    if data.get('language'):
+        sub_element(resource, _('language'), data['language'])
+
+    if data.get('identifiers'):
+        parent = sub_element(resource, _('alternateIdentifiers'))
+        for identifier in data['identifiers']:
+            sub_element(parent, _('alternateIdentifier'), identifier['identifier'],
+                        {'alternateIdentifierType': identifier['identifierType']})
+
+    if data.get('relatedIdentifiers'):
+        parent = sub_element(resource, _('relatedIdentifiers'))
+        for identifier in data['relatedIdentifiers']:
+            sub_element(parent, _('relatedIdentifier'), identifier['relatedIdentifier'],
+                        {'relatedIdentifierType': identifier['relatedIdentifierType'],
+                         'relationType': identifier['relationType']})
+
+    if data.get('version'):
+        sub_element(resource, _('version'), data['version'])
+
+    if data.get('rightsList'):
+        parent = sub_element(resource, _('rightsList'))
+        for rights in data['rightsList']:
+            sub_element(parent, _('rights'), rights['rights'], {'rightsURI': rights.get('rightsUri')})
+
+    if data.get('descriptions'):
+        parent = sub_element(resource, _('descriptions'))
+        for description in data['descriptions']:
+            sub_element(parent, _('description'), description['description'],
+                        {XML_LANG: description.get('lang'), 'descriptionType': description['descriptionType']})
+
+    if data.get('geoLocations'):
+        parent = sub_element(resource, _('geoLocations'))
+        for location in data['geoLocations']:
+            element = sub_element(parent, _('geoLocation'))
+            sub_element(element, _('geoLocationPlace'), location.get('geoLocationPlace'))
+            point = location.get('geoLocationPoint')
+            if point:
+                element = sub_element(element, _('geoLocationPoint'))
+                sub_element(element, _('pointLongitude'), point.get('pointLongitude'))
+                sub_element(element, _('pointLatitude'), point.get('pointLatitude'))
+
+    if data.get('fundingReferences'):
+        parent = sub_element(resource, _('fundingReferences'))
+        for reference in data['fundingReferences']:
+            element = sub_element(parent, _('fundingReference'))
+            sub_element(element, _('funderName'), reference.get('funderName'))
+            if reference.get('funderIdentifier'):
+                sub_element(element, _('funderIdentifier'), reference['funderIdentifier'],
+                            {'funderIdentifierType': reference['funderIdentifierType']})
+            if reference.get('awardNumber'):
+                sub_element(element, _('awardNumber'), reference['awardNumber'])
+            if reference.get('awardTitle'):
+                sub_element(element, _('awardTitle'), reference['awardTitle'])
+    return resource
+
+
+def serialize_json(metadata):
+    """DataCite JSON document of a record, UTF-8 encoded."""
+    return json_backend.dumps(datacite_json(metadata))
+
+
+def serialize_xml(metadata, xml_declaration=True):
+    """DataCite XML document of a record, UTF-8 encoded, the bare resource element without xml_declaration."""
+    return tostring(datacite_xml(datacite_json(metadata)), NSMAP, xml_declaration)
+
+
+def write_xml(stream, records):
+    """Writes DataCite XML resources of records into a single <resources> document, stream is binary."""
+    with xml_writer(stream, 'resources', NSMAP) as write:
+        for metadata in records:
+            write(datacite_xml(datacite_json(metadata)))
+
+
+def write_json(stream, records):
+    """Writes DataCite JSON of records as JSON lines into a text stream."""
+    write_jsonl(stream, (datacite_json(metadata) for metadata in records))
+
+
+SERIALIZERS = {
+    'xml': serialize_xml,
+    'json': serialize_json,
+}
+
+
+def write_files(directory, records, format='xml'):
+    """Writes a DataCite document of each (name, metadata) of records into directory/<name>.<format>."""
+    serialize = SERIALIZERS[format]
+    os.makedirs(directory, exist_ok=True)
+    for name, metadata in records:
+        with open(os.path.join(directory, f'{name}.{format}'), 'wb') as f:
+            f.write(serialize(metadata))
@@ -0,0 +1,84 @@
+"""
+OAI-PMH oai_dc (simple Dublin Core) serializer of dataset metadata.
+
+The record is mapped to DataCite JSON first (serializers.datacite.datacite_json) and crosswalked
+to Dublin Core from it, following the DataCite to oai_dc mapping of the DataCite OAI provider.
+"""
+from .datacite import datacite_json
+from .xml import XML_LANG, XSI_NAMESPACE, XSI_SCHEMA_LOCATION, root_element, sub_element, tostring, xml_writer
+
+OAI_DC_NAMESPACE = 'http://www.openarchives.org/OAI/2.0/oai_dc/'
+DC_NAMESPACE = 'http://purl.org/dc/elements/1.1/'
+SCHEMA_LOCATION = f'{OAI_DC_NAMESPACE} http://www.openarchives.org/OAI/2.0/oai_dc.xsd'
+NSMAP = {'oai_dc': OAI_DC_NAMESPACE, 'dc': DC_NAMESPACE, 'xsi': XSI_NAMESPACE}
+
+DC = {name: f'{{{DC_NAMESPACE}}}{name}' for name in (
+    'title', 'creator', 'subject', 'description', 'publisher', 'contributor', 'date', 'type', 'format',
+    'identifier', 'source', 'language', 'relation', 'coverage', 'rights')}
+
+IDENTIFIER_PREFIXES = {
+    'DOI': 'info:doi/',
+    'Handle': 'info:hdl/',
+}
+
+
+def identifier_uri(identifier, identifier_type):
+    if '://' in identifier:
+        return identifier
+    return IDENTIFIER_PREFIXES.get(identifier_type, '') + identifier
+
+
+def dc_xml(data):
+    """oai_dc element of DataCite JSON (datacite_json output)."""
+    root = root_element(f'{{{OAI_DC_NAMESPACE}}}dc', NSMAP, {XSI_SCHEMA_LOCATION: SCHEMA_LOCATION})
+    for title in data.get('titles', ()):
+        sub_element(root, DC['title'], title['title'], {XML_LANG: title.get('lang')})
+    for creator in data.get('creators', ()):
+        sub_element(root, DC['creator'], creator.get('name'))
+    for subject in data.get('subjects', ()):
+        sub_element(root, DC['subject'], subject['subject'], {XML_LANG: subject.get('lang')})
+    for description in data.get('descriptions', ()):
+        sub_element(root, DC['description'], description['description'], {XML_LANG: description.get('lang')})
+    if data.get('publisher'):
+        sub_element(root, DC['publisher'], data['publisher'])
+    for contributor in data.get('contributors', ()):
+        sub_element(root, DC['contributor'], contributor.get('name'))
+    dates = [data['publicationYear']] if data.get('publicationYear') else []
+    for date in data.get('dates', ()):
+        if date['date'] not in dates:
+            dates.append(date['date'])
+    for date in dates:
+        sub_element(root, DC['date'], date)
+    types = data['types']
+    sub_element(root, DC['type'], types['resourceTypeGeneral'])
+    if types.get('resourceType'):
+        sub_element(root, DC['type'], types['resourceType'])
+    if data.get('doi'):
+        sub_element(root, DC['identifier'], identifier_uri(data['doi'], 'DOI'))
+    for identifier in data.get('identifiers', ()):
+        sub_element(root, DC['identifier'], identifier_uri(identifier['identifier'], identifier['identifierType']))
+    if data.get('language'):
+        sub_element(root, DC['language'], data['language'])
+    for identifier in data.get('relatedIdentifiers', ()):
+        sub_element(root, DC['relation'],
+                    identifier_uri(identifier['relatedIdentifier'], identifier['relatedIdentifierType']))
+    for location in data.get('geoLocations', ()):
+        if location.get('geoLocationPlace'):
+            sub_element(root, DC['coverage'], location['geoLocationPlace'])
+    for rights in data.get('rightsList', ()):
+        sub_element(root, DC['rights'], rights['rights'])
+        if rights.get('rightsUri'):
+            sub_element(root, DC['rights'], rights['rightsUri'])
+    return root
+
+
+def serialize_dc(metadata, xml_declaration=True):
+    """oai_dc document of a record, UTF-8 encoded, the bare oai_dc element without xml_declaration."""
+    return tostring(dc_xml(datacite_json(metadata)), NSMAP, xml_declaration)
+
+
+def write_dc(stream, records, root='records'):
+    """Writes oai_dc elements of records into a single document, stream is binary."""
+    with xml_writer(stream, root, NSMAP) as write:
+        for metadata in records:
+            write(dc_xml(datacite_json(metadata)))
@@ -0,0 +1,126 @@
+"""
+MARCXML (MARC 21 bibliographic) serializer of dataset metadata.
+
+Like oai_dc, the record is crosswalked from its DataCite JSON (serializers.datacite.datacite_json).
+"""
+from .datacite import datacite_json
+from .xml import XSI_NAMESPACE, XSI_SCHEMA_LOCATION, root_element, sub_element, tostring, xml_writer
+
+NAMESPACE = 'http://www.loc.gov/MARC21/slim'
+SCHEMA_LOCATION = f'{NAMESPACE} http://www.loc.gov/standards/marcxml/schema/MARC21slim.xsd'
+NSMAP = {None: NAMESPACE, 'xsi': XSI_NAMESPACE}
+
+COLLECTION = f'{{{NAMESPACE}}}collection'
+RECORD = f'{{{NAMESPACE}}}record'
+LEADER = f'{{{NAMESPACE}}}leader'
+DATAFIELD = f'{{{NAMESPACE}}}datafield'
+SUBFIELD = f'{{{NAMESPACE}}}subfield'
+
+LEADER_VALUE = '00000nmm a2200000uu 4500'
+"""New record, computer file (a dataset), monograph, UCS/Unicode."""
+
+DESCRIPTION_FIELDS = {
+    'Abstract': ('520', '3'),
+    'Methods': ('500', ' '),
+    'TechnicalInfo': ('538', ' '),
+    'Other': ('500', ' '),
+}
+"""DataCite descriptionType -> MARC tag and first indicator."""
+
+
+def datafield(parent, tag, subfields, ind1=' ', ind2=' '):
+    """Adds a datafield with (code, value) subfields, subfields without a value are left out."""
+    subfields = [(code, value) for code, value in subfields if value]
+    if not subfields:
+        return None
+    field = sub_element(parent, DATAFIELD, attrib={'tag': tag, 'ind1': ind1, 'ind2': ind2})
+    for code, value in subfields:
+        sub_element(field, SUBFIELD, value, {'code': code})
+    return field
+
+
+def _name(parent, name, main=False, relator=None):
+    """Main entry (100/110) or added entry (700/710) of a personal or organizational name."""
+    personal = name.get('nameType') != 'Organizational'
+    subfields = [('a', name.get('name'))]
+    if relator:
+        subfields.append(('e', relator))
+    subfields.extend(('u', affiliation['name']) for affiliation in name.get('affiliation', ()))
+    subfields.extend(
+        ('0', f"({identifier['nameIdentifierScheme']}){identifier['nameIdentifier']}")
+        for identifier in name.get('nameIdentifiers', ())
+    )
+    datafield(parent, ('1' if main else '7') + ('00' if personal else '10'), subfields, ind1='1' if personal else '2')
+
+
+def marcxml(data):
+    """MARCXML record element of DataCite JSON (datacite_json output)."""
+    record = root_element(RECORD, NSMAP, {XSI_SCHEMA_LOCATION: SCHEMA_LOCATION})
+    sub_element(record, LEADER, LEADER_VALUE)
+
+    if data.get('doi'):
+        datafield(record, '024', [('a', data['doi']), ('2', 'doi')], ind1='7')
+    for identifier in data.get('identifiers', ()):
+        datafield(record, '024', [('a', identifier['identifier']), ('2', identifier['identifierType'].lower())],
+                  ind1='7')
+    if data.get('language'):
+        datafield(record, '041', [('a', data['language'])])
+
+    creators = data.get('creators', ())
+    if creators:
+        _name(record, creators[0], main=True)
+
+    titles = data.get('titles', ())
+    main_titles = [title for title in titles if 'titleType' not in title]
+    if main_titles:
+        datafield(record, '245', [('a', main_titles[0]['title'])], ind1='0', ind2='0')
+    for title in titles:
+        if not main_titles or title is not main_titles[0]:
+            datafield(record, '246', [('a', title['title']), ('i', title.get('titleType'))], ind1='3')
+
+    if data.get('version'):
+        datafield(record, '250', [('a', data['version'])])
+    datafield(record, '264', [('b', data.get('publisher')), ('c', data.get('publicationYear'))], ind2='1')
+
+    for description in data.get('descriptions', ()):
+        tag, ind1 = DESCRIPTION_FIELDS.get(description['descriptionType'], ('500', ' '))
+        datafield(record, tag, [('a', description['description'])], ind1=ind1)
+    for rights in data.get('rightsList', ()):
+        datafield(record, '540', [('a', rights['rights']), ('u', rights.get('rightsUri'))])
+    for reference in data.get('fundingReferences', ()):
+        datafield(record, '536', [('a', reference.get('funderName')), ('c', reference.get('awardNumber'))])
+
+    for subject in data.get('subjects', ()):
+        if subject.get('valueUri'):
+            datafield(record, '650', [('a', subject['subject']), ('0', subject['valueUri'])], ind2='4')
+        else:
+            datafield(record, '653', [('a', subject['subject'])])
+    for location in data.get('geoLocations', ()):
+        datafield(record, '651', [('a', location.get('geoLocationPlace'))], ind2='4')
+    types = data['types']
+    datafield(record, '655', [('a', types.get('resourceType') or types['resourceTypeGeneral'])], ind2='4')
+
+    for creator in creators[1:]:
+        _name(record, creator)
+    for contributor in data.get('contributors', ()):
+        _name(record, contributor, relator=contributor.get('contributorType'))
+
+    for identifier in data.get('relatedIdentifiers', ()):
+        datafield(record, '787', [('i', identifier['relationType']),
+                                  ('o', f"({identifier['relatedIdentifierType']}){identifier['relatedIdentifier']}")],
+                  ind1='0', ind2='8')
+    if data.get('doi'):
+        datafield(record, '856', [('u', f"https://doi.org/{data['doi']}")], ind1='4', ind2='0')
+    return record
+
+
+def serialize_marcxml(metadata, xml_declaration=True):
+    """MARCXML document of a record, UTF-8 encoded, the bare record element without xml_declaration."""
+    return tostring(marcxml(datacite_json(metadata)), NSMAP, xml_declaration)
+
+
+def write_marcxml(stream, records):
+    """Writes MARCXML records into a single <collection> document, stream is binary."""
+    with xml_writer(stream, COLLECTION, NSMAP) as write:
+        for metadata in records:
+            write(marcxml(datacite_json(metadata)))
@@ -0,0 +1,78 @@
+"""
+Element building and incremental XML writing shared by the XML serializers.
+
+lxml is used if installed: documents are written with etree.xmlfile one record element at a time,
+so that memory does not grow with the number of records. Without lxml the standard library
+ElementTree produces the same documents, each record element is serialized separately.
+"""
+import contextlib
+from xml.etree import ElementTree
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    etree = None
+
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+XSI_NAMESPACE = 'http://www.w3.org/2001/XMLSchema-instance'
+XSI_SCHEMA_LOCATION = f'{{{XSI_NAMESPACE}}}schemaLocation'
+
+
+def root_element(tag, nsmap, attrib=None):
+    """Root element of a record, nsmap maps prefixes (None for the default namespace) to namespaces."""
+    if etree is not None:
+        return etree.Element(tag, attrib or {}, nsmap=nsmap)
+    return ElementTree.Element(tag, attrib or {})
+
+
+def sub_element(parent, tag, text=None, attrib=None):
+    """Adds a child element, attributes with None values are left out."""
+    if attrib is None:
+        element = (etree or ElementTree).SubElement(parent, tag)
+    else:
+        if None in attrib.values():
+            attrib = {k: v for k, v in attrib.items() if v is not None}
+        element = (etree or ElementTree).SubElement(parent, tag, attrib)
+    if text is not None:
+        element.text = text if type(text) is str else str(text)
+    return element
+
+
+def _stdlib_tostring(element, nsmap):
+    # default_namespace of tostring does not allow unqualified attributes, register the prefixes instead
+    for prefix, namespace in nsmap.items():
+        ElementTree.register_namespace(prefix or '', namespace)
+    return ElementTree.tostring(element, encoding='unicode')
+
+
+def tostring(element, nsmap, xml_declaration=True):
+    """
+    UTF-8 encoded XML document of a single element. Without xml_declaration the bare element is returned,
+    for example to be embedded in an OAI-PMH <metadata> element.
+    """
+    if etree is not None:
+        return etree.tostring(element, encoding='utf-8', xml_declaration=xml_declaration)
+    data = _stdlib_tostring(element, nsmap).encode('utf-8')
+    return b'<?xml version="1.0" encoding="utf-8"?>\n' + data if xml_declaration else data
+
+
+@contextlib.contextmanager
+def xml_writer(stream, root, nsmap):
+    """
+    Writes a document with the given root element to a binary stream, yields a function that writes
+    a record element into the root. Record elements keep their own namespace declarations,
+    so each of them can be taken out of the document as it is. A root in a namespace ('{namespace}name')
+    declares it as the default one.
+    """
+    namespace, _, name = root[1:].partition('}') if root.startswith('{') else (None, None, root)
+    if etree is not None:
+        with etree.xmlfile(stream, encoding='utf-8') as xf:
+            xf.write_declaration()
+            with xf.element(root, nsmap={None: namespace} if namespace else None):
+                yield xf.write
+        return
+
+    declaration = f' xmlns="{namespace}"' if namespace else ''
+    stream.write(f'<?xml version="1.0" encoding="utf-8"?>\n<{name}{declaration}>'.encode('utf-8'))
+    yield lambda element: stream.write(_stdlib_tostring(element, nsmap).encode('utf-8'))
+    stream.write(f'</{name}>'.encode('utf-8'))
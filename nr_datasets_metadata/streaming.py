@@ -0,0 +1,93 @@
+import collections
+import contextlib
+import gzip
+import io
+import itertools
+import sys
+
+from . import json_backend
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+@contextlib.contextmanager
+def open_input(path):
+    """Opens a (possibly gzipped) text input, '-' means stdin, which is left open."""
+    raw = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    buffered = text = None
+    try:
+        stream = raw
+        if not hasattr(stream, 'peek'):
+            stream = buffered = io.BufferedReader(raw)
+        if stream.peek(2)[:2] == GZIP_MAGIC:
+            stream = gzip.GzipFile(fileobj=stream)
+        text = io.TextIOWrapper(stream, encoding='utf-8')
+        yield text
+    finally:
+        if path != '-':
+            if text is not None:
+                text.close()
+            # GzipFile does not close its file object
+            raw.close()
+        else:
+            # the wrappers would close stdin when garbage collected
+            if text is not None:
+                text.detach()
+            if buffered is not None:
+                buffered.detach()
+
+
+@contextlib.contextmanager
+def open_output(path, append=False, binary=False):
+    """Opens a text (or binary) output, '-' means stdout. Files ending with .gz are gzipped."""
+    mode = ('a' if append else 'w') + ('b' if binary else 't')
+    encoding = None if binary else 'utf-8'
+    if path == '-':
+        yield sys.stdout.buffer if binary else sys.stdout
+        sys.stdout.flush()
+    elif path.endswith('.gz'):
+        with gzip.open(path, mode, encoding=encoding) as stream:
+            yield stream
+    else:
+        with open(path, mode, encoding=encoding) as stream:
+            yield stream
+
+
+def read_lines(stream):
+    """Yields (line number, line) for all non-empty lines of the stream, one line at a time."""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if line:
+            yield line_no, line
+
+
+def write_jsonl(stream, items):
+    for item in items:
+        stream.write(json_backend.dumps(item, default=str).decode('utf-8'))
+        stream.write('\n')
+
+
+def chunked(iterable, size):
+    """Splits iterable into lists of at most size items without reading ahead."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(executor, fn, iterable, window):
+    """
+    Like executor.map, but keeps at most ``window`` tasks in flight.
+
+    executor.map submits the whole iterable at once, which for multi-GB inputs means
+    the whole input ends up in memory. Results are yielded in the input order.
+    """
+    pending = collections.deque()
+    for item in iterable:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,297 @@
+import contextlib
+import contextvars
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlparse
+
+from .constants import TAXONOMY_CACHE_SIZE, TAXONOMY_CACHE_TTL
+
+
+def term_key(link):
+    """Returns (taxonomy code, slug) of a taxonomy term link, the same way oarepo_taxonomies parses it."""
+    path = urlparse(link).path
+    if 'taxonomies' not in path:
+        raise ValueError(f"Link '{link}' is not taxonomy reference")
+    code, _, slug = path.split('taxonomies/')[-1].partition('/')
+    return code, slug
+
+
+def taxonomy_links(data):
+    """Returns self links of all taxonomy terms (without ancestors) found anywhere in data."""
+    links = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            link = node.get('links')
+            link = link.get('self') if isinstance(link, dict) else None
+            if isinstance(link, str) and '/taxonomies/' in link and not node.get('is_ancestor'):
+                links.append(link)
+            for value in node.values():
+                if isinstance(value, (dict, list)):
+                    walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                if isinstance(value, (dict, list)):
+                    walk(value)
+
+    walk(data)
+    return links
+
+
+def ancestor_or_self_slugs(slug):
+    """'a/b/c' -> ['a', 'a/b', 'a/b/c']"""
+    parts = slug.split('/')
+    return ['/'.join(parts[:level]) for level in range(1, len(parts) + 1)]
+
+
+class FlaskTaxonomiesTermSource:
+    """
+    Loads terms with their ancestors from flask_taxonomies, in the representation oarepo_taxonomies
+    get_taxonomy_json returns for a single term (the same data TaxonomySchema uses). All slugs
+    of a taxonomy and their ancestors are fetched with a single query.
+    """
+
+    representation = 'taxonomy'
+
+    def get_terms(self, code, slugs):
+        import sqlalchemy
+        from flask_taxonomies.constants import INCLUDE_DELETED
+        from flask_taxonomies.models import Representation, TaxonomyTerm, TermStatusEnum
+        from flask_taxonomies.proxies import current_flask_taxonomies
+
+        taxonomy = current_flask_taxonomies.get_taxonomy(code, fail=False)
+        if taxonomy is None:
+            return {}
+        representation = taxonomy.merge_select(Representation(self.representation))
+        if INCLUDE_DELETED in representation:
+            status_cond = sqlalchemy.sql.true()
+        else:
+            status_cond = TaxonomyTerm.status == TermStatusEnum.alive
+        wanted = {ancestor for slug in slugs for ancestor in ancestor_or_self_slugs(slug)}
+        query = current_flask_taxonomies.session.query(TaxonomyTerm).filter(
+            TaxonomyTerm.taxonomy_id == taxonomy.id, TaxonomyTerm.slug.in_(wanted), status_cond)
+        terms = {term.slug: term for term in query}
+
+        ret = {}
+        for slug in slugs:
+            term = terms.get(slug)
+            if term is None:
+                continue
+            ancestors = [terms[ancestor] for ancestor in ancestor_or_self_slugs(slug)[:-1] if ancestor in terms]
+            ret[slug] = [
+                *(ancestor.json(representation, is_ancestor=True) for ancestor in ancestors),
+                term.json(representation)
+            ]
+        return ret
+
+
+class MemoryTermSource:
+    """In-memory stand-in of the taxonomy store for tests and benchmarks, resolves all slugs of a taxonomy at once."""
+
+    def __init__(self, base_url='https://localhost/2.0/taxonomies'):
+        self.base_url = base_url
+        self.taxonomies = defaultdict(dict)
+        self.lookups = 0
+
+    def link(self, code, slug):
+        return f'{self.base_url}/{code}/{slug}'
+
+    def add_term(self, code, slug, **data):
+        """Adds a term, its parent is given by the slug (``parent/child``) and must be added first."""
+        self.taxonomies[code][slug] = data
+        return self.link(code, slug)
+
+    def get_terms(self, code, slugs):
+        self.lookups += 1
+        terms = self.taxonomies.get(code, {})
+        ret = {}
+        for slug in slugs:
+            if slug not in terms:
+                continue
+            parts = slug.split('/')
+            ret[slug] = [
+                {
+                    **terms['/'.join(parts[:level])],
+                    'level': level,
+                    'is_ancestor': level < len(parts),
+                    'links': {'self': self.link(code, '/'.join(parts[:level]))}
+                } for level in range(1, len(parts) + 1)
+            ]
+        return ret
+
+
+class TaxonomyTermCache:
+    """
+    Thread-safe, process-wide LRU cache of taxonomy terms keyed by (taxonomy code, slug).
+    Values are lists of the term and its ancestors as returned by the source.
+    Entries expire after ttl seconds - invalidation signals reach only the current process.
+    Terms that were not found are not cached.
+    """
+
+    def __init__(self, source=None, maxsize=TAXONOMY_CACHE_SIZE, ttl=TAXONOMY_CACHE_TTL, clock=time.monotonic):
+        self.source = source or FlaskTaxonomiesTermSource()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._terms = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.signals_connected = False
+
+    def get(self, link):
+        """Returns the term with its ancestors or None if it does not exist."""
+        return self.get_many([link]).get(link)
+
+    def get_many(self, links):
+        """
+        Returns {link: terms} for all existing terms of links.
+        Missing terms are fetched from the source with one lookup per taxonomy.
+        """
+        ret = {}
+        missing = defaultdict(dict)
+        now = self.clock()
+        with self._lock:
+            for link in links:
+                key = term_key(link)
+                cached = self._terms.get(key)
+                if cached is not None and cached[0] > now:
+                    self._terms.move_to_end(key)
+                    self.hits += 1
+                    ret[link] = cached[1]
+                else:
+                    self.misses += 1
+                    missing[key[0]].setdefault(key[1], []).append(link)
+
+        for code, slug_links in missing.items():
+            fetched = self.source.get_terms(code, list(slug_links))
+            with self._lock:
+                for slug, terms in fetched.items():
+                    self._store((code, slug), terms, now)
+                    for link in slug_links[slug]:
+                        ret[link] = terms
+        return ret
+
+    def prefetch(self, links):
+        self.get_many(links)
+
+    def _store(self, key, terms, now):
+        if self.maxsize <= 0:
+            return
+        self._terms[key] = (now + self.ttl, terms)
+        self._terms.move_to_end(key)
+        while len(self._terms) > self.maxsize:
+            self._terms.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, code=None, slug=None):
+        """Drops the term and its descendants, all terms of the taxonomy if slug is not set, or everything."""
+        with self._lock:
+            if code is None:
+                self._terms.clear()
+                return
+            for key in list(self._terms):
+                if key[0] == code and (slug is None or key[1] == slug or key[1].startswith(slug + '/')):
+                    del self._terms[key]
+
+    def clear(self):
+        with self._lock:
+            self._terms.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._terms),
+                'hit_rate': self.hits / calls if calls else 0
+            }
+
+
+class TaxonomyTermScope:
+    """
+    Terms resolved within a single request or batch of records, backed by a TaxonomyTermCache.
+    Activate it with term_scope() around the schema loads. Not thread-safe.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or taxonomy_terms
+        self.terms = {}
+
+    def get(self, link):
+        return self.get_many([link]).get(link)
+
+    def get_many(self, links):
+        missing = [link for link in links if link not in self.terms]
+        if missing:
+            self.terms.update(self.cache.get_many(missing))
+        return {link: self.terms[link] for link in links if link in self.terms}
+
+    def prefetch(self, links):
+        self.get_many(links)
+
+    def prefetch_records(self, records):
+        """Fetches all taxonomy terms referenced in the records with one lookup per taxonomy."""
+        links = []
+        for record in records:
+            links.extend(taxonomy_links(record))
+        self.prefetch(links)
+
+    def clear(self):
+        self.terms.clear()
+
+
+current_scope = contextvars.ContextVar('taxonomy_term_scope', default=None)
+"""TaxonomyTermScope used by taxonomy fields instead of the process-wide cache, set by term_scope."""
+
+
+@contextlib.contextmanager
+def term_scope(scope):
+    """
+    Taxonomy fields of schemas loaded within the block resolve terms via the scope. Nested schemas
+    are shared by all schema instances, so the scope must not be put to the schema context.
+    """
+    token = current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        current_scope.reset(token)
+
+
+def active_term_cache():
+    """The TaxonomyTermScope set by term_scope, the process-wide taxonomy term cache outside of a scope."""
+    return current_scope.get() or taxonomy_terms
+
+
+def connect_signals(cache):
+    """
+    Invalidates cached terms when a term or taxonomy is changed via flask_taxonomies api.
+    Called by the NRDatasetsMetadata extension, the signals are connected once per cache.
+    """
+    if cache.signals_connected:
+        return
+    cache.signals_connected = True
+    from flask_taxonomies import signals
+
+    def term_changed(sender, term=None, **kwargs):
+        term = term or sender
+        cache.invalidate(term.taxonomy.code, term.slug)
+
+    def taxonomy_changed(sender, taxonomy=None, **kwargs):
+        cache.invalidate((taxonomy or sender).code)
+
+    for signal in (signals.after_taxonomy_term_updated, signals.after_taxonomy_term_deleted,
+                   signals.after_taxonomy_term_moved):
+        signal.connect(term_changed, weak=False)
+    for signal in (signals.after_taxonomy_updated, signals.after_taxonomy_deleted):
+        signal.connect(taxonomy_changed, weak=False)
+
+
+taxonomy_terms = TaxonomyTermCache()
@@ -0,0 +1,131 @@
+import threading
+
+from flask import current_app
+from invenio_jsonschemas import current_jsonschemas
+from jsonschema import Draft7Validator
+
+from .constants import DATASETS_PREFERRED_SCHEMA
+from .marshmallow import BatchValidator
+
+
+def dataset_schema_url(schema=DATASETS_PREFERRED_SCHEMA):
+    """URL of the DataSet definition inside the given metadata schema."""
+    url = current_jsonschemas.path_to_url(schema) or schema
+    return f'{url}#/definitions/DataSet'
+
+
+def materialize(schema):
+    """
+    Returns a plain copy of the schema with all JsonRef proxies replaced by the referenced content,
+    so that nothing is resolved lazily during validation. Does not support recursive schemas.
+    """
+    schema = getattr(schema, '__subject__', schema)
+    if isinstance(schema, dict):
+        return {k: materialize(v) for k, v in schema.items()}
+    if isinstance(schema, (list, tuple)):
+        return [materialize(v) for v in schema]
+    return schema
+
+
+def compile_jsonschema(url):
+    """
+    Loads the schema at url (including referenced schemas from other packages) and returns it
+    with all $refs replaced and allOfs merged - the same transformation AllOfDraft7Validator
+    performs every time it is created.
+    """
+    schema = current_app.extensions['invenio-records'].replace_refs({'allOf': [{'$ref': url}]})
+    return current_jsonschemas.resolver_cls(materialize(schema))
+
+
+class JSONSchemaValidatorCache:
+    """Thread-safe cache of validators for fully resolved JSON schemas, keyed by schema URL."""
+
+    def __init__(self, validator_cls=Draft7Validator):
+        self.validator_cls = validator_cls
+        self._lock = threading.Lock()
+        self._validators = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        with self._lock:
+            validator = self._validators.get(url)
+            if validator is not None:
+                self.hits += 1
+                return validator
+            self.misses += 1
+            validator = self._validators[url] = self.validator_cls(compile_jsonschema(url))
+            return validator
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._validators)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._validators.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+jsonschema_validators = JSONSchemaValidatorCache()
+
+
+def dataset_jsonschema_validator(schema=DATASETS_PREFERRED_SCHEMA):
+    return jsonschema_validators.get(dataset_schema_url(schema))
+
+
+def jsonschema_errors(validator, data):
+    return [
+        {
+            'path': '/'.join(str(x) for x in error.absolute_path),
+            'message': error.message
+        } for error in validator.iter_errors(data)
+    ]
+
+
+class DatasetValidator:
+    """
+    Validates dataset metadata both with the JSON schema and with DataSetMetadataSchemaV3
+    (or schema_class).
+
+    Needs an application context unless jsonschema_validator is given. Both validators are built once
+    and reused for all records. If timings (FieldTimings) are given, per-field marshmallow validation
+    times are recorded there. With precheck, records failing the structural pre-check
+    (precheck.StructuralPrecheck) are rejected with its errors without the full validation.
+    """
+
+    def __init__(self, schema=DATASETS_PREFERRED_SCHEMA, timings=None, schema_class=None, jsonschema_validator=None,
+                 precheck=False):
+        self.jsonschema_validator = jsonschema_validator or dataset_jsonschema_validator(schema)
+        self.marshmallow_validator = BatchValidator(schema_class, timings=timings)
+        self.precheck = None
+        if precheck:
+            from .precheck import StructuralPrecheck
+            self.precheck = StructuralPrecheck(schema_class, self.jsonschema_validator.schema)
+
+    def validate(self, data, include_data=False):
+        ret = {}
+        if self.precheck is not None:
+            errors, marshmallow_errors = self.precheck.check(data)
+            if errors or marshmallow_errors:
+                if errors:
+                    ret['jsonschemaErrors'] = errors
+                if marshmallow_errors:
+                    ret['marshmallowErrors'] = marshmallow_errors
+                ret['valid'] = False
+                return ret
+        errors = jsonschema_errors(self.jsonschema_validator, data)
+        if errors:
+            ret['jsonschemaErrors'] = errors
+        result = self.marshmallow_validator.validate_one(data)
+        if result.errors:
+            ret['marshmallowErrors'] = result.errors
+        elif include_data:
+            ret['metadata'] = result.data
+        ret['valid'] = not errors and not result.errors
+        return ret
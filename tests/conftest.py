@@ -43,6 +43,9 @@ from oarepo_validate.ext import OARepoValidate
 from pathlib import Path
 from sqlalchemy_utils import database_exists, create_database, drop_database
 
+from nr_datasets_metadata.ext import NRDatasetsMetadata
+from nr_datasets_metadata.taxonomy_cache import taxonomy_terms
+
 from tests.helpers import set_identity
 
 
@@ -158,6 +161,7 @@ def app():
     InvenioCelery(app)
     InvenioPIDStore(app)
     OARepoValidate(app)
+    NRDatasetsMetadata(app)
     app.url_map.converters['pid'] = PIDConverter
 
     # Celery
@@ -225,6 +229,9 @@ def db(app):
     #     assert result.exit_code == 0
     yield db_
 
+    # terms cached by this module's taxonomies are not valid for the next database
+    taxonomy_terms.clear()
+
     # Explicitly close DB connection
     db_.session.close()
     db_.drop_all()
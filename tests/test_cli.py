@@ -0,0 +1,106 @@
+import gc
+import gzip
+import io
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from nr_datasets_metadata import streaming
+from nr_datasets_metadata.cli import validate
+from nr_datasets_metadata.streaming import bounded_map, chunked, open_input, read_lines
+
+TERM = {
+    'is_ancestor': False,
+    'level': 1,
+    'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/c-abf2'},
+    'title': {'cs': 'otevřený přístup', 'en': 'open access'}
+}
+
+VALID_RECORD = {
+    'titles': [{'title': {'cs': 'jeej'}, 'titleType': 'mainTitle'}],
+    'creators': [{'fullName': 'Alzbeta Pokorna', 'nameType': 'Personal', 'affiliation': [TERM]}],
+    'abstract': {'cs': 'kchc'},
+    'accessRights': [TERM],
+    'resourceType': [{'is_ancestor': False,
+                      'level': 1,
+                      'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/resourceType/datasets'},
+                      'title': {'cs': 'Datasety'}}],
+    'subjectCategories': [TERM],
+    'publisher': [TERM],
+}
+
+
+def test_read_gzipped_lines(tmp_path):
+    path = tmp_path / 'records.jsonl.gz'
+    with gzip.open(path, 'wt') as f:
+        f.write('{"a": 1}\n\n{"b": 2}\n')
+    with open_input(str(path)) as stream:
+        assert list(read_lines(stream)) == [(1, '{"a": 1}'), (3, '{"b": 2}')]
+
+
+def test_input_closed(tmp_path, monkeypatch):
+    path = tmp_path / 'records.jsonl.gz'
+    with gzip.open(path, 'wt') as f:
+        f.write('{"a": 1}\n')
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(streaming, 'open', tracking_open, raising=False)
+    with open_input(str(path)) as stream:
+        assert list(read_lines(stream)) == [(1, '{"a": 1}')]
+    assert opened[0].closed
+
+    # stdin (also gzipped) is left open
+    for data in (b'{"a": 1}\n', gzip.compress(b'{"a": 1}\n')):
+        stdin = io.TextIOWrapper(io.BytesIO(data))
+        monkeypatch.setattr(sys, 'stdin', stdin)
+        with open_input('-') as stream:
+            assert list(read_lines(stream)) == [(1, '{"a": 1}')]
+        del stream
+        gc.collect()
+        assert not stdin.buffer.closed
+
+
+def test_bounded_map_keeps_order():
+    consumed = []
+
+    def source():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = bounded_map(executor, lambda x: x * 2, source(), window=3)
+        assert next(results) == 0
+        # the input is not read ahead more than the window
+        assert len(consumed) == 4
+        assert list(results) == [x * 2 for x in range(1, 10)]
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_validate_command(app, db, taxonomy_tree, tmp_path):
+    path = tmp_path / 'records.jsonl'
+    output = tmp_path / 'results.jsonl'
+    path.write_text('\n'.join([
+        'not a json',
+        json.dumps({}),
+        json.dumps(VALID_RECORD)
+    ]))
+
+    result = app.test_cli_runner().invoke(validate, [str(path), '-o', str(output), '-p', '1'])
+    assert result.exit_code == 0, result.output
+
+    results = [json.loads(x) for x in output.read_text().splitlines()]
+    assert [r['line'] for r in results] == [1, 2, 3]
+    assert not results[0]['valid']
+    assert 'Invalid JSON' in results[0]['error']
+    assert not results[1]['valid']
+    assert 'abstract' in results[1]['marshmallowErrors']
+    assert results[1]['jsonschemaErrors']
+    assert results[2]['valid'], results[2]
@@ -0,0 +1,123 @@
+import copy
+import io
+import json
+from xml.etree import ElementTree
+
+import pytest
+
+from nr_datasets_metadata.serializers import datacite, xml
+from nr_datasets_metadata.streaming import open_input
+
+from tests.test_cli import TERM
+
+NS = {'d': datacite.NAMESPACE}
+
+ORGANIZATION = [
+    dict(TERM, is_ancestor=True, title={'cs': 'Ministerstvo'}),
+    dict(TERM, ico='61384984', nameType='Organizational', title={'cs': 'Akademie', 'en': 'Academy'}),
+]
+
+RECORD = {
+    '$schema': 'https://narodni-repozitar.cz/schemas/nr_datasets_metadata/nr-datasets-metadata-v3.0.0.json',
+    'titles': [{'title': {'cs': 'titulek', 'en': 'title'}, 'titleType': 'mainTitle'},
+               {'title': {'en': 'subtitle'}, 'titleType': 'subtitle'}],
+    'creators': [
+        {'fullName': 'Alzbeta Pokorna', 'nameType': 'Personal', 'affiliation': ORGANIZATION,
+         'authorityIdentifiers': [{'identifier': '0000-0002-1825-0097', 'scheme': 'orcid'}]},
+        ORGANIZATION,
+    ],
+    'contributors': [{'fullName': 'Jan Novak', 'nameType': 'Personal', 'affiliation': [TERM],
+                      'role': [dict(TERM, dataCiteCode='Supervisor')]}],
+    'abstract': {'cs': 'abstrakt'},
+    'publisher': [TERM],
+    'dateAvailable': '2020-05-01',
+    'dateCollected': '2018/2019',
+    'persistentIdentifiers': [{'identifier': '10.1038/nphys1170', 'scheme': 'doi', 'status': 'registered'},
+                              {'identifier': 'http://hdl.handle.net/1/2', 'scheme': 'handle', 'status': 'registered'}],
+    'relatedItems': [{'itemTitle': 'article', 'itemPIDs': [{'identifier': '10.1/x', 'scheme': 'doi'}],
+                      'itemRelationType': [dict(TERM, dataCiteCode='IsCitedBy')]},
+                     {'itemTitle': 'web', 'itemURL': 'https://example.com'}],
+    'fundingReferences': [{'projectID': 'GA123', 'projectName': 'project',
+                           'funder': [dict(TERM, funderISVaVaICode='TA0', title={'cs': 'TA CR'})]}],
+    'geoLocations': [{'geoLocationPlace': 'Praha', 'geoLocationPoint': {'pointLongitude': 14, 'pointLatitude': 50}}],
+}
+
+
+@pytest.fixture(params=['lxml', 'stdlib'])
+def backend(request, monkeypatch):
+    if request.param == 'lxml':
+        pytest.importorskip('lxml')
+    else:
+        monkeypatch.setattr(xml, 'etree', None)
+    return request.param
+
+
+def test_datacite_json():
+    data = datacite.datacite_json(RECORD)
+    assert data['doi'] == '10.1038/nphys1170'
+    assert data['identifiers'] == [{'identifier': 'http://hdl.handle.net/1/2', 'identifierType': 'Handle'}]
+    assert data['titles'] == [{'title': 'titulek', 'lang': 'cs'}, {'title': 'title', 'lang': 'en'},
+                              {'title': 'subtitle', 'lang': 'en', 'titleType': 'Subtitle'}]
+    assert data['creators'][0] == {
+        'name': 'Alzbeta Pokorna', 'nameType': 'Personal', 'affiliation': [{'name': 'Academy'}],
+        'nameIdentifiers': [{'nameIdentifier': '0000-0002-1825-0097', 'nameIdentifierScheme': 'ORCID',
+                             'schemeUri': 'https://orcid.org'}]
+    }
+    assert data['creators'][1] == {'name': 'Academy', 'nameType': 'Organizational',
+                                   'nameIdentifiers': [{'nameIdentifier': '61384984', 'nameIdentifierScheme': 'ICO'}]}
+    assert data['contributors'][0]['contributorType'] == 'Supervisor'
+    assert data['publisher'] == 'open access'
+    assert data['publicationYear'] == '2020'
+    assert data['dates'] == [{'date': '2020-05-01', 'dateType': 'Available'},
+                             {'date': '2018/2019', 'dateType': 'Collected'}]
+    assert data['relatedIdentifiers'] == [
+        {'relatedIdentifier': '10.1/x', 'relatedIdentifierType': 'DOI', 'relationType': 'IsCitedBy'},
+        {'relatedIdentifier': 'https://example.com', 'relatedIdentifierType': 'URL', 'relationType': 'References'},
+    ]
+    assert data['fundingReferences'] == [{'funderName': 'TA CR', 'funderIdentifier': 'TA0',
+                                          'funderIdentifierType': 'Other', 'awardNumber': 'GA123',
+                                          'awardTitle': 'project'}]
+    assert 'version' not in data and 'language' not in data
+
+
+def test_datacite_xml(backend):
+    resource = ElementTree.fromstring(datacite.serialize_xml(RECORD))
+    assert resource.tag == f'{{{datacite.NAMESPACE}}}resource'
+    assert resource.find('d:identifier', NS).text == '10.1038/nphys1170'
+    creator = resource.find('d:creators/d:creator', NS)
+    assert creator.find('d:creatorName', NS).attrib == {'nameType': 'Personal'}
+    assert creator.find('d:nameIdentifier', NS).attrib['nameIdentifierScheme'] == 'ORCID'
+    titles = resource.findall('d:titles/d:title', NS)
+    assert [(t.text, t.get(xml.XML_LANG), t.get('titleType')) for t in titles] == [
+        ('titulek', 'cs', None), ('title', 'en', None), ('subtitle', 'en', 'Subtitle')]
+    assert resource.find('d:contributors/d:contributor', NS).get('contributorType') == 'Supervisor'
+    assert resource.find('d:geoLocations/d:geoLocation/d:geoLocationPoint/d:pointLatitude', NS).text == '50'
+    assert [e.text for e in resource.findall('d:relatedIdentifiers/d:relatedIdentifier', NS)] == [
+        '10.1/x', 'https://example.com']
+
+
+def test_write_xml(backend):
+    records = (dict(copy.deepcopy(RECORD), version=str(i)) for i in range(3))
+    stream = io.BytesIO()
+    datacite.write_xml(stream, records)
+    root = ElementTree.fromstring(stream.getvalue())
+    assert root.tag == 'resources'
+    resources = root.findall('d:resource', NS)
+    assert [r.find('d:version', NS).text for r in resources] == ['0', '1', '2']
+
+
+def test_write_files(tmp_path):
+    datacite.write_files(str(tmp_path / 'xml'), [(1, RECORD), (2, RECORD)])
+    assert sorted(p.name for p in (tmp_path / 'xml').iterdir()) == ['1.xml', '2.xml']
+    ElementTree.parse(str(tmp_path / 'xml' / '1.xml'))
+
+    datacite.write_files(str(tmp_path / 'json'), [('a', RECORD)], format='json')
+    assert json.loads((tmp_path / 'json' / 'a.json').read_text()) == datacite.datacite_json(RECORD)
+
+
+def test_write_json(tmp_path):
+    path = tmp_path / 'datacite.jsonl'
+    with open(path, 'w') as f:
+        datacite.write_json(f, [RECORD, RECORD])
+    with open_input(str(path)) as f:
+        assert [json.loads(line) for line in f] == [datacite.datacite_json(RECORD)] * 2
@@ -0,0 +1,57 @@
+import pytest
+
+from nr_datasets_metadata.date_ranges import DATE_RANGE_TREE, add_date_ranges, load_date_range_tree, \
+    parse_date_range
+from nr_datasets_metadata.record import date_ranges_to_index
+
+
+def test_date_range_tree():
+    assert DATE_RANGE_TREE == {
+        'dateCollected': None,
+        'dateCreated': None,
+        'dateWithdrawn': {'date': None}
+    }
+
+
+@pytest.mark.parametrize('value,expected', [
+    ('2020', {'gte': '2020', 'lte': '2020'}),
+    ('2018-03/2020-01-05', {'gte': '2018-03', 'lte': '2020-01-05'}),
+    ('../2020', {'lte': '2020'}),
+    ('/2020', {'lte': '2020'}),
+    ('2020/..', {'gte': '2020'}),
+    ('../..', None),
+    (1970, None),
+])
+def test_parse_date_range(value, expected):
+    assert parse_date_range(value) == expected
+
+
+def test_date_ranges_to_index():
+    json = {
+        'dateCreated': '1996-10-12',
+        'dateCollected': '2018-03/..',
+        'dateWithdrawn': {'date': '1970/1980', 'dateInformation': 'x'},
+        'dateAvailable': '1970',
+    }
+    assert date_ranges_to_index(None, json=json) == {
+        'dateCreated': '1996-10-12',
+        'dateCreatedRange': {'gte': '1996-10-12', 'lte': '1996-10-12'},
+        'dateCollected': '2018-03/..',
+        'dateCollectedRange': {'gte': '2018-03'},
+        'dateWithdrawn': {'date': '1970/1980', 'dateInformation': 'x',
+                          'dateRange': {'gte': '1970', 'lte': '1980'}},
+        'dateAvailable': '1970',
+    }
+
+
+def test_nested_array_paths():
+    tree = load_date_range_tree(range_definitions=('date',))
+    assert tree['relatedItems'] == {'[]': {'itemYear': None}}
+
+    json = {'relatedItems': [{'itemYear': '1970'}, {'itemTitle': 'no year'}], 'dateAvailable': '../2000'}
+    assert add_date_ranges(json, tree) == {
+        'relatedItems': [{'itemYear': '1970', 'itemYearRange': {'gte': '1970', 'lte': '1970'}},
+                         {'itemTitle': 'no year'}],
+        'dateAvailable': '../2000',
+        'dateAvailableRange': {'lte': '2000'}
+    }
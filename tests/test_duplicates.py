@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from marshmallow import ValidationError
+
+from nr_datasets_metadata.marshmallow.subschemas.utils import canonical_key, find_duplicates, no_duplicates
+
+
+@pytest.mark.parametrize('a,b', [
+    ({'cs': 'a', 'en': 'b'}, {'en': 'b', 'cs': 'a'}),
+    ([{'x': [1, 2]}], ({'x': (1, 2)},)),
+    ('abc', 'abc'),
+    (None, None),
+])
+def test_canonical_key_equal(a, b):
+    assert json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+    assert canonical_key(a) == canonical_key(b)
+
+
+@pytest.mark.parametrize('a,b', [
+    (1, True),
+    (1, 1.0),
+    (0, False),
+    ('1', 1),
+    ([1, 2], [2, 1]),
+    ({'cs': 'a'}, {'cs': 'a', 'en': 'a'}),
+    ({'cs': ['a']}, {'cs': 'a'}),
+])
+def test_canonical_key_different(a, b):
+    assert json.dumps(a, sort_keys=True) != json.dumps(b, sort_keys=True)
+    assert canonical_key(a) != canonical_key(b)
+
+
+def test_find_duplicates():
+    assert find_duplicates([]) is None
+    assert find_duplicates(['a', 'b', 'c']) is None
+    assert find_duplicates([{'cs': 'a'}, {'cs': 'b'}, {'cs': 'a'}, {'cs': 'b'}]) == (0, 2)
+
+
+def test_no_duplicates(app):
+    assert no_duplicates(None) is None
+    assert no_duplicates(['a', 'b']) == ['a', 'b']
+    with pytest.raises(ValidationError) as e:
+        no_duplicates(['a', 'b', 'a'])
+    assert 'item 2 is the same as item 0' in str(e.value.messages)
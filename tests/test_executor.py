@@ -0,0 +1,78 @@
+import json
+import uuid
+
+from invenio_records.api import Record
+
+from nr_datasets_metadata.cli import validate
+from nr_datasets_metadata.executor import ValidationReport, flatten_messages, validate_lines, \
+    validate_record_ids
+
+from tests.test_cli import VALID_RECORD
+
+
+def test_flatten_messages():
+    assert list(flatten_messages({'creators': {0: {'affiliation': ['Missing']}}, 'abstract': ['Required']})) == [
+        (('creators', 0, 'affiliation'), 'Missing'),
+        (('abstract',), 'Required'),
+    ]
+
+
+def test_validation_report():
+    report = ValidationReport(max_examples=2)
+    for line, creator in enumerate([0, 3, None, 1], start=1):
+        if creator is None:
+            report.add({'line': line, 'valid': True})
+            continue
+        report.add({
+            'line': line,
+            'valid': False,
+            'jsonschemaErrors': [{'path': f'creators/{creator}', 'message': 'bad'}],
+            'marshmallowErrors': {'creators': {creator: {'affiliation': ['Missing']}}, 'abstract': ['Required']}
+                                 if line == 1 else {'creators': {creator: {'affiliation': ['Missing']}}}
+        })
+    report.add({'line': 5, 'valid': False, 'error': 'Invalid JSON'})
+    assert report.as_dict() == {
+        'total': 5,
+        'valid': 1,
+        'invalid': 4,
+        'errors': [
+            {'source': 'jsonschema', 'path': 'creators/*', 'message': 'bad', 'count': 3, 'examples': [1, 2]},
+            {'source': 'marshmallow', 'path': 'creators/*/affiliation', 'message': 'Missing', 'count': 3,
+             'examples': [1, 2]},
+            {'source': 'input', 'path': '', 'message': 'Invalid JSON', 'count': 1, 'examples': [5]},
+            {'source': 'marshmallow', 'path': 'abstract', 'message': 'Required', 'count': 1, 'examples': [1]},
+        ]
+    }
+
+
+def test_validate_lines_in_processes(app, db, taxonomy_tree):
+    lines = [(i, json.dumps(VALID_RECORD if i % 3 else {})) for i in range(1, 31)]
+    sequential = list(validate_lines(lines, processes=1, chunk_size=4))
+    parallel = list(validate_lines(iter(lines), processes=2, chunk_size=4))
+    assert [r['line'] for r in parallel] == list(range(1, 31))
+    assert parallel == sequential
+    assert [r['valid'] for r in parallel] == [bool(i % 3) for i in range(1, 31)]
+
+
+def test_validate_record_ids(app, db, taxonomy_tree):
+    records = [Record.create(VALID_RECORD), Record.create({})]
+    db.session.commit()
+    missing = uuid.uuid4()
+    results = list(validate_record_ids([records[1].id, missing, records[0].id], processes=1, chunk_size=2,
+                                       record_class=Record))
+    assert [r['id'] for r in results] == [str(records[1].id), str(missing), str(records[0].id)]
+    assert [r['valid'] for r in results] == [False, False, True]
+    assert results[1]['error'] == 'Record not found'
+
+
+def test_validate_command_report(app, db, taxonomy_tree, tmp_path):
+    path = tmp_path / 'records.jsonl'
+    report = tmp_path / 'report.json'
+    path.write_text('\n'.join([json.dumps({}), json.dumps(VALID_RECORD), json.dumps({})]))
+    result = app.test_cli_runner().invoke(validate, [str(path), '-o', str(tmp_path / 'out.jsonl'), '-p', '1',
+                                                     '--report', str(report)])
+    assert result.exit_code == 0, result.output
+    report = json.loads(report.read_text())
+    assert (report['total'], report['invalid']) == (3, 2)
+    abstract = [e for e in report['errors'] if e['source'] == 'marshmallow' and e['path'] == 'abstract']
+    assert [(e['count'], e['examples']) for e in abstract] == [(2, [1, 3])]
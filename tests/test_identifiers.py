@@ -0,0 +1,61 @@
+import pytest
+from marshmallow import ValidationError
+from marshmallow_utils.schemas import IdentifierSchema
+
+from nr_datasets_metadata.marshmallow.constants import RDM_RECORDS_IDENTIFIERS_SCHEMES
+from nr_datasets_metadata.marshmallow.subschemas.identifiers import CachedIdentifierSchema, IdentifierCache
+from nr_datasets_metadata.marshmallow.subschemas.pids import PersistentIdentifierSchema
+
+IDENTIFIERS = [
+    {'identifier': '10.1038/nphys1170', 'scheme': 'doi'},
+    {'identifier': 'https://doi.org/10.1038/nphys1170', 'scheme': 'url'},
+    {'identifier': '0317-8471', 'scheme': 'issn'},
+    {'identifier': '978-3-16-148410-0', 'scheme': 'isbn'},
+    {'identifier': 'https://www.techlib.cz', 'scheme': 'url'},
+    {'identifier': 'jej---', 'scheme': 'doi'},
+    {'identifier': '10.1038/nphys1170'},
+]
+
+
+def _load(schema, data):
+    try:
+        return schema.load(dict(data))
+    except ValidationError as e:
+        return e.messages
+
+
+@pytest.mark.parametrize('data', IDENTIFIERS)
+def test_same_results_as_identifier_schema(app, data):
+    expected = _load(IdentifierSchema(allowed_schemes=RDM_RECORDS_IDENTIFIERS_SCHEMES), data)
+    schema = CachedIdentifierSchema(allowed_schemes=RDM_RECORDS_IDENTIFIERS_SCHEMES, cache=IdentifierCache())
+    assert _load(schema, data) == expected
+    # served from the cache the second time
+    assert _load(schema, data) == expected
+
+
+def test_cache_stats(app):
+    cache = IdentifierCache(maxsize=2)
+    schema = PersistentIdentifierSchema(allowed_schemes=RDM_RECORDS_IDENTIFIERS_SCHEMES, cache=cache)
+    for _ in range(3):
+        assert schema.load({'identifier': '10.1038/nphys1170', 'scheme': 'doi', 'status': 'requested'}) == {
+            'identifier': '10.1038/nphys1170', 'scheme': 'doi', 'status': 'requested'
+        }
+    stats = cache.stats()['detect_schemes']
+    assert stats['misses'] == 1
+    assert stats['hits'] == 5
+    assert stats['maxsize'] == 2
+
+    cache.configure(10)
+    assert cache.stats()['detect_schemes']['size'] == 0
+
+
+def test_trust_declared_scheme(app):
+    cache = IdentifierCache()
+    schema = CachedIdentifierSchema(allowed_schemes=RDM_RECORDS_IDENTIFIERS_SCHEMES,
+                                    trust_declared_scheme=True, cache=cache)
+    assert schema.load({'identifier': '10.1038/nphys1170', 'scheme': 'doi'})['scheme'] == 'doi'
+    assert cache.stats()['detect_schemes']['misses'] == 0
+
+    # invalid for the declared scheme, falls back to detection
+    with pytest.raises(ValidationError):
+        schema.load({'identifier': 'jej---', 'scheme': 'doi'})
@@ -0,0 +1,151 @@
+import copy
+
+import pytest
+from invenio_records_rest.loaders.marshmallow import MarshmallowErrors
+from marshmallow import Schema, fields, ValidationError, validates_schema
+
+from nr_datasets_metadata.marshmallow import IncrementalSchema, changed_fields
+from nr_datasets_metadata.marshmallow.subschemas.dataset import DataSetMetadataSchemaV3
+
+from tests.test_cli import VALID_RECORD
+
+
+class CountingString(fields.String):
+    calls = 0
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        CountingString.calls += 1
+        return super()._deserialize(value, attr, data, **kwargs)
+
+
+class ItemSchema(Schema):
+    itemTitle = CountingString(required=True)
+
+
+class RecordSchema(Schema):
+    title = CountingString(required=True)
+    version = CountingString()
+    notes = fields.List(CountingString())
+    relatedItems = fields.List(fields.Nested(ItemSchema))
+    abstract = CountingString(data_key='description', attribute='abstract')
+
+
+RECORD = {
+    'title': 'title',
+    'version': '1',
+    'notes': ['a', 'b'],
+    'relatedItems': [{'itemTitle': 'x'}, {'itemTitle': 'y'}],
+    'description': 'abstract',
+}
+
+
+def test_changed_fields():
+    assert changed_fields([
+        {'op': 'replace', 'path': '/version', 'value': '2'},
+        {'op': 'add', 'path': '/notes/-', 'value': 'c'},
+        {'op': 'move', 'from': '/relatedItems/0', 'path': '/a~1b/1'},
+    ]) == {'version', 'notes', 'relatedItems', 'a/b'}
+    assert changed_fields(['version', 'relatedItems.0.itemTitle', 'notes[1]']) == \
+        {'version', 'relatedItems', 'notes'}
+    assert changed_fields([{'op': 'replace', 'path': '', 'value': {}}]) is None
+    assert changed_fields(None) is None
+
+
+def test_incremental_load():
+    previous = RecordSchema().load(RECORD)
+    data = dict(RECORD, version='2', notes=['a', 'b', 'c'])
+
+    CountingString.calls = 0
+    ret = IncrementalSchema(RecordSchema(), previous, {'version', 'notes'}).load(data)
+    # version and three notes, nothing else
+    assert CountingString.calls == 4
+    assert ret == RecordSchema().load(data)
+
+
+def test_incremental_load_data_key():
+    previous = RecordSchema().load(RECORD)
+    data = dict(RECORD, description='changed')
+    ret = IncrementalSchema(RecordSchema(), previous, changed_fields(['/description'])).load(data)
+    assert ret['abstract'] == 'changed'
+    assert ret == RecordSchema().load(data)
+
+
+def test_incremental_load_errors():
+    previous = RecordSchema().load(RECORD)
+
+    # removed required field
+    data = dict(RECORD)
+    del data['title']
+    with pytest.raises(ValidationError) as e:
+        IncrementalSchema(RecordSchema(), previous, {'title'}).load(data)
+    assert e.value.messages == {'title': ['Missing data for required field.']}
+    assert e.value.valid_data['version'] == '1'
+
+    # invalid changed nested item
+    data = dict(RECORD, relatedItems=[{'itemTitle': 'x'}, {}])
+    with pytest.raises(ValidationError) as e:
+        IncrementalSchema(RecordSchema(), previous, {'relatedItems'}).load(data)
+    assert e.value.messages == {'relatedItems': {1: {'itemTitle': ['Missing data for required field.']}}}
+
+    # removed optional field
+    data = dict(RECORD)
+    del data['notes']
+    assert 'notes' not in IncrementalSchema(RecordSchema(), previous, {'notes'}).load(data)
+
+
+def test_incremental_dependencies():
+    previous = RecordSchema().load(RECORD)
+    data = dict(RECORD, version='2', title='')
+    schema = IncrementalSchema(RecordSchema(), previous, {'version'}, dependencies={'version': ['title']})
+    assert schema.changed == {'version', 'title'}
+    assert schema.load(data)['title'] == ''
+
+
+def test_cross_field_hooks_load_everything():
+    class CheckedSchema(RecordSchema):
+        @validates_schema
+        def check_version(self, data, **kwargs):
+            if data.get('version') == data.get('title'):
+                raise ValidationError('version must differ from title')
+
+    previous = CheckedSchema().load(RECORD)
+    with pytest.raises(ValidationError):
+        IncrementalSchema(CheckedSchema(), previous, {'version'}).load(dict(RECORD, version='title'))
+
+
+def test_record_patch(app, db, taxonomy_tree, monkeypatch):
+    from nr_datasets_metadata.record import DatasetBaseRecord
+
+    loaded = []
+    load = DataSetMetadataSchemaV3.load
+
+    def spy(self, data, **kwargs):
+        loaded.append(set(data))
+        return load(self, data, **kwargs)
+
+    monkeypatch.setattr(DataSetMetadataSchemaV3, 'load', spy)
+    record = DatasetBaseRecord.create(copy.deepcopy(VALID_RECORD))
+    db.session.commit()
+
+    loaded.clear()
+    patched = record.patch([{'op': 'replace', 'path': '/abstract', 'value': {'cs': 'novy abstrakt'}}])
+    patched.commit()
+    assert loaded == [{'abstract'}]
+    assert patched['abstract'] == {'cs': 'novy abstrakt'}
+    assert 'MARSHMALLOW_SCHEMA' not in vars(patched)
+    assert DatasetBaseRecord.MARSHMALLOW_SCHEMA is DataSetMetadataSchemaV3
+    assert patched._previous_validated is None and patched._changed_fields is None
+
+    # without a patch the whole record is loaded
+    loaded.clear()
+    patched.commit()
+    assert len(loaded) == 1 and {'titles', 'creators', 'abstract'} <= loaded[0]
+
+    failing = patched.patch([{'op': 'remove', 'path': '/abstract'}])
+    loaded.clear()
+    with pytest.raises(MarshmallowErrors):
+        failing.commit()
+    assert loaded == [set()]
+    assert 'MARSHMALLOW_SCHEMA' not in vars(failing)
+    assert DatasetBaseRecord.MARSHMALLOW_SCHEMA is DataSetMetadataSchemaV3
+    assert failing._previous_validated is None and failing._changed_fields is None
@@ -0,0 +1,47 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from nr_datasets_metadata.indexer import MemoryBulkSink, bulk_index, bulk_index_chunks
+
+
+def _batches(count, batch_size):
+    batch = []
+    for i in range(count):
+        batch.append((i, {'dateCreated': f'{1900 + i}/..', 'version': str(i)}))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def test_bulk_index_in_process():
+    sink = MemoryBulkSink()
+    assert bulk_index(bulk_index_chunks(_batches(10, 3), 'datasets'), sink) == 10
+    assert len(sink.chunks) == 1
+    assert sink.documents[('datasets', '5')] == {
+        'dateCreated': '1905/..',
+        'dateCreatedRange': {'gte': '1905'},
+        'version': '5'
+    }
+
+
+def test_bulk_index_chunk_size():
+    sink = MemoryBulkSink()
+    chunks = bulk_index_chunks(_batches(100, 7), 'datasets', max_chunk_bytes=1000)
+    assert bulk_index(chunks, sink) == 100
+    assert len(sink.chunks) > 1
+    assert all(chunk.size <= 1000 for chunk in sink.chunks)
+    assert all(len(chunk.body) == chunk.size for chunk in sink.chunks)
+    assert len(sink.documents) == 100
+
+
+def test_bulk_index_worker_pool():
+    sink = MemoryBulkSink()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        chunks = bulk_index_chunks(_batches(50, 5), 'datasets', executor=executor, max_chunk_bytes=2000)
+        assert bulk_index(chunks, sink) == 50
+    # documents keep their order
+    ids = [line for chunk in sink.chunks for line in chunk.body.splitlines()[::2]]
+    assert [int(json.loads(x)['index']['_id']) for x in ids] == list(range(50))
+    assert sink.documents[('datasets', '49')]['dateCreatedRange'] == {'gte': '1949'}
@@ -0,0 +1,43 @@
+import copy
+import json
+
+from nr_datasets_metadata.marshmallow import BatchValidator
+from nr_datasets_metadata.marshmallow.subschemas.interning import intern_strings
+
+from tests.test_cli import VALID_RECORD
+
+
+def parsed(value):
+    # strings parsed in separate json.loads calls are distinct objects
+    return json.loads(json.dumps(value))
+
+
+def test_intern_strings():
+    records = [parsed({
+        'titles': [{'title': {'cs': 'a'}, 'titleType': 'mainTitle'}],
+        'creators': [{'fullName': 'Alzbeta Pokorna', 'nameType': 'Personal',
+                      'authorityIdentifiers': [{'identifier': 'x', 'scheme': 'orcid'}]}],
+    }) for _ in range(2)]
+    first, second = records
+    assert first['titles'][0]['titleType'] is not second['titles'][0]['titleType']
+
+    expected = copy.deepcopy(first)
+    for record in records:
+        assert intern_strings(record) is record
+    assert first == second == expected
+    assert first['titles'][0]['titleType'] is second['titles'][0]['titleType']
+    assert first['creators'][0]['nameType'] is second['creators'][0]['nameType']
+    assert first['creators'][0]['authorityIdentifiers'][0]['scheme'] is \
+           second['creators'][0]['authorityIdentifiers'][0]['scheme']
+    # language codes of multilingual strings
+    assert next(iter(first['titles'][0]['title'])) is next(iter(second['titles'][0]['title']))
+    # other values are kept as they are
+    assert first['creators'][0]['fullName'] is not second['creators'][0]['fullName']
+
+
+def test_batch_validator_intern_strings(app, db, taxonomy_tree):
+    validator = BatchValidator(intern=True)
+    first, second = [validator.validate_one(parsed(VALID_RECORD)) for _ in range(2)]
+    assert first.errors is None
+    assert first.data == BatchValidator().validate_one(parsed(VALID_RECORD)).data
+    assert first.data['titles'][0]['titleType'] is second.data['titles'][0]['titleType']
@@ -0,0 +1,80 @@
+import datetime
+
+import pytest
+
+from nr_datasets_metadata import json_backend
+from nr_datasets_metadata.json_backend import StdlibJSONBackend, get_backend
+from nr_datasets_metadata.marshmallow.subschemas.utils import canonical_key
+
+EDGE_VALUES = [
+    {'b': 1, 'a': [1.5, 1e-05, 1e16, -0.0, 123456789012345680.0]},
+    {'geo': {'pointLatitude': 50.0875, 'pointLongitude': 14.4214}},
+    {'doi': '10.1038/nphys1170', 'version': 'v1.2e5', 'escaped': '"\\\x1f\x7f  čeština 😀'},
+    {'big': 2 ** 70, 'neg': -2 ** 70, 'bool': True, 'null': None},
+    {1: 'non string key'},
+    [[], {}, '', 0],
+]
+
+
+def backends():
+    ret = [StdlibJSONBackend()]
+    try:
+        ret.append(get_backend('orjson'))
+    except ImportError:
+        pass
+    return ret
+
+
+@pytest.fixture(params=backends(), ids=lambda x: x.name)
+def backend(request):
+    return request.param
+
+
+def test_round_trip(backend, new_datamodel_jschema_test, fundingReference_test, base_json,
+                    base_json_dereferenced):
+    for value in (new_datamodel_jschema_test, fundingReference_test, base_json, base_json_dereferenced,
+                  *EDGE_VALUES[:4]):
+        assert backend.loads(backend.dumps(value)) == value
+        assert backend.loads(backend.canonical_dumps(value)) == value
+
+
+def test_canonical_output_is_byte_identical(backend, new_datamodel_jschema_test, fundingReference_test,
+                                            base_json, base_json_dereferenced):
+    stdlib = StdlibJSONBackend()
+    for value in (new_datamodel_jschema_test, fundingReference_test, base_json, base_json_dereferenced,
+                  *EDGE_VALUES):
+        assert backend.canonical_dumps(value) == stdlib.canonical_dumps(value)
+
+
+def test_canonical_dumps_matches_canonical_key(backend):
+    values = [
+        {'cs': 'a', 'en': 'b'}, {'en': 'b', 'cs': 'a'}, {'cs': 'a'},
+        [1, 2], [2, 1], 1, 1.0, True, '1', None, {'a': [1, {'b': 2}]}, {'a': [1, {'b': 2.0}]},
+    ]
+    for a in values:
+        for b in values:
+            assert (backend.canonical_dumps(a) == backend.canonical_dumps(b)) == \
+                   (canonical_key(a) == canonical_key(b)), (a, b)
+
+
+def test_stable_dumps(backend):
+    for value in EDGE_VALUES:
+        reordered = dict(reversed(list(value.items()))) if isinstance(value, dict) else value
+        assert backend.stable_dumps(value) == backend.stable_dumps(reordered)
+        assert backend.loads(backend.stable_dumps(value)) == backend.loads(backend.canonical_dumps(value))
+
+
+def test_default(backend):
+    value = {'created': datetime.datetime(2021, 2, 1, 10, 20)}
+    assert backend.loads(backend.dumps(value, default=str)) == {'created': '2021-02-01 10:20:00'}
+
+
+def test_set_backend():
+    previous = json_backend.set_backend('json')
+    try:
+        assert json_backend.backend.name == 'json'
+        assert json_backend.dumps({'a': 'č'}) == '{"a":"č"}'.encode('utf-8')
+    finally:
+        json_backend.backend = previous
+    with pytest.raises(ValueError):
+        get_backend('yaml')
@@ -5,6 +5,8 @@ import jsonschema
 from jsonschema import validate
 from oarepo_invenio_model import AllOfDraft7Validator
 
+from nr_datasets_metadata.validators import dataset_jsonschema_validator, jsonschema_validators
+
 
 def get_schema():
     """This function loads the given schema available"""
@@ -154,3 +156,36 @@ def test_json(app):
     # data = json.loads('{"these": {"abstract" : {"css": "jej", "en": "yay"}}}')
     # with pytest.raises(ValidationError):
     #     schema.validate(data, get_schema())
+
+
+def test_compiled_validator(app):
+    jsonschema_validators.clear()
+    validator = dataset_jsonschema_validator()
+    assert dataset_jsonschema_validator() is validator
+    assert jsonschema_validators.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    # all references are resolved ahead of time
+    assert '$ref' not in json.dumps(validator.schema)
+
+    data = {
+        "titles": [{"title": {"cs": "jeej"}, "titleType": "mainTitle"}],
+        "creators": [
+            {"nameType": "Personal",
+             "affiliation": [{"termin": "termin"}],
+             "fullName": "Alzbeta Pokorna",
+             "authorityIdentifiers": [{"identifier": "jej", "scheme": "orcid"}]
+             }
+        ],
+        "dateAvailable": "1970",
+        "resourceType": [{"termin": "termin"}],
+        "accessRights": [{"termin": "termin"}],
+        "publisher": [{"termin": "termin"}],
+        "abstract": {"cs": "kchc"},
+        "subjectCategories": [{"termin": "termin"}]
+    }
+    assert list(validator.iter_errors(data)) == []
+
+    del data['abstract']
+    errors = list(validator.iter_errors(data))
+    assert len(errors) == 1
+    assert 'abstract' in errors[0].message
@@ -0,0 +1,27 @@
+import pytest
+
+from tests.utils import import_times
+
+HEAVY_MODULES = ('flask_babelex', 'oarepo_taxonomies', 'oarepo_multilingual', 'marshmallow_utils',
+                 'idutils', 'oarepo_rdm_records')
+
+
+@pytest.mark.parametrize('statement', [
+    'import nr_datasets_metadata.marshmallow',
+    'from nr_datasets_metadata.marshmallow import BatchValidator',
+    'import nr_datasets_metadata.date_ranges, nr_datasets_metadata.streaming, nr_datasets_metadata.indexer',
+])
+def test_no_heavy_imports(statement):
+    imported = import_times(statement)
+    assert 'nr_datasets_metadata' in imported
+    assert not [x for x in imported if x.split('.')[0] in HEAVY_MODULES]
+
+
+def test_lazy_schema_import():
+    import nr_datasets_metadata.marshmallow as m
+    from nr_datasets_metadata.marshmallow.subschemas.dataset import DataSetMetadataSchemaV3
+
+    assert m.DataSetMetadataSchemaV3 is DataSetMetadataSchemaV3
+    assert 'DataSetMetadataSchemaV3' in dir(m)
+    with pytest.raises(AttributeError):
+        m.NonExistingSchema
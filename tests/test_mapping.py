@@ -0,0 +1,79 @@
+import json
+
+from nr_datasets_metadata.date_ranges import ARRAY_ITEMS, SCHEMA_FILE, date_range_paths
+from nr_datasets_metadata.mapping import MAPPING_FILE, NOT_SEARCHED, RELEASED_MAPPING_FILE, build_mapping, \
+    generate_mapping
+
+
+def field(mapping, path):
+    node = mapping['mappings']
+    for name in path:
+        if name != ARRAY_ITEMS:
+            node = node['properties'][name]
+    return node
+
+
+def test_mapping_file_up_to_date():
+    with open(MAPPING_FILE, encoding='utf-8') as f:
+        assert f.read() == build_mapping()
+
+
+def test_released_mapping_kept():
+    assert MAPPING_FILE != RELEASED_MAPPING_FILE
+    with open(RELEASED_MAPPING_FILE, encoding='utf-8') as f:
+        released = json.load(f)
+    assert field(released, ['notes']) == {'type': 'keyword'}
+    assert field(released, ['relatedItems', 'itemTitle']) == {'type': 'keyword'}
+
+
+def test_date_range_fields():
+    mapping = json.loads(build_mapping())
+    with open(SCHEMA_FILE) as f:
+        paths = date_range_paths(json.load(f))
+    assert paths
+    for path in paths:
+        assert field(mapping, path) == {'type': 'keyword'}
+        assert field(mapping, path[:-1] + (f'{path[-1]}Range',)) == {
+            'type': 'date_range', 'format': 'strict_date_optional_time'}
+
+
+def test_tuned_fields():
+    mapping = json.loads(build_mapping())
+    assert field(mapping, ['notes']) == NOT_SEARCHED
+    assert field(mapping, ['relatedItems', 'itemStartPage']) == NOT_SEARCHED
+    # exact match filters on the keyword sub-field
+    item_title = field(mapping, ['relatedItems', 'itemTitle'])
+    assert item_title['fields']['keyword'] == {'type': 'keyword', 'ignore_above': 256}
+    assert field(mapping, ['titles'])['type'] == 'nested'
+    assert field(mapping, ['geoLocations', 'geoLocationPoint', 'pointLatitude']) == {'type': 'double'}
+    assert field(mapping, ['contributors', 'role']) == {'type': 'titled-taxonomy-term'}
+    assert field(mapping, ['relatedItems', 'itemYear']) == {'type': 'keyword'}
+
+
+def test_generate_mapping():
+    schema = {
+        'definitions': {
+            'base': {'type': 'object', 'properties': {'name': {'type': 'string'}}},
+            'span': {'type': 'string'},
+            'node': {
+                'allOf': [
+                    {'$ref': '#/definitions/base'},
+                    {'properties': {
+                        'children': {'type': 'array', 'items': {'$ref': '#/definitions/node'}},
+                        'count': {'type': 'integer'},
+                        'when': {'$ref': '#/definitions/span'},
+                    }}
+                ]
+            }
+        }
+    }
+    assert generate_mapping(schema, definition='node', overrides={'name': {'index': False}},
+                            range_definitions=('span',)) == {
+        'mappings': {'properties': {
+            'name': {'type': 'keyword', 'index': False},
+            'children': {'type': 'object'},
+            'count': {'type': 'long'},
+            'when': {'type': 'keyword'},
+            'whenRange': {'type': 'date_range', 'format': 'strict_date_optional_time'},
+        }}
+    }
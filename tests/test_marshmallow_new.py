@@ -1,13 +1,13 @@
 import pytest
-from marshmallow import Schema, ValidationError
+from marshmallow import Schema, ValidationError, fields
 
-from nr_datasets_metadata.marshmallow import DataSetMetadataSchemaV3
+from nr_datasets_metadata.marshmallow import DataSetMetadataSchemaV3, BatchValidator
 
 from nr_datasets_metadata.marshmallow.subschemas.authority import AuthorityBaseSchema, PersonSchema, OrganizationSchema, \
-    AuthoritySchema
+    AuthoritySchema, wrapped_schemas
 from nr_datasets_metadata.marshmallow.subschemas.date import StringDateField
 from nr_datasets_metadata.marshmallow.subschemas.geo import GeoLocationSchema
-from nr_datasets_metadata.marshmallow.subschemas.person import CreatorSchema, ContributorSchema
+from nr_datasets_metadata.marshmallow.subschemas.person import CreatorSchema, ContributorSchema, ItemContributorSchema
 
 AMU = [
     {
@@ -184,11 +184,33 @@ def test_authority_schema(app, db, taxonomy_tree):
     )
 
 
+def test_authority_schema_registry(app, db, taxonomy_tree):
+    wrapped_schemas.clear()
+    person = {
+        'fullName': 'test',
+        'nameType': 'Personal',
+    }
+    for _ in range(3):
+        assert AuthoritySchema().load(person) == person
+    assert wrapped_schemas.stats() == {'hits': 2, 'misses': 1, 'size': 1}
+
+    # role of the contributor must be kept on the wrapped schema
+    schema = ItemContributorSchema()
+    assert 'role' in schema.wrapped_schema(PersonSchema).fields
+    assert 'role' not in AuthoritySchema().wrapped_schema(PersonSchema).fields
+    assert schema.wrapped_schema(PersonSchema) is ItemContributorSchema().wrapped_schema(PersonSchema)
+
+
 def test_date(app, db, taxonomy_tree):
     assert_schema_passing(StringDateField, '2021')
     assert_schema_passing(StringDateField, '202102')
     assert_schema_passing(StringDateField, '2021-02-01')
     assert_schema_passing(StringDateField, '2021-02-01T00:01:00+0200')
+    assert_schema_passing(StringDateField, '2021-02')
+    assert_schema_passing(StringDateField, '2021-2-1')
+    assert_schema_passing(StringDateField, '2021-02-01 00:01:00.123Z')
+    for value in ('202113', '2021-13', '2021-02-30', '2021-02-01T25:00', '20211', '2021abc', 'xxxx', ''):
+        assert_schema_not_passing(StringDateField, value)
 
 
 def test_geo(app, db):
@@ -260,6 +282,26 @@ def test_contributor(app, db, taxonomy_tree):
     })
 
 
+def test_creator_errors(app, db, taxonomy_tree):
+    # errors of the affiliation check and of the person schema are reported together
+    with pytest.raises(ValidationError) as e:
+        CreatorSchema().load({'nameType': 'Personal', 'affiliation': 'AMU'})
+    assert set(e.value.messages) == {'affiliation', 'fullName'}
+
+    schema = type('Schema', (Schema,), dict(
+        creators=fields.List(fields.Nested(CreatorSchema()))
+    ))()
+    with pytest.raises(ValidationError) as e:
+        schema.load({'creators': [
+            {'fullName': 'test', 'nameType': 'Personal', 'affiliation': AMU},
+            {'fullName': 'test', 'nameType': 'Personal'},
+            {'nameType': 'Personal', 'affiliation': AMU},
+        ]})
+    assert set(e.value.messages['creators']) == {1, 2}
+    assert list(e.value.messages['creators'][1]) == ['affiliation']
+    assert list(e.value.messages['creators'][2]) == ['fullName']
+
+
 def test_whole_marshmallow(app, db, taxonomy_tree):
     assert_schema_passing(
         DataSetMetadataSchemaV3,
@@ -467,3 +509,31 @@ def test_whole_marshmallow(app, db, taxonomy_tree):
          'version': 'jeeej'
          }
     )
+
+
+def test_batch_validator(app, db, taxonomy_tree):
+    valid = {
+        'titles': [{'title': {'cs': 'jeej'}, 'titleType': 'mainTitle'}],
+        'abstract': {'cs': 'kchc'},
+        'accessRights': [{'is_ancestor': False,
+                          'level': 1,
+                          'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/c-abf2'},
+                          'title': {'cs': 'otevřený přístup', 'en': 'open access'}}],
+        'subjectCategories': [{'is_ancestor': False,
+                               'level': 1,
+                               'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/test_taxonomy/psh3001'},
+                               'title': {'cs': 'Reynoldsovo číslo', 'en': 'Reynolds number'}}],
+        'publisher': [{'is_ancestor': False,
+                       'level': 1,
+                       'links': {'self': 'http://127.0.0.1:5000/2.0/taxonomies/licenses/cc'},
+                       'title': {'cs': 'Licence Creative Commons'}}],
+    }
+    validator = BatchValidator()
+    results = list(validator.validate([valid, {'titles': []}, valid]))
+
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].errors is None
+    assert results[0].data['titles'] == valid['titles']
+    assert results[1].data is None
+    assert 'abstract' in results[1].errors
+    assert results[2].errors is None
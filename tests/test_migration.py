@@ -0,0 +1,190 @@
+import json
+
+import pytest
+from jsonschema import Draft7Validator
+from marshmallow import Schema, fields
+
+from nr_datasets_metadata.migration import Checkpoint, Delete, MigrationEngine, Move, RekeyIdentifiers, Rename, \
+    SplitDate, compile_transforms, jsonl_records
+from nr_datasets_metadata.schema_versions import SchemaVersionRegistry
+
+V3 = 'nr_datasets_metadata/nr-datasets-metadata-v3.0.0.json'
+V4 = 'nr_datasets_metadata/nr-datasets-metadata-v4.0.0.json'
+URL = 'https://narodni-repozitar.cz/schemas/'
+
+
+class PIDSchema(Schema):
+    identifier = fields.String(required=True)
+    scheme = fields.String(required=True)
+
+
+class RelatedItemV3(Schema):
+    itemTitle = fields.String()
+    itemURL = fields.String()
+    itemPIDs = fields.List(fields.Nested(PIDSchema))
+
+
+class RelatedItemV4(Schema):
+    itemTitle = fields.String()
+    itemLink = fields.String()
+    itemPIDs = fields.List(fields.Nested(PIDSchema))
+
+
+class MetadataV3(Schema):
+    title = fields.String(required=True)
+    notes = fields.List(fields.String())
+    dateCreated = fields.String()
+    accessRights = fields.String()
+    legacyId = fields.String()
+    relatedItems = fields.List(fields.Nested(RelatedItemV3))
+
+
+class AccessSchema(Schema):
+    rights = fields.String()
+
+
+class MetadataV4(Schema):
+    title = fields.String(required=True)
+    remarks = fields.List(fields.String())
+    dateCreatedFrom = fields.String()
+    dateCreatedTo = fields.String()
+    access = fields.Nested(AccessSchema)
+    relatedItems = fields.List(fields.Nested(RelatedItemV4))
+
+
+V3_TO_V4 = [
+    Rename('notes', 'remarks'),
+    SplitDate('dateCreated', 'dateCreatedFrom', 'dateCreatedTo'),
+    Move('accessRights', 'access.rights'),
+    Delete('legacyId'),
+    Rename('relatedItems[].itemURL', 'itemLink'),
+    RekeyIdentifiers('relatedItems[].itemPIDs', {'DOI': 'doi', 'Handle': 'handle'}),
+]
+
+
+def permissive():
+    return Draft7Validator({'type': 'object'})
+
+
+@pytest.fixture
+def registry():
+    registry = SchemaVersionRegistry(preferred=V4)
+    registry.register(V3, MetadataV3, jsonschema_validator=permissive)
+    registry.register(V4, MetadataV4, previous=V3, upgrade=compile_transforms(V3_TO_V4),
+                      jsonschema_validator=permissive)
+    return registry
+
+
+def v3_record(i):
+    return {
+        '$schema': URL + V3,
+        'title': f'dataset {i}',
+        'notes': ['note'],
+        'dateCreated': '2019/..' if i % 2 else '2020-05-01',
+        'accessRights': 'open',
+        'legacyId': str(i),
+        'relatedItems': [{
+            'itemTitle': 'article',
+            'itemURL': 'https://example.com',
+            'itemPIDs': [{'identifier': '10.1/x', 'scheme': 'DOI'}, {'identifier': 'x', 'scheme': 'other'}]
+        }]
+    }
+
+
+def write_records(path, records):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in records))
+
+
+def test_transforms():
+    upgrade = compile_transforms(V3_TO_V4)
+    data = {k: v for k, v in v3_record(1).items() if k != '$schema'}
+    assert upgrade(data) == {
+        'title': 'dataset 1',
+        'remarks': ['note'],
+        'dateCreatedFrom': '2019',
+        'access': {'rights': 'open'},
+        'relatedItems': [{
+            'itemTitle': 'article',
+            'itemLink': 'https://example.com',
+            'itemPIDs': [{'identifier': '10.1/x', 'scheme': 'doi'}, {'identifier': 'x', 'scheme': 'other'}]
+        }]
+    }
+    split = SplitDate('dateCreated', 'dateCreatedFrom', 'dateCreatedTo').compile()
+    data = {'dateCreated': '2020-05-01'}
+    split(data)
+    assert data == {'dateCreatedFrom': '2020-05-01', 'dateCreatedTo': '2020-05-01'}
+    with pytest.raises(ValueError):
+        Move('relatedItems[].itemURL', 'itemLink')
+
+
+def test_migrate_jsonl(registry, tmp_path):
+    path = tmp_path / 'records.jsonl'
+    write_records(path, [v3_record(i) for i in range(5)])
+    with open(path, 'a') as f:
+        f.write('{"$schema": "%s", "title": 1}\n' % (URL + V3))
+        f.write('not json\n')
+
+    engine = MigrationEngine(registry)
+    with open(path) as f:
+        results = list(engine.migrate(jsonl_records(f)))
+    assert [r.position for r in results] == [1, 2, 3, 4, 5, 6, 7]
+    assert all(r.valid for r in results[:5])
+    assert results[0].data['$schema'] == URL + V4
+    assert results[1].data['relatedItems'][0]['itemPIDs'][0]['scheme'] == 'doi'
+    assert not results[5].valid and results[5].errors['marshmallowErrors'] == {'title': ['Not a valid string.']}
+    assert not results[6].valid and results[6].data is None and 'error' in results[6].errors
+    # validated with one cached validator
+    assert registry.stats()['misses'] == 1
+
+    metrics = engine.metrics.as_dict()
+    assert (metrics['read'], metrics['migrated'], metrics['invalid'], metrics['failed']) == (7, 5, 1, 1)
+    assert metrics['records_per_second'] > 0
+
+
+def test_checkpoint_resume(registry, tmp_path):
+    path = tmp_path / 'records.jsonl'
+    write_records(path, [v3_record(i) for i in range(10)])
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+
+    flushed = []
+    engine = MigrationEngine(registry, checkpoint=Checkpoint(checkpoint_path), checkpoint_every=3,
+                             on_checkpoint=lambda: flushed.append(True))
+    with open(path) as f:
+        migrated = []
+        for result in engine.migrate(jsonl_records(f)):
+            migrated.append(result.position)
+            if len(migrated) == 5:
+                # interrupted while processing record 5, records 1-3 are checkpointed
+                break
+    assert flushed == [True]
+    assert Checkpoint(checkpoint_path).position == 3
+
+    checkpoint = Checkpoint(checkpoint_path)
+    assert checkpoint.metrics.read == 3
+    engine = MigrationEngine(registry, checkpoint=checkpoint, checkpoint_every=3)
+    with open(path) as f:
+        resumed = [r.position for r in engine.migrate(jsonl_records(f))]
+    assert resumed == [4, 5, 6, 7, 8, 9, 10]
+    assert Checkpoint(checkpoint_path).position == 10
+    assert Checkpoint(checkpoint_path).metrics.read == 10
+
+    # nothing left after the migration finished
+    engine = MigrationEngine(registry, checkpoint=Checkpoint(checkpoint_path))
+    with open(path) as f:
+        assert list(engine.migrate(jsonl_records(f))) == []
+
+
+def test_migrate_without_schema_to_target(registry):
+    registry.preferred = V3
+    data = {k: v for k, v in v3_record(1).items() if k != '$schema'}
+    result = MigrationEngine(registry, target=V4).migrate_one(1, data)
+    assert result.valid, result.errors
+    assert '$schema' not in result.data
+    assert result.data['remarks'] == ['note'] and result.data['access'] == {'rights': 'open'}
+
+
+def test_migrate_current_version(registry):
+    data = {'$schema': URL + V4, 'title': 'x', 'remarks': ['a']}
+    result = MigrationEngine(registry).migrate_one(1, data)
+    assert result.valid
+    assert result.data is data
@@ -0,0 +1,85 @@
+import copy
+import json
+
+import pytest
+from jsonschema import Draft7Validator
+from marshmallow import ValidationError
+
+from nr_datasets_metadata.date_ranges import SCHEMA_FILE
+from nr_datasets_metadata.marshmallow.subschemas.dataset import DataSetMetadataSchemaV3
+from nr_datasets_metadata.precheck import StructuralPrecheck
+from nr_datasets_metadata.validators import DatasetValidator, jsonschema_errors
+
+from tests.test_cli import VALID_RECORD
+
+
+@pytest.fixture(scope='module')
+def dataset_jsonschema():
+    with open(SCHEMA_FILE) as f:
+        return json.load(f)['definitions']['DataSet']
+
+
+def as_text(messages):
+    if isinstance(messages, dict):
+        return {k: as_text(v) for k, v in messages.items()}
+    if isinstance(messages, list):
+        return [as_text(v) for v in messages]
+    return str(messages)
+
+
+def invalid_record():
+    record = copy.deepcopy(VALID_RECORD)
+    for name in ('abstract', 'subjectCategories', 'publisher', 'accessRights'):
+        record.pop(name, None)
+    record['titles'] = [{'title': {'en': 'subtitle'}, 'titleType': 'subtitle'}]
+    record['creators'] = [
+        {'fullName': 'Novak, Jan', 'nameType': 'Robot'},
+        {'fullName': 'Novak, Jan'},
+    ]
+    return record
+
+
+def test_same_errors_as_full_validation(app, db, taxonomy_tree, dataset_jsonschema):
+    record = invalid_record()
+    jsonschema_result, marshmallow_result = StructuralPrecheck(jsonschema=dataset_jsonschema).check(record)
+
+    with pytest.raises(ValidationError) as e:
+        DataSetMetadataSchemaV3().load(record)
+    assert as_text(marshmallow_result) == as_text(e.value.messages)
+    assert as_text(marshmallow_result) == {
+        'abstract': ['Missing data for required field.'],
+        'subjectCategories': ['Missing data for required field.'],
+        'publisher': ['Missing data for required field.'],
+        'accessRights': ['Missing data for required field.'],
+        'titles': {'titleType': 'At least one title must have type mainTitle'},
+        'creators': {0: 'Unknown nameType. Must be one of "Personal", "Organizational"',
+                     1: 'nameType is missing'},
+    }
+
+    required = Draft7Validator({'type': 'object', 'required': dataset_jsonschema['required']})
+    assert jsonschema_result == jsonschema_errors(required, record)
+    assert [error['message'] for error in jsonschema_result] == [
+        "'accessRights' is a required property",
+        "'abstract' is a required property",
+        "'subjectCategories' is a required property",
+        "'publisher' is a required property",
+    ]
+
+
+def test_valid_record_passes(dataset_jsonschema):
+    assert StructuralPrecheck(jsonschema=dataset_jsonschema).check(VALID_RECORD) == ([], {})
+
+
+def test_malformed_titles_left_to_full_validation():
+    precheck = StructuralPrecheck()
+    for titles in ([{'title': {'en': 'x'}}], [{'title': 'x', 'titleType': 'subtitle'}], 'x'):
+        assert precheck.check(dict(VALID_RECORD, titles=titles)) == ([], {})
+
+
+def test_validator_precheck(dataset_jsonschema):
+    validator = DatasetValidator(jsonschema_validator=Draft7Validator(dataset_jsonschema), precheck=True)
+    result = validator.validate(invalid_record())
+    assert not result['valid']
+    assert len(result['jsonschemaErrors']) == 4
+    assert set(result['marshmallowErrors']) == {'abstract', 'subjectCategories', 'publisher', 'accessRights',
+                                                'titles', 'creators'}
@@ -0,0 +1,130 @@
+from marshmallow import Schema, fields, validates_schema, ValidationError
+
+from nr_datasets_metadata.marshmallow import FieldTimings, instrument_schema
+
+
+class ItemSchema(Schema):
+    title = fields.String(data_key='itemTitle')
+    creators = fields.List(fields.Nested(lambda: CreatorSchema()), data_key='itemCreators')
+
+    @validates_schema
+    def validate_title(self, data, **kwargs):
+        if data.get('title') == 'invalid':
+            raise ValidationError('invalid title')
+
+
+class CreatorSchema(Schema):
+    name = fields.String()
+
+
+class RecordSchema(Schema):
+    related = fields.List(fields.Nested(ItemSchema), data_key='relatedItems')
+    version = fields.String()
+
+
+def test_field_timings():
+    timings = FieldTimings()
+    schema = instrument_schema(RecordSchema(), timings)
+    data = {
+        'relatedItems': [
+            {'itemTitle': 'a', 'itemCreators': [{'name': 'x'}, {'name': 'y'}]},
+            {'itemTitle': 'b'}
+        ],
+        'version': '1'
+    }
+    assert schema.load(data) == {
+        'related': [{'title': 'a', 'creators': [{'name': 'x'}, {'name': 'y'}]}, {'title': 'b'}],
+        'version': '1'
+    }
+    calls = {path: x['calls'] for path, x in timings.as_dict().items()}
+    assert calls == {
+        'relatedItems': 1,
+        'relatedItems[]': 2,
+        'relatedItems[].itemTitle': 2,
+        'relatedItems[].itemCreators': 2,
+        'relatedItems[].itemCreators[]': 2,
+        'relatedItems[].itemCreators[].name': 2,
+        'relatedItems[]@validate_title': 2,
+        'version': 1,
+    }
+    stats = timings.as_dict()
+    assert stats['relatedItems']['seconds'] >= stats['relatedItems[].itemCreators']['seconds'] > 0
+
+    # hooks keep working when instrumented
+    assert 'relatedItems' in schema.validate({'relatedItems': [{'itemTitle': 'invalid'}]})
+
+    # other instances are not instrumented
+    timings.clear()
+    RecordSchema().load(data)
+    assert timings.as_dict() == {}
+
+
+class WithdrawnSchema(Schema):
+    date = fields.String()
+
+
+class SharedNestedSchema(Schema):
+    # nested schema instance shared by all SharedNestedSchema instances
+    withdrawn = fields.Nested(WithdrawnSchema())
+
+
+def test_fresh_instance_not_instrumented():
+    data = {'withdrawn': {'date': '2020'}}
+    first = FieldTimings()
+    original = SharedNestedSchema()
+    instrumented = instrument_schema(original, first)
+    for _ in range(2):
+        instrument_schema(SharedNestedSchema(), first)
+
+    SharedNestedSchema().load(data)
+    original.load(data)
+    assert first.as_dict() == {}
+
+    instrumented.load(data)
+    assert {path: x['calls'] for path, x in first.as_dict().items()} == {'withdrawn': 1, 'withdrawn.date': 1}
+
+    # an instrumented schema instrumented again records to the new timings only, once per call
+    second = FieldTimings()
+    first.clear()
+    instrument_schema(instrumented, second).load(data)
+    assert first.as_dict() == {}
+    assert {path: x['calls'] for path, x in second.as_dict().items()} == {'withdrawn': 1, 'withdrawn.date': 1}
+
+
+def test_authority_fields_instrumented():
+    from nr_datasets_metadata.marshmallow.subschemas.person import ItemCreatorSchema
+    from nr_datasets_metadata.taxonomy_cache import MemoryTermSource, TaxonomyTermCache, TaxonomyTermScope, \
+        term_scope
+
+    class RelatedSchema(Schema):
+        creators = fields.List(fields.Nested(ItemCreatorSchema), data_key='itemCreators')
+
+    source = MemoryTermSource()
+    data = {'itemCreators': [{
+        'fullName': 'Novak, Jan',
+        'nameType': 'Personal',
+        'affiliation': [source.add_term('institutions', 'ntk', title={'cs': 'NTK'})],
+        'authorityIdentifiers': [{'identifier': '0000-0002-1825-0097', 'scheme': 'orcid'}],
+    }]}
+    timings = FieldTimings()
+    schema = instrument_schema(RelatedSchema(), timings)
+    with term_scope(TaxonomyTermScope(TaxonomyTermCache(source))):
+        schema.load(data)
+        calls = {path: x['calls'] for path, x in timings.as_dict().items()}
+        assert {'itemCreators[].fullName', 'itemCreators[].affiliation', 'itemCreators[].authorityIdentifiers[]',
+                'itemCreators[].authorityIdentifiers[].identifier'} <= set(calls)
+
+        # the shared wrapped schemas are not instrumented
+        timings.clear()
+        RelatedSchema().load(data)
+    assert timings.as_dict() == {}
+
+
+def test_prometheus_export():
+    timings = FieldTimings()
+    timings.record('relatedItems[].itemCreators', 0.5)
+    timings.record('relatedItems[].itemCreators', 0.25)
+    lines = timings.to_prometheus().splitlines()
+    assert '# TYPE nr_datasets_validation_field_seconds_total counter' in lines
+    assert 'nr_datasets_validation_field_seconds_total{path="relatedItems[].itemCreators"} 0.75' in lines
+    assert 'nr_datasets_validation_field_calls_total{path="relatedItems[].itemCreators"} 2' in lines
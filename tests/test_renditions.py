@@ -0,0 +1,106 @@
+import copy
+import io
+import os
+from xml.etree import ElementTree
+
+from nr_datasets_metadata.serializers import dc, marcxml
+from nr_datasets_metadata.serializers.cache import RENDITION_FORMATS, RenditionCache, revision_hash
+
+from tests.test_datacite import RECORD, backend  # noqa: F401
+
+DC_NS = {'dc': dc.DC_NAMESPACE, 'oai_dc': dc.OAI_DC_NAMESPACE}
+MARC_NS = {'m': marcxml.NAMESPACE}
+
+
+def marc_fields(record, tag):
+    return [
+        [(sf.get('code'), sf.text) for sf in field.findall('m:subfield', MARC_NS)]
+        for field in record.findall(f"m:datafield[@tag='{tag}']", MARC_NS)
+    ]
+
+
+def test_oai_dc(backend):  # noqa: F811
+    root = ElementTree.fromstring(dc.serialize_dc(RECORD))
+    assert root.tag == f'{{{dc.OAI_DC_NAMESPACE}}}dc'
+    assert [e.text for e in root.findall('dc:title', DC_NS)] == ['titulek', 'title', 'subtitle']
+    assert [e.text for e in root.findall('dc:creator', DC_NS)] == ['Alzbeta Pokorna', 'Academy']
+    assert [e.text for e in root.findall('dc:identifier', DC_NS)] == [
+        'info:doi/10.1038/nphys1170', 'http://hdl.handle.net/1/2']
+    assert [e.text for e in root.findall('dc:date', DC_NS)] == ['2020', '2020-05-01', '2018/2019']
+    assert [e.text for e in root.findall('dc:relation', DC_NS)] == ['info:doi/10.1/x', 'https://example.com']
+
+
+def test_marcxml(backend):  # noqa: F811
+    record = ElementTree.fromstring(marcxml.serialize_marcxml(RECORD))
+    assert record.find('m:leader', MARC_NS).text == marcxml.LEADER_VALUE
+    assert marc_fields(record, '024') == [[('a', '10.1038/nphys1170'), ('2', 'doi')],
+                                          [('a', 'http://hdl.handle.net/1/2'), ('2', 'handle')]]
+    assert marc_fields(record, '100') == [[('a', 'Alzbeta Pokorna'), ('u', 'Academy'),
+                                           ('0', '(ORCID)0000-0002-1825-0097')]]
+    assert marc_fields(record, '245') == [[('a', 'titulek')]]
+    assert marc_fields(record, '710') == [[('a', 'Academy'), ('0', '(ICO)61384984')]]
+    assert marc_fields(record, '700') == [[('a', 'Jan Novak'), ('e', 'Supervisor'), ('u', 'open access')]]
+
+    stream = io.BytesIO()
+    marcxml.write_marcxml(stream, [RECORD, RECORD])
+    collection = ElementTree.fromstring(stream.getvalue())
+    assert collection.tag == f'{{{marcxml.NAMESPACE}}}collection'
+    assert len(collection.findall('m:record', MARC_NS)) == 2
+
+
+def test_revision_hash():
+    changed = dict(RECORD, version='2')
+    assert revision_hash(RECORD) == revision_hash(dict(reversed(list(RECORD.items()))))
+    assert revision_hash(RECORD) != revision_hash(changed)
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    cache = RenditionCache(str(tmp_path))
+    first = cache.get(RECORD, 'oai_dc', record_id='1')
+    assert cache.get(RECORD, 'oai_dc', record_id='1') == first
+    cache.get(RECORD, 'marcxml', record_id='1')
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+    old_path = cache.path('oai_dc', revision_hash(RECORD))
+    assert os.path.exists(old_path)
+
+    # a new revision is rendered again, renditions of the previous one are removed
+    changed = copy.deepcopy(RECORD)
+    changed['titles'][0]['title']['cs'] = 'novy titulek'
+    assert b'novy titulek' in cache.get(changed, 'oai_dc', record_id='1')
+    assert not os.path.exists(old_path)
+    assert not os.path.exists(cache.path('marcxml', revision_hash(RECORD)))
+    assert cache.stats()['entries'] == 1
+
+    cache.invalidate('1')
+    assert cache.stats()['entries'] == 0
+    assert not os.listdir(tmp_path / 'oai_dc' / revision_hash(changed)[:2])
+
+
+def test_cached_renditions_without_declaration(tmp_path):
+    cache = RenditionCache(str(tmp_path))
+    for format in ('oai_dc', 'marcxml', 'datacite'):
+        rendition = cache.get(RECORD, format)
+        assert not rendition.startswith(b'<?xml')
+        ElementTree.fromstring(rendition)
+    # standalone documents keep the declaration
+    assert dc.serialize_dc(RECORD).startswith(b'<?xml')
+    assert marcxml.serialize_marcxml(RECORD).startswith(b'<?xml')
+
+
+def test_cache_eviction(tmp_path):
+    records = [dict(RECORD, version=str(i)) for i in range(5)]
+    size = len(RENDITION_FORMATS['oai_dc'](records[0]))
+    cache = RenditionCache(str(tmp_path), max_size=3 * size + 10)
+    list(cache.render_many(enumerate(records[:3]), 'oai_dc'))
+    cache.get(records[0], 'oai_dc')  # records[1] is now the least recently used
+    cache.get(records[3], 'oai_dc')
+    assert cache.stats()['evictions'] == 1
+    assert not os.path.exists(cache.path('oai_dc', revision_hash(records[1])))
+    assert os.path.exists(cache.path('oai_dc', revision_hash(records[0])))
+
+    # another process sees the same renditions
+    reopened = RenditionCache(str(tmp_path), max_size=cache.max_size)
+    assert reopened.stats()['entries'] == 3
+    assert reopened.stats()['size'] == cache.stats()['size']
+    reopened.get(records[3], 'oai_dc')
+    assert reopened.stats()['hits'] == 1
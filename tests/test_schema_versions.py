@@ -0,0 +1,172 @@
+import copy
+
+import pytest
+from jsonschema import Draft7Validator
+from marshmallow import Schema, fields
+
+from nr_datasets_metadata.constants import DATASETS_PREFERRED_SCHEMA
+from nr_datasets_metadata.migration import RekeyIdentifiers, Rename, compile_transforms
+from nr_datasets_metadata.record import DatasetBaseRecord, SchemaVersionMixin
+from nr_datasets_metadata.schema_versions import SchemaVersionRegistry, dataset_schemas
+
+from tests.test_cli import VALID_RECORD
+
+V3 = 'nr_datasets_metadata/nr-datasets-metadata-v3.0.0.json'
+V4 = 'nr_datasets_metadata/nr-datasets-metadata-v4.0.0.json'
+URL = 'https://narodni-repozitar.cz/schemas/'
+
+
+class MetadataV3(Schema):
+    title = fields.String(required=True)
+    notes = fields.List(fields.String())
+
+
+class MetadataV4(Schema):
+    title = fields.String(required=True)
+    remarks = fields.List(fields.String())
+
+
+def notes_to_remarks(data):
+    if 'notes' in data:
+        data['remarks'] = data.pop('notes')
+    return data
+
+
+def jsonschema(*properties):
+    return lambda: Draft7Validator({
+        'type': 'object',
+        'properties': {name: {} for name in properties},
+        'additionalProperties': False
+    })
+
+
+@pytest.fixture
+def registry():
+    registry = SchemaVersionRegistry(preferred=V4)
+    registry.register(V3, MetadataV3, jsonschema_validator=jsonschema('title', 'notes'))
+    registry.register(V4, MetadataV4, previous=V3, upgrade=notes_to_remarks,
+                      jsonschema_validator=jsonschema('title', 'remarks'))
+    return registry
+
+
+def test_resolve(registry):
+    assert registry.resolve(URL + V3) == V3
+    assert registry.resolve(V3) == V3
+    assert registry.resolve(None) == V4
+    with pytest.raises(KeyError):
+        registry.resolve(URL + 'nr_datasets_metadata/nr-datasets-metadata-v5.0.0.json')
+    with pytest.raises(KeyError):
+        registry.register('v6.json', MetadataV4, previous='v5.json', upgrade=notes_to_remarks)
+
+
+def test_mixed_version_batch(registry):
+    records = [
+        {'$schema': URL + (V3 if i % 2 else V4), 'title': f'title {i}', ('notes' if i % 2 else 'remarks'): ['a']}
+        for i in range(10)
+    ]
+    results = [registry.validate(r, include_data=True) for r in records]
+    assert all(r['valid'] for r in results), results
+    assert [r['schema'] for r in results] == [V3 if i % 2 else V4 for i in range(10)]
+    assert results[1]['metadata'] == {'title': 'title 1', 'notes': ['a']}
+    # one validator per version, built once
+    assert registry.stats() == {'hits': 8, 'misses': 2, 'size': 2}
+    assert registry.validator(V3) is registry.validator(URL + V3)
+    assert registry.validator(V3).marshmallow_validator.schema.__class__ is MetadataV3
+
+    invalid = registry.validate({'$schema': URL + V4, 'title': 'x', 'notes': ['a']})
+    assert not invalid['valid']
+    assert invalid['jsonschemaErrors'] and invalid['marshmallowErrors']
+
+
+def test_upgrade(registry):
+    data = {'$schema': URL + V3, 'title': 'x', 'notes': ['a']}
+    assert registry.upgrade(data) == {'$schema': URL + V4, 'title': 'x', 'remarks': ['a']}
+    assert data == {'$schema': URL + V3, 'title': 'x', 'notes': ['a']}
+    assert registry.upgrade({'$schema': V3, 'title': 'x'})['$schema'] == V4
+    assert registry.upgrade(data, target=V3) is data
+    with pytest.raises(ValueError):
+        registry.upgrade({'$schema': V4, 'title': 'x'}, target=V3)
+
+    upgraded = registry.validate(data, include_data=True, upgrade=True)
+    assert upgraded['schema'] == V4
+    assert upgraded['metadata'] == {'title': 'x', 'remarks': ['a']}
+
+
+def test_upgrade_keeps_nested_data():
+    registry = SchemaVersionRegistry(preferred=V4)
+    registry.register(V3, MetadataV3)
+    registry.register(V4, MetadataV4, previous=V3, upgrade=compile_transforms([
+        Rename('relatedItems[].itemURL', 'itemLink'),
+        RekeyIdentifiers('relatedItems[].itemPIDs', {'DOI': 'doi'}),
+    ]))
+    item = {'itemURL': 'https://example.com', 'itemPIDs': [{'identifier': '10.1/x', 'scheme': 'DOI'}]}
+    data = {'$schema': URL + V3, 'title': 'x', 'relatedItems': [item]}
+    original = copy.deepcopy(data)
+    assert registry.upgrade(data)['relatedItems'] == [
+        {'itemLink': 'https://example.com', 'itemPIDs': [{'identifier': '10.1/x', 'scheme': 'doi'}]}]
+    assert data == original
+
+
+def test_record_schema_version(registry):
+    class VersionedRecord(SchemaVersionMixin):
+        SCHEMA_VERSIONS = registry
+
+    assert VersionedRecord().marshmallow_schema_class({'$schema': URL + V3}) is MetadataV3
+    assert VersionedRecord().marshmallow_schema_class({}) is MetadataV4
+
+
+def test_record_subclass_schema(registry):
+    from nr_datasets_metadata.marshmallow import DataSetMetadataSchemaV3
+
+    class DownstreamSchema(Schema):
+        title = fields.String()
+
+    class DownstreamRecord(DatasetBaseRecord):
+        MARSHMALLOW_SCHEMA = DownstreamSchema
+
+    class InheritingRecord(DatasetBaseRecord):
+        pass
+
+    class VersionedRecord(DatasetBaseRecord):
+        SCHEMA_VERSIONS = registry
+
+    def schema_class(record_class, schema):
+        # records are not initialized, that needs an application context
+        return record_class.__new__(record_class).marshmallow_schema_class({'$schema': schema})
+
+    v1 = URL + 'nr_datasets/nr-datasets-v1.0.0.json'
+    assert schema_class(DownstreamRecord, URL + DATASETS_PREFERRED_SCHEMA) is DownstreamSchema
+    assert schema_class(DownstreamRecord, v1) is DownstreamSchema
+    assert schema_class(InheritingRecord, URL + DATASETS_PREFERRED_SCHEMA) is DataSetMetadataSchemaV3
+    assert schema_class(InheritingRecord, v1) is DataSetMetadataSchemaV3
+    assert schema_class(VersionedRecord, URL + V3) is MetadataV3
+    assert schema_class(VersionedRecord, v1) is DataSetMetadataSchemaV3
+    assert v1 not in registry and V3 in registry and None in registry
+
+
+def test_dataset_schemas(app, db, taxonomy_tree):
+    assert dataset_schemas.schemas == [DATASETS_PREFERRED_SCHEMA]
+    result = dataset_schemas.validate({'$schema': URL + DATASETS_PREFERRED_SCHEMA, **VALID_RECORD})
+    assert result['valid'], result
+    assert result['schema'] == DATASETS_PREFERRED_SCHEMA
+
+
+def test_dataset_schemas_v4(app, db, taxonomy_tree):
+    from nr_datasets_metadata.marshmallow import DataSetMetadataSchemaV3
+
+    class DataSetMetadataSchemaV4(DataSetMetadataSchemaV3):
+        remarks = fields.List(fields.String())
+
+        class Meta:
+            exclude = ('notes',)
+
+    registry = SchemaVersionRegistry(preferred=V4)
+    registry.register(V3, DataSetMetadataSchemaV3)
+    registry.register(V4, DataSetMetadataSchemaV4, previous=V3, upgrade=notes_to_remarks,
+                      jsonschema_validator=lambda: Draft7Validator({'type': 'object'}))
+    v3_record = {'$schema': URL + V3, **VALID_RECORD, 'notes': ['a']}
+    records = [v3_record, registry.upgrade(v3_record)] * 3
+    results = [registry.validate(r, include_data=True) for r in records]
+    assert all(r['valid'] for r in results), results
+    assert results[0]['metadata']['notes'] == results[1]['metadata']['remarks'] == ['a']
+    assert registry.stats()['misses'] == 2
@@ -0,0 +1,35 @@
+import pytest
+from marshmallow import ValidationError
+
+from nr_datasets_metadata.marshmallow.subschemas.date import parse_string_date
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2021', {'year': 2021}),
+    ('202102', {'year': 2021, 'month': 2}),
+    ('2021-2', {'year': 2021, 'month': 2}),
+    ('2021-02-01', {'year': 2021, 'month': 2, 'day': 1}),
+    ('2021-02-01T00:01:00+0200', {'year': 2021, 'month': 2, 'day': 1,
+                                  'hour': 0, 'minute': 1, 'second': 0, 'tzinfo': '+0200'}),
+    ('2021-02-01 10:20:30.5Z', {'year': 2021, 'month': 2, 'day': 1, 'hour': 10, 'minute': 20,
+                                'second': 30, 'microsecond': 500000, 'tzinfo': 'Z'}),
+])
+def test_parse_string_date(value, expected):
+    assert parse_string_date(value) == expected
+
+
+@pytest.mark.parametrize('value, message', [
+    ('2021-13', 'Bad month value'),
+    ('202100', 'Bad month value'),
+    ('2021-02-29', 'Unsupported date string'),
+    ('2021-02-01T24:00', 'Unsupported date string'),
+    ('2021-02-01T', 'Unsupported date string'),
+    ('20211', 'Unsupported date string'),
+    ('2021abc', 'Unsupported date string'),
+    ('2021\n', 'Unsupported date string'),
+    (2021, 'Unsupported date string'),
+])
+def test_parse_string_date_invalid(value, message):
+    with pytest.raises(ValidationError) as e:
+        parse_string_date(value)
+    assert str(e.value.messages) == message
@@ -0,0 +1,168 @@
+from types import SimpleNamespace
+
+import pytest
+from marshmallow import Schema, ValidationError
+
+from nr_datasets_metadata.ext import NRDatasetsMetadata
+from nr_datasets_metadata.marshmallow import BatchValidator
+from nr_datasets_metadata.marshmallow.subschemas.taxonomy import TaxonomyField, SingleValuedMixin
+from nr_datasets_metadata.taxonomy_cache import FlaskTaxonomiesTermSource, MemoryTermSource, TaxonomyTermCache, \
+    TaxonomyTermScope, active_term_cache, connect_signals, taxonomy_links, taxonomy_terms, term_key, term_scope
+
+
+@pytest.fixture()
+def source():
+    source = MemoryTermSource()
+    source.add_term('languages', 'cze', title={'cs': 'čeština', 'en': 'Czech'})
+    source.add_term('languages', 'eng', title={'cs': 'angličtina', 'en': 'English'})
+    source.add_term('subjects', 'physics', title={'en': 'Physics'})
+    source.add_term('subjects', 'physics/optics', title={'en': 'Optics'})
+    return source
+
+
+class Clock:
+    now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_term_key():
+    assert term_key('https://localhost/2.0/taxonomies/subjects/physics/optics') == ('subjects', 'physics/optics')
+    with pytest.raises(ValueError):
+        term_key('https://localhost/api/records/1')
+
+
+def test_cache_lookup_per_taxonomy(source):
+    cache = TaxonomyTermCache(source)
+    links = [source.link('languages', 'cze'), source.link('languages', 'eng'),
+             source.link('subjects', 'physics/optics'), source.link('languages', 'missing')]
+    terms = cache.get_many(links)
+    assert source.lookups == 2
+    assert set(terms) == set(links[:3])
+    assert [(x['level'], x['is_ancestor']) for x in terms[links[2]]] == [(1, True), (2, False)]
+
+    assert cache.get_many(links[:3]) == terms
+    assert source.lookups == 2
+    # terms that are not found are fetched again
+    assert cache.get(links[3]) is None
+    assert source.lookups == 3
+    assert cache.stats()['size'] == 3
+
+
+def test_flask_taxonomies_source(app, db, taxonomy_tree):
+    from oarepo_taxonomies.utils import get_taxonomy_json
+
+    slugs = ['c_abf2', 'cze', 'missing']
+    assert FlaskTaxonomiesTermSource().get_terms('test_taxonomy', slugs) == {
+        slug: get_taxonomy_json(code='test_taxonomy', slug=slug).paginated_data for slug in slugs[:2]}
+    assert FlaskTaxonomiesTermSource().get_terms('missing', ['cze']) == {}
+
+
+def test_cache_eviction(source):
+    clock = Clock()
+    cache = TaxonomyTermCache(source, maxsize=2, ttl=10, clock=clock)
+    cze, eng, physics = source.link('languages', 'cze'), source.link('languages', 'eng'), \
+        source.link('subjects', 'physics')
+    cache.get(cze)
+    cache.get(eng)
+    cache.get(cze)
+    cache.get(physics)
+    assert cache.stats()['evictions'] == 1
+    lookups = source.lookups
+    cache.get(cze)
+    assert source.lookups == lookups
+    cache.get(eng)
+    assert source.lookups == lookups + 1
+
+    clock.now = 11
+    cache.get(eng)
+    assert source.lookups == lookups + 2
+
+
+def test_cache_invalidation(source):
+    cache = TaxonomyTermCache(source)
+    cache.get_many([source.link('languages', 'cze'), source.link('subjects', 'physics'),
+                    source.link('subjects', 'physics/optics')])
+    cache.invalidate('subjects', 'physics')
+    assert cache.stats()['size'] == 1
+    cache.invalidate('languages')
+    assert cache.stats()['size'] == 0
+
+
+def test_signals(source):
+    from flask import Flask
+    from flask_taxonomies import signals
+
+    cache = TaxonomyTermCache(source)
+    connect_signals(cache)
+    receivers = len(signals.after_taxonomy_term_updated.receivers)
+    connect_signals(cache)
+    assert len(signals.after_taxonomy_term_updated.receivers) == receivers
+
+    cache.get_many([source.link('languages', 'cze'), source.link('subjects', 'physics')])
+    term = SimpleNamespace(slug='cze', taxonomy=SimpleNamespace(code='languages'))
+    signals.after_taxonomy_term_updated.send(term, term=term)
+    assert cache.stats()['size'] == 1
+
+    app = Flask('test')
+    NRDatasetsMetadata(app)
+    assert app.extensions['nr-datasets-metadata'] and taxonomy_terms.signals_connected
+
+
+def test_scope_prefetch(source):
+    scope = TaxonomyTermScope(TaxonomyTermCache(source))
+    records = [
+        {'language': [{'is_ancestor': False, 'links': {'self': source.link('languages', 'cze')}}]},
+        {'subjectCategories': [
+            {'is_ancestor': True, 'links': {'self': source.link('subjects', 'physics')}},
+            {'is_ancestor': False, 'links': {'self': source.link('subjects', 'physics/optics')}},
+        ]},
+    ]
+    assert taxonomy_links(records) == [source.link('languages', 'cze'), source.link('subjects', 'physics/optics')]
+    scope.prefetch_records(records)
+    assert source.lookups == 2
+    assert scope.get(source.link('languages', 'cze'))[0]['title']['en'] == 'Czech'
+    assert source.lookups == 2
+
+
+def taxonomy_schema_class():
+    return type('Schema', (Schema,), dict(
+        language=TaxonomyField(mixins=[SingleValuedMixin]),
+        subjects=TaxonomyField(many=True)
+    ))
+
+
+def test_taxonomy_field(source):
+    cache = TaxonomyTermCache(source)
+    schema = taxonomy_schema_class()()
+
+    with term_scope(TaxonomyTermScope(cache)):
+        data = schema.load({
+            'language': {'is_ancestor': False, 'links': {'self': source.link('languages', 'cze')}},
+            'subjects': [source.link('subjects', 'physics/optics')]
+        })
+    assert data['language'] == [{'is_ancestor': False, 'level': 1, 'title': {'cs': 'čeština', 'en': 'Czech'},
+                                 'links': {'self': source.link('languages', 'cze')}}]
+    assert [x['title']['en'] for x in data['subjects']] == ['Physics', 'Optics']
+    # loaded data must not share anything with the cache
+    data['subjects'][0]['title']['en'] = 'changed'
+    assert cache.get(source.link('subjects', 'physics/optics'))[0]['title']['en'] == 'Physics'
+
+    with pytest.raises(ValidationError) as e, term_scope(TaxonomyTermScope(cache)):
+        schema.load({'language': source.link('languages', 'missing')})
+    assert e.value.messages == {'language': {'_schema': ["Taxonomy term 'languages/missing' has not been found"]}}
+
+
+def test_batch_scope_not_shared(source, monkeypatch):
+    schema_class = taxonomy_schema_class()
+    validator = BatchValidator(schema_class, term_cache=TaxonomyTermCache(source))
+    result = validator.validate_one({'language': source.link('languages', 'eng')})
+    assert result.errors is None
+    assert result.data['language'][0]['title']['en'] == 'English'
+
+    # nested schemas are shared, a schema loaded later must use the process-wide cache, not the batch scope
+    monkeypatch.setattr(taxonomy_terms, 'source', MemoryTermSource())
+    assert active_term_cache() is taxonomy_terms
+    with pytest.raises(ValidationError):
+        schema_class(context={'record': None}).load({'language': source.link('languages', 'eng')})
@@ -0,0 +1,55 @@
+import copy
+import sys
+
+from nr_datasets_metadata.marshmallow import BatchValidator
+from nr_datasets_metadata.marshmallow.typed import Authority, Identifier, Title, to_dict, to_typed
+
+from tests.test_cli import TERM, VALID_RECORD
+
+METADATA = {
+    'titles': [{'title': {'cs': 'jeej'}, 'titleType': 'mainTitle'}],
+    'creators': [
+        {'fullName': 'Alzbeta Pokorna', 'nameType': 'Personal', 'affiliation': [TERM],
+         'authorityIdentifiers': [{'identifier': '0000-0001-5727-2427', 'scheme': 'orcid'}]},
+        # organization loaded as a taxonomy term
+        [{'fullName': 'NTK', 'nameType': 'Organizational', 'links': {'self': 'http://example.com/ntk'}}],
+    ],
+    'relatedItems': [{'itemTitle': 'titulek', 'itemYear': '1970',
+                      'itemCreators': [{'fullName': 'Jan Novak', 'nameType': 'Personal'}],
+                      'itemPIDs': [{'identifier': '10.1038/nphys1170', 'scheme': 'doi'}]}],
+    'geoLocations': [{'geoLocationPlace': 'place', 'geoLocationPoint': {'pointLatitude': 0, 'pointLongitude': 100}}],
+    'persistentIdentifiers': [{'identifier': '10.5281/zenodo.1', 'scheme': 'doi', 'status': 'registered'}],
+    'abstract': {'cs': 'kchc'},
+}
+
+
+def test_round_trip():
+    data = to_typed(copy.deepcopy(METADATA))
+    assert data['titles'] == [Title({'cs': 'jeej'}, 'mainTitle')]
+    creator = data['creators'][0]
+    assert isinstance(creator, Authority)
+    assert creator.authorityIdentifiers == [Identifier('0000-0001-5727-2427', 'orcid', None)]
+    assert data['creators'][1] == METADATA['creators'][1]
+    assert data['relatedItems'][0].itemCreators[0].fullName == 'Jan Novak'
+    assert data['relatedItems'][0].itemPIDs[0].scheme == 'doi'
+    assert data['abstract'] == {'cs': 'kchc'}
+    assert to_dict(data) == METADATA
+
+
+def test_interned():
+    scheme = ''.join(['or', 'cid'])
+    data = to_typed({'creators': [{'fullName': 'A', 'nameType': 'Personal',
+                                   'authorityIdentifiers': [{'identifier': 'x', 'scheme': scheme}]}]})
+    assert data['creators'][0].authorityIdentifiers[0].scheme is sys.intern('orcid')
+
+
+def test_no_instance_dict():
+    assert not hasattr(Title({'cs': 'a'}, 'mainTitle'), '__dict__')
+
+
+def test_batch_validator_typed(app, db, taxonomy_tree):
+    result = BatchValidator(typed=True).validate_one(copy.deepcopy(VALID_RECORD))
+    assert result.errors is None
+    assert isinstance(result.data['creators'][0], Authority)
+    plain = BatchValidator().validate_one(copy.deepcopy(VALID_RECORD))
+    assert to_dict(result.data) == plain.data
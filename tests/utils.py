@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from datetime import datetime, date
 
 
@@ -11,3 +13,20 @@ def convert_dates(x):
     elif isinstance(x, list) or isinstance(x, tuple):
         return [convert_dates(v) for v in x]
     return x
+
+
+def import_times(statement):
+    """
+    Runs the statement in a fresh interpreter with ``-X importtime`` and returns
+    {module name: cumulative import time in microseconds} of all modules it imported.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    ret = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            ret[module.strip()] = int(cumulative)
+    return ret